@@ -2,14 +2,10 @@
 """ArviZ is a library for exploratory analysis of Bayesian models."""
 __version__ = "0.4.0"
 
-import os
+import importlib
+import importlib.util
 import logging
-from matplotlib.pyplot import style
-
-# add ArviZ's styles to matplotlib's styles
-arviz_style_path = os.path.join(os.path.dirname(__file__), "plots", "styles")
-style.core.USER_LIBRARY_PATHS.append(arviz_style_path)
-style.core.reload_library()
+import sys
 
 # Configure logging before importing arviz internals
 _log = logging.getLogger("arviz")
@@ -21,6 +17,100 @@ if not logging.root.handlers:
     _log.setLevel(logging.INFO)
     _log.addHandler(handler)
 
-from .data import *
-from .plots import *
+from .rcparams import rcParams, rc_context
+from .data import (
+    InferenceData,
+    concat,
+    load_arviz_data,
+    list_datasets,
+    clear_data_home,
+    numpy_to_data_array,
+    dict_to_dataset,
+    convert_to_dataset,
+    convert_to_inference_data,
+    from_netcdf,
+    to_netcdf,
+)
+from .data import _CONVERTERS, __all__ as _data_all
 from .stats import *
+from .stats import __all__ as _stats_all
+from . import profiling
+
+# Plotting functions (and with them matplotlib and ArviZ's styles) and converters
+# are imported on first access. Python < 3.7 does not support module __getattr__.
+_PLOTS = (
+    "plot_autocorr",
+    "plot_compare",
+    "plot_density",
+    "plot_energy",
+    "plot_forest",
+    "plot_kde",
+    "_fast_kde",
+    "_fast_kde_batch",
+    "_fast_kde_2d",
+    "plot_parallel",
+    "plot_posterior",
+    "plot_trace",
+    "plot_pair",
+    "plot_joint",
+    "plot_khat",
+    "plot_ppc",
+    "plot_violin",
+    "plot_hpd",
+    "plot_dist",
+    "plot_rank",
+    "PlotData",
+    "style",
+)
+
+
+def _has_matplotlib():
+    """Check if matplotlib is installed without importing it."""
+    try:
+        return importlib.util.find_spec("matplotlib") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+__all__ = ["rcParams", "rc_context", "profiling"] + _data_all + _stats_all
+# star imports load the plots like the eager imports did, except without matplotlib
+if _has_matplotlib():
+    __all__ += list(_PLOTS)
+
+if sys.version_info < (3, 7):
+    from .data import *
+
+    try:
+        from .plots import *
+        from .plots import style
+    except ImportError:
+        _log.info("matplotlib could not be imported, plotting functions are not available")
+
+
+def _import_plots():
+    """Import arviz.plots, which requires matplotlib, unlike arviz.stats and arviz.data."""
+    try:
+        return importlib.import_module(".plots", __name__)
+    except ImportError as err:
+        raise ImportError(
+            "ArviZ plotting functions require matplotlib, which could not be imported: "
+            "{}".format(err)
+        ) from err
+
+
+def __getattr__(name):
+    if name in _PLOTS:
+        module = _import_plots()
+    elif name in _CONVERTERS:
+        module = importlib.import_module(".data", __name__)
+    elif name == "plots":
+        return _import_plots()
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_PLOTS, _CONVERTERS))
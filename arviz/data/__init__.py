@@ -1,17 +1,34 @@
 """Code for loading and manipulating data structures."""
+import importlib
+import sys
+
 from .inference_data import InferenceData, concat
 from .io_netcdf import from_netcdf, to_netcdf
 from .datasets import load_arviz_data, list_datasets, clear_data_home
 from .base import numpy_to_data_array, dict_to_dataset
 from .converters import convert_to_dataset, convert_to_inference_data
-from .io_cmdstan import from_cmdstan
-from .io_cmdstanpy import from_cmdstanpy
-from .io_dict import from_dict
-from .io_pymc3 import from_pymc3
-from .io_pystan import from_pystan
-from .io_emcee import from_emcee
-from .io_pyro import from_pyro
-from .io_tfp import from_tfp
+
+# Converters are imported on first access. Python < 3.7 does not support module __getattr__.
+_CONVERTERS = {
+    "from_cmdstan": "io_cmdstan",
+    "from_cmdstanpy": "io_cmdstanpy",
+    "from_dict": "io_dict",
+    "from_pymc3": "io_pymc3",
+    "from_pystan": "io_pystan",
+    "from_emcee": "io_emcee",
+    "from_pyro": "io_pyro",
+    "from_tfp": "io_tfp",
+}
+
+if sys.version_info < (3, 7):
+    from .io_cmdstan import from_cmdstan
+    from .io_cmdstanpy import from_cmdstanpy
+    from .io_dict import from_dict
+    from .io_pymc3 import from_pymc3
+    from .io_pystan import from_pystan
+    from .io_emcee import from_emcee
+    from .io_pyro import from_pyro
+    from .io_tfp import from_tfp
 
 __all__ = [
     "InferenceData",
@@ -34,3 +51,16 @@ __all__ = [
     "from_netcdf",
     "to_netcdf",
 ]
+
+
+def __getattr__(name):
+    if name not in _CONVERTERS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    module = importlib.import_module("." + _CONVERTERS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_CONVERTERS))
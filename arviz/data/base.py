@@ -1,12 +1,14 @@
 """Low level converters usually used by other functions."""
-from copy import deepcopy
 import datetime
+import functools
+import importlib
 import warnings
 
 import numpy as np
-import pkg_resources
 import xarray as xr
 
+from ..profiling import traced
+
 
 class requires:  # pylint: disable=invalid-name
     """Decorator to return None if an object does not have the required attribute."""
@@ -50,10 +52,23 @@ def generate_dims_coords(shape, var_name, dims=None, coords=None, default_dims=N
     dict[str] -> list[str]
         Default coords
     """
+    dims = _generate_dims(shape, var_name, dims=dims, default_dims=default_dims)
+    if coords is None:
+        coords = {}
+
+    # only the mapping is modified, coordinate values are shared with the input
+    coords = {key: coord for key, coord in coords.items() if key in dims}
+    for dim_name, dim_len in zip(dims, shape):
+        if dim_name not in coords:
+            coords[dim_name] = np.arange(dim_len)
+    return dims, coords
+
+
+def _generate_dims(shape, var_name, dims=None, default_dims=None):
+    """Generate default dimension names for a variable, see `generate_dims_coords`."""
     if default_dims is None:
         default_dims = []
-    if dims is None:
-        dims = []
+    dims = [] if dims is None else list(dims)
     if len([dim for dim in dims if dim not in default_dims]) > len(shape):
         warnings.warn(
             "More dims ({dims_len}) given than exists ({shape_len}). "
@@ -62,24 +77,51 @@ def generate_dims_coords(shape, var_name, dims=None, coords=None, default_dims=N
             ),
             SyntaxWarning,
         )
-    if coords is None:
-        coords = {}
 
-    coords = deepcopy(coords)
-    dims = deepcopy(dims)
-
-    for idx, dim_len in enumerate(shape):
+    for idx in range(len(shape)):
         if (len(dims) < idx + 1) or (dims[idx] is None):
             dim_name = "{var_name}_dim_{idx}".format(var_name=var_name, idx=idx)
             if len(dims) < idx + 1:
                 dims.append(dim_name)
             else:
                 dims[idx] = dim_name
-        dim_name = dims[idx]
-        if dim_name not in coords:
-            coords[dim_name] = np.arange(dim_len)
-    coords = {key: coord for key, coord in coords.items() if any(key == dim for dim in dims)}
-    return dims, coords
+    return dims
+
+
+def _array_dims(ary, var_name, dims=None):
+    """Convert the input to a (chain, draw, *shape) array and generate its dimensions.
+
+    Returns
+    -------
+    np.ndarray
+        At least 2d array
+    list[str]
+        Dimensions of the array, including chain and draw
+    list[str]
+        Dimensions generated from the trailing shape, only these can take
+        user defined coordinates
+    """
+    default_dims = ["chain", "draw"]
+    ary = np.atleast_2d(ary)
+    n_chains, n_samples, *shape = ary.shape
+    if n_chains > n_samples:
+        warnings.warn(
+            "More chains ({n_chains}) than draws ({n_samples}). "
+            "Passed array should have shape (chains, draws, *shape)".format(
+                n_chains=n_chains, n_samples=n_samples
+            ),
+            SyntaxWarning,
+        )
+
+    shape_dims = _generate_dims(shape, var_name, dims=dims, default_dims=default_dims)
+
+    # reversed order for default dims: 'chain', 'draw'
+    ary_dims = shape_dims
+    if "draw" not in ary_dims:
+        ary_dims = ["draw"] + ary_dims
+    if "chain" not in ary_dims:
+        ary_dims = ["chain"] + ary_dims
+    return ary, ary_dims, shape_dims
 
 
 def numpy_to_data_array(ary, *, var_name="data", coords=None, dims=None):
@@ -110,39 +152,38 @@ def numpy_to_data_array(ary, *, var_name="data", coords=None, dims=None):
     xr.DataArray
         Will have the same data as passed, but with coordinates and dimensions
     """
-    # manage and transform copies
-    default_dims = ["chain", "draw"]
-    ary = np.atleast_2d(ary)
-    n_chains, n_samples, *shape = ary.shape
-    if n_chains > n_samples:
-        warnings.warn(
-            "More chains ({n_chains}) than draws ({n_samples}). "
-            "Passed array should have shape (chains, draws, *shape)".format(
-                n_chains=n_chains, n_samples=n_samples
-            ),
-            SyntaxWarning,
-        )
+    ary, dims, shape_dims = _array_dims(ary, var_name, dims=dims)
+    coords = _index_variables(ary, dims, shape_dims, coords)
+    return xr.DataArray(ary, coords=coords, dims=dims)
 
-    dims, coords = generate_dims_coords(
-        shape, var_name, dims=dims, coords=coords, default_dims=default_dims
-    )
 
-    # reversed order for default dims: 'chain', 'draw'
-    if "draw" not in dims:
-        dims = ["draw"] + dims
-    if "chain" not in dims:
-        dims = ["chain"] + dims
-
-    if "chain" not in coords:
-        coords["chain"] = np.arange(n_chains)
-    if "draw" not in coords:
-        coords["draw"] = np.arange(n_samples)
-
-    # filter coords based on the dims
-    coords = {key: xr.IndexVariable((key,), data=coords[key]) for key in dims}
-    return xr.DataArray(ary, coords=coords, dims=dims)
+def _index_variables(ary, dims, shape_dims, coords=None, cache=None):
+    """Get the index variables of the dimensions of `ary`.
 
+    Index variables already present in `cache` are reused and new ones are added
+    to it. Returns None if a dimension in `cache` does not match the length of
+    the same dimension in `ary`.
+    """
+    if coords is None:
+        coords = {}
+    if cache is None:
+        cache = {}
+    index_vars = {}
+    for dim_name, dim_len in zip(dims, ary.shape):
+        index_var = cache.get(dim_name)
+        if index_var is None:
+            if dim_name in shape_dims and dim_name in coords:
+                coord = coords[dim_name]
+            else:
+                coord = np.arange(dim_len)
+            index_var = cache[dim_name] = xr.IndexVariable((dim_name,), data=coord)
+        elif len(index_var) != dim_len:
+            return None
+        index_vars[dim_name] = index_var
+    return index_vars
 
+
+@traced()
 def dict_to_dataset(data, *, attrs=None, library=None, coords=None, dims=None):
     """Convert a dictionary of numpy arrays to an xarray.Dataset.
 
@@ -172,12 +213,27 @@ def dict_to_dataset(data, *, attrs=None, library=None, coords=None, dims=None):
     if dims is None:
         dims = {}
 
-    data_vars = {}
+    # Build the dataset directly from variables sharing a single index variable per
+    # dimension, which avoids the alignment of one DataArray per variable.
+    variables = {}
+    index_vars = {}
     for key, values in data.items():
-        data_vars[key] = numpy_to_data_array(
-            values, var_name=key, coords=coords, dims=dims.get(key)
-        )
-    return xr.Dataset(data_vars=data_vars, attrs=make_attrs(attrs=attrs, library=library))
+        ary, var_dims, shape_dims = _array_dims(values, key, dims=dims.get(key))
+        if _index_variables(ary, var_dims, shape_dims, coords, cache=index_vars) is None:
+            # same dimension with different lengths, let xarray align the variables
+            variables = None
+            break
+        variables[key] = xr.Variable(var_dims, ary)
+
+    if variables is None:
+        data_vars = {
+            key: numpy_to_data_array(values, var_name=key, coords=coords, dims=dims.get(key))
+            for key, values in data.items()
+        }
+        return xr.Dataset(data_vars=data_vars, attrs=make_attrs(attrs=attrs, library=library))
+    return xr.Dataset(
+        data_vars=variables, coords=index_vars, attrs=make_attrs(attrs=attrs, library=library)
+    )
 
 
 def make_attrs(attrs=None, library=None):
@@ -197,14 +253,38 @@ def make_attrs(attrs=None, library=None):
     if library is not None:
         library_name = library.__name__
         default_attrs["inference_library"] = library_name
-        try:
-            version = pkg_resources.get_distribution(library_name).version
+        version = _distribution_version(library_name)
+        if version is None:
+            version = getattr(library, "__version__", None)
+        if version is not None:
             default_attrs["inference_library_version"] = version
-        except pkg_resources.DistributionNotFound:
-            if hasattr(library, "__version__"):
-                version = library.__version__
-                default_attrs["inference_library_version"] = version
 
     if attrs is not None:
         default_attrs.update(attrs)
     return default_attrs
+
+
+@functools.lru_cache(maxsize=None)
+def _distribution_version(distribution_name):
+    """Get the installed version of a distribution, cached for the whole process.
+
+    Uses importlib.metadata if available (python 3.8+), pkg_resources otherwise,
+    which is slow both to import and to query.
+
+    Returns
+    -------
+    str or None
+        None if the distribution is not installed.
+    """
+    try:
+        metadata = importlib.import_module("importlib.metadata")
+    except ImportError:
+        pkg_resources = importlib.import_module("pkg_resources")
+        try:
+            return pkg_resources.get_distribution(distribution_name).version
+        except pkg_resources.DistributionNotFound:
+            return None
+    try:
+        return metadata.version(distribution_name)
+    except metadata.PackageNotFoundError:
+        return None
@@ -4,15 +4,11 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import dict_to_dataset
-from .io_cmdstan import from_cmdstan
-from .io_cmdstanpy import from_cmdstanpy
-from .io_emcee import from_emcee
-from .io_pymc3 import from_pymc3
-from .io_pyro import from_pyro
-from .io_pystan import from_pystan
+from ..profiling import traced
 
 
 # pylint: disable=too-many-return-statements
+@traced()
 def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None, **kwargs):
     r"""Convert a supported object to an InferenceData object.
 
@@ -63,6 +59,7 @@ def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None,
                 kwargs["posterior"] = kwargs.pop(group)
             elif group == "sample_stats_prior":
                 kwargs["prior"] = kwargs.pop(group)
+            from .io_cmdstan import from_cmdstan
             return from_cmdstan(**kwargs)
         else:
             return InferenceData.from_netcdf(obj)
@@ -75,14 +72,19 @@ def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None,
         elif group == "sample_stats_prior":
             kwargs["prior"] = kwargs.pop(group)
         if obj.__class__.__name__ == "PosteriorSample":
+            from .io_cmdstanpy import from_cmdstanpy
             return from_cmdstanpy(**kwargs)
         else:  # pystan or pystan3
+            from .io_pystan import from_pystan
             return from_pystan(**kwargs)
     elif obj.__class__.__name__ == "MultiTrace":  # ugly, but doesn't make PyMC3 a requirement
+        from .io_pymc3 import from_pymc3
         return from_pymc3(trace=kwargs.pop(group), **kwargs)
     elif obj.__class__.__name__ == "EnsembleSampler":  # ugly, but doesn't make emcee a requirement
+        from .io_emcee import from_emcee
         return from_emcee(sampler=kwargs.pop(group), **kwargs)
     elif obj.__class__.__name__ == "MCMC" and obj.__class__.__module__.startswith("pyro"):
+        from .io_pyro import from_pyro
         return from_pyro(posterior=kwargs.pop(group), **kwargs)
 
     # Cases that convert to xarray
@@ -97,6 +99,7 @@ def convert_to_inference_data(obj, *, group="posterior", coords=None, dims=None,
             kwargs["posterior"] = kwargs.pop(group)
         elif group == "sample_stats_prior":
             kwargs["prior"] = kwargs.pop(group)
+        from .io_cmdstan import from_cmdstan
         return from_cmdstan(**kwargs)
     else:
         allowable_types = (
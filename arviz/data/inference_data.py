@@ -2,9 +2,12 @@
 from collections import OrderedDict
 from collections.abc import Sequence
 from copy import copy as ccopy, deepcopy
-import netCDF4 as nc
+import numpy as np
 import xarray as xr
 
+from ..profiling import traced
+from ..rcparams import rcParams, STORAGE_DTYPES
+
 
 class InferenceData:
     """Container for accessing netCDF files using xarray."""
@@ -40,6 +43,7 @@ class InferenceData:
         )
 
     @staticmethod
+    @traced("InferenceData.from_netcdf")
     def from_netcdf(filename):
         """Initialize object from a netcdf file.
 
@@ -54,69 +58,246 @@ class InferenceData:
         -------
         InferenceData object
         """
+        import netCDF4 as nc  # imported here to keep `import arviz` light
+
         groups = {}
         with nc.Dataset(filename, mode="r") as data:
             data_groups = list(data.groups)
 
         for group in data_groups:
             with xr.open_dataset(filename, group=group) as data:
+                packed = [
+                    var_name
+                    for var_name, data_array in data.data_vars.items()
+                    if _is_packed(data_array)
+                ]
+                if packed:
+                    with xr.open_dataset(filename, group=group, mask_and_scale=False) as raw:
+                        for var_name in packed:
+                            data[var_name] = _decode_packed(
+                                raw[var_name].variable, data[var_name].variable
+                            )
                 groups[group] = data
         return InferenceData(**groups)
 
-    def to_netcdf(self, filename, compress=True):
+    @traced("InferenceData.to_netcdf")
+    def to_netcdf(self, filename, compress=None):
         """Write InferenceData to file using netcdf4.
 
+        Double precision variables without a packed encoding are written with the
+        storage dtype of ``rcParams["data.storage_dtype"]``, see :meth:`set_storage`.
+
         Parameters
         ----------
         filename : str
             Location to write to
-        compress : bool
+        compress : bool, optional
             Whether to compress result. Note this saves disk space, but may make
-            saving and loading somewhat slower (default: True).
+            saving and loading somewhat slower. Defaults to ``rcParams["data.compress"]``.
 
         Returns
         -------
         str
             Location of netcdf file
         """
+        if compress is None:
+            compress = rcParams["data.compress"]
+        storage_dtype = rcParams["data.storage_dtype"]
         mode = "w"  # overwrite first, then append
         if self._groups:  # check's whether a group is present or not.
             for group in self._groups:
                 data = getattr(self, group)
+                if storage_dtype != "float64":
+                    data = _default_storage(data, storage_dtype)
                 kwargs = {}
                 if compress:
-                    kwargs["encoding"] = {var_name: {"zlib": True} for var_name in data.variables}
+                    kwargs["encoding"] = {
+                        var_name: dict(_storage_encoding(data[var_name]), zlib=True)
+                        for var_name in data.variables
+                    }
                 data.to_netcdf(filename, mode=mode, group=group, **kwargs)
                 data.close()
                 mode = "a"
         else:  # creates a netcdf file for an empty InferenceData object.
+            import netCDF4 as nc
+
             empty_netcdf_file = nc.Dataset(filename, mode="w", format="NETCDF4")
             empty_netcdf_file.close()
         return filename
 
+    def set_storage(self, dtype, groups=None, inplace=True):
+        """Set the storage precision of the floating point variables of the groups.
+
+        ``"float32"`` casts the arrays to single precision, both in memory and when
+        written with :meth:`to_netcdf`.
+
+        ``"int16"`` quantizes each variable linearly between its minimum and maximum
+        values. In memory the variable is kept as float64 rounded to the quantization
+        grid, and it is written to netCDF as packed int16 with ``scale_factor`` and
+        ``add_offset`` following CF conventions, so it is read back transparently by
+        :meth:`from_netcdf`. The maximum absolute error introduced is half of the
+        quantization step, ``(max - min) / (2 * (2**16 - 2))``, plus the double
+        precision rounding at the magnitude of the values. It is stored in the
+        ``quantization_max_abs_error`` attribute of each variable and bounds the error
+        both in memory and after a netCDF round trip.
+
+        ``"float64"`` restores double precision storage, information lost by a
+        previous call is not recovered.
+
+        Coordinates, integer and boolean variables are never modified. Statistics
+        such as ess or loo upcast each parameter to float64 before computing.
+
+        Parameters
+        ----------
+        dtype : {"float64", "float32", "int16"}
+            Storage policy.
+        groups : str or list of str, optional
+            Groups to modify. Defaults to all groups.
+        inplace : bool
+            If True, modify the InferenceData object inplace, otherwise, return the modified copy.
+        """
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(
+                "Invalid storage dtype {}. Valid options are {}".format(dtype, STORAGE_DTYPES)
+            )
+        if groups is None:
+            groups = self._groups
+        elif isinstance(groups, str):
+            groups = [groups]
+        out = self if inplace else InferenceData()
+        for group in self._groups:
+            dataset = getattr(self, group)
+            if group in groups:
+                dataset = dataset.copy(deep=False)
+                for var_name, data_array in dataset.data_vars.items():
+                    if data_array.dtype.kind == "f":
+                        dataset[var_name] = _set_variable_storage(data_array.variable, dtype)
+            if not inplace:
+                out._groups.append(group)  # pylint: disable=protected-access
+            setattr(out, group, dataset)
+        if inplace:
+            return None
+        else:
+            return out
+
     def __add__(self, other):
         """Concatenate two InferenceData objects."""
         return concat(self, other, copy=True, inplace=False)
 
-    def sel(self, inplace=True, **kwargs):
+    def sel(self, inplace=True, copy=False, **kwargs):
         """Perform an xarray selection on all groups.
 
         Loops over all groups to perform Dataset.sel(key=item)
         for every kwarg if key is a dimension of the dataset.
         The selection is performed inplace.
 
+        When ``inplace=False`` the returned object is built from the selected datasets
+        directly, so the groups of both objects may share their underlying arrays
+        (basic indexing such as slices returns views). Use ``copy=True`` to get
+        independent arrays.
+
         Parameters
         ----------
         inplace : bool
             If True, modify the InferenceData object inplace, otherwise, return the modified copy.
+        copy : bool
+            If True and ``inplace=False``, deep copy the array data of the selected groups.
+            Defaults to False.
         **kwargs : mapping
             It must be accepted by Dataset.sel()
         """
-        out = self if inplace else deepcopy(self)
+        return self._select("sel", inplace, copy, kwargs)
+
+    def isel(self, inplace=True, copy=False, **kwargs):
+        """Perform an xarray positional selection on all groups.
+
+        Same as :meth:`sel`, but uses Dataset.isel(key=item), so indexers refer to
+        integer positions instead of coordinate labels.
+
+        Parameters
+        ----------
+        inplace : bool
+            If True, modify the InferenceData object inplace, otherwise, return the modified copy.
+        copy : bool
+            If True and ``inplace=False``, deep copy the array data of the selected groups.
+            Defaults to False.
+        **kwargs : mapping
+            It must be accepted by Dataset.isel()
+        """
+        return self._select("isel", inplace, copy, kwargs)
+
+    def thin(self, step, inplace=False, copy=False):
+        """Keep one out of every ``step`` draws in all groups with a ``draw`` dimension.
+
+        The selection is a strided view of the original arrays unless ``copy=True``.
+        Arrays are materialized when written, e.g. with ``to_netcdf``.
+
+        Parameters
+        ----------
+        step : int
+            Thinning interval, must be a positive integer.
+        inplace : bool
+            If True, modify the InferenceData object inplace, otherwise, return the modified copy.
+        copy : bool
+            If True and ``inplace=False``, deep copy the array data of the selected groups.
+
+        Examples
+        --------
+        Keep every 10th draw after discarding the first 1000:
+
+        >>> idata.burn(1000).thin(10)
+        """
+        if int(step) != step or step < 1:
+            raise ValueError("step must be a positive integer, got {}".format(step))
+        return self.isel(inplace=inplace, copy=copy, draw=slice(None, None, int(step)))
+
+    def burn(self, n, inplace=False, copy=False):
+        """Discard the first ``n`` draws in all groups with a ``draw`` dimension.
+
+        The selection is a view of the original arrays unless ``copy=True``.
+
+        Parameters
+        ----------
+        n : int
+            Number of draws to discard, must be a non negative integer.
+        inplace : bool
+            If True, modify the InferenceData object inplace, otherwise, return the modified copy.
+        copy : bool
+            If True and ``inplace=False``, deep copy the array data of the selected groups.
+        """
+        if int(n) != n or n < 0:
+            raise ValueError("n must be a non negative integer, got {}".format(n))
+        return self.isel(inplace=inplace, copy=copy, draw=slice(int(n), None))
+
+    def select_chains(self, chains, inplace=False, copy=False):
+        """Keep only the given chains in all groups with a ``chain`` dimension.
+
+        Parameters
+        ----------
+        chains : scalar, list or slice
+            Labels of the ``chain`` coordinate to keep. Slices and scalars return
+            views of the original arrays, lists of labels require a copy.
+        inplace : bool
+            If True, modify the InferenceData object inplace, otherwise, return the modified copy.
+        copy : bool
+            If True and ``inplace=False``, deep copy the array data of the selected groups.
+        """
+        if np.ndim(chains) == 0 and not isinstance(chains, slice):
+            # label slices are inclusive, this keeps the chain dimension and returns a view
+            chains = slice(chains, chains)
+        return self.sel(inplace=inplace, copy=copy, chain=chains)
+
+    def _select(self, method, inplace, copy, indexers):
+        """Apply Dataset.sel or Dataset.isel to every group with the matching dims."""
+        out = self if inplace else InferenceData()
         for group in self._groups:
             dataset = getattr(self, group)
-            valid_keys = set(kwargs.keys()).intersection(dataset.dims)
-            dataset = dataset.sel(**{key: kwargs[key] for key in valid_keys})
+            valid_keys = set(indexers.keys()).intersection(dataset.dims)
+            if valid_keys:
+                dataset = getattr(dataset, method)(**{key: indexers[key] for key in valid_keys})
+            if not inplace:
+                dataset = dataset.copy(deep=copy)
+                out._groups.append(group)  # pylint: disable=protected-access
             setattr(out, group, dataset)
         if inplace:
             return None
@@ -124,6 +305,90 @@ class InferenceData:
             return out
 
 
+_STORAGE_ENCODING_KEYS = ("dtype", "scale_factor", "add_offset", "_FillValue")
+_INT16_FILL_VALUE = np.iinfo(np.int16).min
+
+
+def _storage_encoding(data_array):
+    """Extract the encoding keys that define the on disk storage of a variable."""
+    encoding = data_array.encoding
+    return {key: encoding[key] for key in _STORAGE_ENCODING_KEYS if key in encoding}
+
+
+def _set_variable_storage(variable, dtype):
+    """Return a shallow copy of a floating point xarray.Variable with the storage dtype."""
+    encoding = {
+        key: value for key, value in variable.encoding.items() if key not in _STORAGE_ENCODING_KEYS
+    }
+    attrs = dict(variable.attrs)
+    attrs.pop("quantization_max_abs_error", None)
+    values = variable.values
+    if dtype == "int16":
+        # quantize in double precision so that the grid values are represented exactly and
+        # to_netcdf packs them back to the same integers
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        if finite.any():
+            vmin, vmax = float(values[finite].min()), float(values[finite].max())
+        else:
+            vmin = vmax = 0.0
+        # -32768 is reserved as fill value for NaN, which leaves 2**16 - 1 levels
+        scale_factor = (vmax - vmin) / (2 ** 16 - 2) or 1.0
+        add_offset = (vmax + vmin) / 2
+        packed = np.round((values - add_offset) / scale_factor)
+        values = packed * scale_factor + add_offset
+        encoding.update(
+            dtype="int16",
+            scale_factor=scale_factor,
+            add_offset=add_offset,
+            _FillValue=_INT16_FILL_VALUE,
+        )
+        # half of the quantization step plus the rounding of the double precision operations
+        # at the magnitude of the data
+        rounding_error = 4 * float(np.spacing(max(abs(vmin), abs(vmax))))
+        attrs["quantization_max_abs_error"] = (
+            scale_factor / 2 + rounding_error if vmax > vmin else 0.0
+        )
+    else:
+        values = values.astype(dtype, copy=False)
+        encoding["dtype"] = dtype
+    new_variable = variable.copy(deep=False, data=values)
+    new_variable.attrs = attrs
+    new_variable.encoding = encoding
+    return new_variable
+
+
+def _is_packed(data_array):
+    """Check if a variable read from netCDF was packed as integers with a scale factor."""
+    encoding = data_array.encoding
+    return "scale_factor" in encoding and np.dtype(encoding.get("dtype", "f8")).kind == "i"
+
+
+def _decode_packed(raw_variable, variable):
+    """Decode a packed integer variable in double precision.
+
+    xarray masks the fill value before applying ``scale_factor`` and ``add_offset``, which
+    promotes int16 to float32 and loses the precision of the quantization grid.
+    """
+    encoding = variable.encoding
+    raw_values = raw_variable.values
+    values = raw_values * np.float64(encoding["scale_factor"]) + encoding.get("add_offset", 0.0)
+    if "_FillValue" in encoding:
+        values[raw_values == encoding["_FillValue"]] = np.nan
+    new_variable = variable.copy(deep=False, data=values)
+    new_variable.encoding = encoding
+    return new_variable
+
+
+def _default_storage(dataset, dtype):
+    """Apply the storage dtype to the double precision variables that are not packed."""
+    dataset = dataset.copy(deep=False)
+    for var_name, data_array in dataset.data_vars.items():
+        if data_array.dtype == np.float64 and "scale_factor" not in data_array.encoding:
+            dataset[var_name] = _set_variable_storage(data_array.variable, dtype)
+    return dataset
+
+
 # pylint: disable=protected-access
 def concat(*args, copy=True, inplace=False):
     """Concatenate InferenceData objects on a group level.
@@ -14,6 +14,7 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import requires, dict_to_dataset, generate_dims_coords
+from ..profiling import traced
 
 
 _log = logging.getLogger(__name__)
@@ -397,6 +398,7 @@ def _process_configuration(comments):
     }
 
 
+@traced("cmdstan.read_output")
 def _read_output(path):
     """Read CmdStan output.csv.
 
@@ -631,6 +633,7 @@ def _read_data(path):
     return data
 
 
+@traced("cmdstan.unpack_dataframes")
 def _unpack_dataframes(dfs):
     """Transform a list of pandas.DataFrames to dictionary containing ndarrays.
 
@@ -668,6 +671,7 @@ def _unpack_dataframes(dfs):
     return sample
 
 
+@traced()
 def from_cmdstan(
     posterior=None,
     *,
@@ -10,6 +10,7 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import requires, dict_to_dataset, generate_dims_coords, make_attrs
+from ..profiling import traced
 
 
 _log = logging.getLogger(__name__)
@@ -278,6 +279,7 @@ def _unpack_frame(data, columns, valid_cols):
     return sample
 
 
+@traced()
 def from_cmdstanpy(
     posterior=None,
     *,
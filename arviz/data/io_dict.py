@@ -6,6 +6,7 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import requires, dict_to_dataset, generate_dims_coords, make_attrs
+from ..profiling import traced
 
 
 class DictConverter:
@@ -135,6 +136,7 @@ class DictConverter:
 
 
 # pylint disable=too-many-instance-attributes
+@traced()
 def from_dict(
     posterior=None,
     *,
@@ -4,6 +4,7 @@ import xarray as xr
 import numpy as np
 from .inference_data import InferenceData
 from .base import dict_to_dataset, generate_dims_coords, make_attrs
+from ..profiling import traced
 
 
 def _verify_names(sampler, var_names, arg_names, slices):
@@ -208,6 +209,7 @@ class EmceeConverter:
         )
 
 
+@traced()
 def from_emcee(
     sampler=None,
     var_names=None,
@@ -4,6 +4,7 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import requires, dict_to_dataset, generate_dims_coords, make_attrs
+from ..profiling import traced
 
 
 class PyMC3Converter:
@@ -144,6 +145,7 @@ class PyMC3Converter:
         )
 
 
+@traced()
 def from_pymc3(trace=None, *, prior=None, posterior_predictive=None, coords=None, dims=None):
     """Convert pymc3 data into an InferenceData object."""
     return PyMC3Converter(
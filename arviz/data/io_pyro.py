@@ -3,6 +3,7 @@ import numpy as np
 
 from .inference_data import InferenceData
 from .base import dict_to_dataset
+from ..profiling import traced
 
 
 def _get_var_names(posterior):
@@ -103,6 +104,7 @@ class PyroConverter:
         )
 
 
+@traced()
 def from_pyro(posterior=None, *, coords=None, dims=None):
     """Convert pyro data into an InferenceData object.
 
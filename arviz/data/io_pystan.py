@@ -8,6 +8,7 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import requires, dict_to_dataset, generate_dims_coords, make_attrs
+from ..profiling import traced
 
 
 class PyStanConverter:
@@ -536,6 +537,7 @@ def infer_dtypes(fit, model=None):
 
 
 # pylint disable=too-many-instance-attributes
+@traced()
 def from_pystan(
     posterior=None,
     *,
@@ -4,6 +4,7 @@ import xarray as xr
 
 from .inference_data import InferenceData
 from .base import dict_to_dataset, generate_dims_coords, make_attrs
+from ..profiling import traced
 
 
 # pylint: disable=too-many-instance-attributes
@@ -166,6 +167,7 @@ class TfpConverter:
         )
 
 
+@traced()
 def from_tfp(
     posterior=None,
     *,
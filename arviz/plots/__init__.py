@@ -1,10 +1,14 @@
 """Plotting functions."""
+import os
+
+from matplotlib.pyplot import style
+
 from .autocorrplot import plot_autocorr
 from .compareplot import plot_compare
 from .densityplot import plot_density
 from .energyplot import plot_energy
 from .forestplot import plot_forest
-from .kdeplot import plot_kde, _fast_kde, _fast_kde_2d
+from .kdeplot import plot_kde, _fast_kde, _fast_kde_batch, _fast_kde_2d
 from .parallelplot import plot_parallel
 from .posteriorplot import plot_posterior
 from .traceplot import plot_trace
@@ -16,6 +20,12 @@ from .violinplot import plot_violin
 from .hpdplot import plot_hpd
 from .distplot import plot_dist
 from .rankplot import plot_rank
+from .plot_data import PlotData
+
+# add ArviZ's styles to matplotlib's styles
+arviz_style_path = os.path.join(os.path.dirname(__file__), "styles")
+style.core.USER_LIBRARY_PATHS.append(arviz_style_path)
+style.core.reload_library()
 
 
 __all__ = [
@@ -26,6 +36,7 @@ __all__ = [
     "plot_forest",
     "plot_kde",
     "_fast_kde",
+    "_fast_kde_batch",
     "_fast_kde_2d",
     "plot_parallel",
     "plot_posterior",
@@ -38,4 +49,5 @@ __all__ = [
     "plot_hpd",
     "plot_dist",
     "plot_rank",
+    "PlotData",
 ]
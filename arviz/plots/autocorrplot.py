@@ -10,11 +10,21 @@ from .plot_utils import (
     xarray_var_iter,
     _create_axes_grid,
 )
+from .plot_data import PlotData, renderer
 from ..utils import _var_names
+from ..profiling import traced
 
 
+@traced()
 def plot_autocorr(
-    data, var_names=None, max_lag=None, combined=False, figsize=None, textsize=None, ax=None
+    data,
+    var_names=None,
+    max_lag=None,
+    combined=False,
+    figsize=None,
+    textsize=None,
+    ax=None,
+    compute_only=False,
 ):
     """Bar plot of the autocorrelation function for a sequence of data.
 
@@ -41,10 +51,13 @@ def plot_autocorr(
         on figsize.
     ax: axes
         Matplotlib axes
+    compute_only : bool, optional
+        If True, compute the autocorrelations and return them as a :class:`PlotData` without
+        drawing them. Defaults to False.
 
     Returns
     -------
-    axes : matplotlib axes
+    axes : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -88,7 +101,28 @@ def plot_autocorr(
         max_lag = min(100, data["draw"].shape[0])
 
     plotters = list(xarray_var_iter(data, var_names, combined))
-    length_plotters = len(plotters)
+    # all the series have the same length, compute their first lags at once
+    all_autocorr = autocorr(
+        np.stack([x.flatten() if combined else x for _, _, x in plotters]), max_lag=max_lag
+    )
+    panels = [
+        {"label": make_label(var_name, selection), "autocorr": y}
+        for (var_name, selection, _), y in zip(plotters, all_autocorr)
+    ]
+
+    plot_data = PlotData(
+        "plot_autocorr",
+        dict(panels=panels, max_lag=max_lag, figsize=figsize, textsize=textsize),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_autocorr")
+def _draw_autocorr(ax=None, panels=(), max_lag=100, figsize=None, textsize=None):
+    """Draw the autocorrelations computed by `plot_autocorr`."""
+    length_plotters = len(panels)
     rows, cols = default_grid(length_plotters)
 
     figsize, _, titlesize, xt_labelsize, linewidth, _ = _scale_fig_size(
@@ -103,17 +137,11 @@ def plot_autocorr(
         axes = ax
 
     axes = np.atleast_2d(axes)  # in case of only 1 plot
-    for (var_name, selection, x), ax_ in zip(plotters, axes.flatten()):
-        x_prime = x
-
-        if combined:
-            x_prime = x.flatten()
-
-        y = autocorr(x_prime)
-
-        ax_.vlines(x=np.arange(0, max_lag), ymin=0, ymax=y[0:max_lag], lw=linewidth)
+    for panel, ax_ in zip(panels, axes.flatten()):
+        y = panel["autocorr"]
+        ax_.vlines(x=np.arange(0, len(y)), ymin=0, ymax=y, lw=linewidth)
         ax_.hlines(0, 0, max_lag, "steelblue")
-        ax_.set_title(make_label(var_name, selection), fontsize=titlesize, wrap=True)
+        ax_.set_title(panel["label"], fontsize=titlesize, wrap=True)
         ax_.tick_params(labelsize=xt_labelsize)
 
     if axes.size > 0:
@@ -1,9 +1,12 @@
 """Summary plot for model comparison."""
 import numpy as np
 import matplotlib.pyplot as plt
+from .plot_data import PlotData, renderer
 from .plot_utils import _scale_fig_size
+from ..profiling import traced
 
 
+@traced()
 def plot_compare(
     comp_df,
     insample_dev=True,
@@ -13,6 +16,7 @@ def plot_compare(
     textsize=None,
     plot_kwargs=None,
     ax=None,
+    compute_only=False,
 ):
     """
     Summary plot for model comparison.
@@ -49,10 +53,13 @@ def plot_compare(
         'marker_dse', 'ls_min_ic' 'color_ls_min_ic',  'fontsize'
     ax : axes, optional
         Matplotlib axes
+    compute_only : bool, optional
+        If True, return the data of the plot as a :class:`PlotData` without drawing it.
+        Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
 
     Examples
@@ -78,6 +85,61 @@ def plot_compare(
     if figsize is None:
         figsize = (6, len(comp_df))
 
+    _information_criterion = ["waic", "loo"]
+    for information_criterion in _information_criterion:
+        if information_criterion in comp_df.columns:
+            break
+    else:
+        raise ValueError(
+            "comp_df must contain one of the following"
+            " information criterion: {}".format(_information_criterion)
+        )
+
+    scale_col = information_criterion + "_scale"
+    if scale_col in comp_df:
+        scale = comp_df[scale_col].iloc[0].capitalize()
+    else:
+        scale = "Deviance"
+
+    plot_data = PlotData(
+        "plot_compare",
+        dict(
+            models=[str(model) for model in comp_df.index],
+            ic=comp_df[information_criterion].values.astype(float),
+            p_ic=comp_df["p_" + information_criterion].values.astype(float),
+            se=comp_df["se"].values.astype(float),
+            dse=comp_df["dse"].values.astype(float),
+            scale=scale,
+            insample_dev=insample_dev,
+            plot_standard_error=plot_standard_error,
+            plot_ic_diff=plot_ic_diff,
+            figsize=figsize,
+            textsize=textsize,
+            plot_kwargs=plot_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_compare")
+def _draw_compare(
+    ax=None,
+    models=(),
+    ic=None,
+    p_ic=None,
+    se=None,
+    dse=None,
+    scale="Deviance",
+    insample_dev=True,
+    plot_standard_error=True,
+    plot_ic_diff=True,
+    figsize=None,
+    textsize=None,
+    plot_kwargs=None,
+):
+    """Draw the information criteria extracted from `comp_df` by `plot_compare`."""
     figsize, ax_labelsize, _, xt_labelsize, linewidth, _ = _scale_fig_size(figsize, textsize, 1, 1)
 
     if ax is None:
@@ -86,29 +148,19 @@ def plot_compare(
     if plot_kwargs is None:
         plot_kwargs = {}
 
-    yticks_pos, step = np.linspace(0, -1, (comp_df.shape[0] * 2) - 1, retstep=True)
+    yticks_pos, step = np.linspace(0, -1, (len(models) * 2) - 1, retstep=True)
     yticks_pos[1::2] = yticks_pos[1::2] + step / 2
 
     yticks_labels = [""] * len(yticks_pos)
 
-    _information_criterion = ["waic", "loo"]
-    for information_criterion in _information_criterion:
-        if information_criterion in comp_df.columns:
-            break
-    else:
-        raise ValueError(
-            "comp_df must contain one of the following"
-            " information criterion: {}".format(_information_criterion)
-        )
-
     if plot_ic_diff:
-        yticks_labels[0] = comp_df.index[0]
-        yticks_labels[2::2] = comp_df.index[1:]
+        yticks_labels[0] = models[0]
+        yticks_labels[2::2] = models[1:]
         ax.set_yticks(yticks_pos)
         ax.errorbar(
-            x=comp_df[information_criterion].iloc[1:],
+            x=ic[1:],
             y=yticks_pos[1::2],
-            xerr=comp_df.dse[1:],
+            xerr=dse[1:],
             color=plot_kwargs.get("color_dse", "grey"),
             fmt=plot_kwargs.get("marker_dse", "^"),
             mew=linewidth,
@@ -116,14 +168,14 @@ def plot_compare(
         )
 
     else:
-        yticks_labels = comp_df.index
+        yticks_labels = models
         ax.set_yticks(yticks_pos[::2])
 
     if plot_standard_error:
         ax.errorbar(
-            x=comp_df[information_criterion],
+            x=ic,
             y=yticks_pos[::2],
-            xerr=comp_df.se,
+            xerr=se,
             color=plot_kwargs.get("color_ic", "k"),
             fmt=plot_kwargs.get("marker_ic", "o"),
             mfc="None",
@@ -132,7 +184,7 @@ def plot_compare(
         )
     else:
         ax.plot(
-            comp_df[information_criterion],
+            ic,
             yticks_pos[::2],
             color=plot_kwargs.get("color_ic", "k"),
             marker=plot_kwargs.get("marker_ic", "o"),
@@ -143,7 +195,7 @@ def plot_compare(
 
     if insample_dev:
         ax.plot(
-            comp_df[information_criterion] - (2 * comp_df["p_" + information_criterion]),
+            ic - (2 * p_ic),
             yticks_pos[::2],
             color=plot_kwargs.get("color_insample_dev", "k"),
             marker=plot_kwargs.get("marker_insample_dev", "o"),
@@ -152,17 +204,12 @@ def plot_compare(
         )
 
     ax.axvline(
-        comp_df[information_criterion].iloc[0],
+        ic[0],
         ls=plot_kwargs.get("ls_min_ic", "--"),
         color=plot_kwargs.get("color_ls_min_ic", "grey"),
         lw=linewidth,
     )
 
-    scale_col = information_criterion + "_scale"
-    if scale_col in comp_df:
-        scale = comp_df[scale_col].iloc[0].capitalize()
-    else:
-        scale = "Deviance"
     ax.set_xlabel(scale, fontsize=ax_labelsize)
     ax.set_yticklabels(yticks_labels)
     ax.set_ylim(-1 + step, 0 - step)
@@ -2,8 +2,9 @@
 import numpy as np
 
 from ..data import convert_to_dataset
-from ..stats import hpd
+from ..stats import posterior_intervals
 from .kdeplot import _fast_kde
+from .plot_data import PlotData, renderer
 from .plot_utils import (
     _scale_fig_size,
     make_label,
@@ -12,9 +13,11 @@ from .plot_utils import (
     _create_axes_grid,
 )
 from ..utils import _var_names
+from ..profiling import traced
 
 
 # pylint:disable-msg=too-many-function-args
+@traced()
 def plot_density(
     data,
     group="posterior",
@@ -29,6 +32,7 @@ def plot_density(
     bw=4.5,
     figsize=None,
     textsize=None,
+    compute_only=False,
 ):
     """Generate KDE plots for continuous variables and histograms for discrete ones.
 
@@ -79,10 +83,13 @@ def plot_density(
     textsize: Optional[float]
         Text size scaling factor for labels, titles and lines. If None it will be autoscaled based
         on figsize.
+    compute_only : bool, optional
+        If True, compute the densities and return them as a :class:`PlotData` without drawing
+        them. Defaults to False.
 
     Returns
     -------
-    ax : Matplotlib axes
+    ax : Matplotlib axes, or PlotData if `compute_only` is True
 
 
     Examples
@@ -166,45 +173,94 @@ def plot_density(
         raise ValueError("The value of credible_interval should be in the interval (0, 1]")
 
     to_plot = [list(xarray_var_iter(data, var_names, combined=True)) for data in datasets]
+    # hpd bounds (and median) of all the variables, sorting the samples only once
+    intervals = [
+        posterior_intervals(
+            data,
+            var_names=None if var_names is None else [name for name in var_names if name in data],
+            credible_interval=None if credible_interval == 1 else credible_interval,
+            quantiles=[0.5] if point_estimate == "median" else None,
+        )
+        for data in datasets
+    ]
     all_labels = []
-    length_plotters = []
-    for plotters in to_plot:
-        length_plotters.append(len(plotters))
-        for var_name, selection, _ in plotters:
+    densities = []
+    for m_idx, plotters in enumerate(to_plot):
+        for var_name, selection, values in plotters:
             label = make_label(var_name, selection)
             if label not in all_labels:
                 all_labels.append(label)
-    length_plotters = max(length_plotters)
+            density = _d_data(
+                values.flatten(),
+                intervals[m_idx][var_name].sel(selection).values,
+                bw,
+                credible_interval,
+                point_estimate,
+            )
+            density.update(label=label, model=m_idx)
+            densities.append(density)
+
+    plot_data = PlotData(
+        "plot_density",
+        dict(
+            labels=all_labels,
+            length_plotters=max(len(plotters) for plotters in to_plot),
+            densities=densities,
+            data_labels=data_labels,
+            colors=colors,
+            outline=outline,
+            hpd_markers=hpd_markers,
+            shade=shade,
+            figsize=figsize,
+            textsize=textsize,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render()
+
+
+@renderer("plot_density")
+def _draw_density(
+    ax=None,
+    labels=(),
+    length_plotters=0,
+    densities=(),
+    data_labels=(),
+    colors=(),
+    outline=True,
+    hpd_markers="",
+    shade=0.0,
+    figsize=None,
+    textsize=None,
+):
+    """Draw the densities computed by `plot_density`."""
     rows, cols = default_grid(length_plotters, max_cols=3)
 
     (figsize, _, titlesize, xt_labelsize, linewidth, markersize) = _scale_fig_size(
         figsize, textsize, rows, cols
     )
 
-    _, ax = _create_axes_grid(length_plotters, rows, cols, figsize=figsize, squeeze=False)
-
-    axis_map = {label: ax_ for label, ax_ in zip(all_labels, ax.flatten())}
-    for m_idx, plotters in enumerate(to_plot):
-        for var_name, selection, values in plotters:
-            label = make_label(var_name, selection)
-            _d_helper(
-                values.flatten(),
-                label,
-                colors[m_idx],
-                bw,
-                titlesize,
-                xt_labelsize,
-                linewidth,
-                markersize,
-                credible_interval,
-                point_estimate,
-                hpd_markers,
-                outline,
-                shade,
-                axis_map[label],
-            )
+    if ax is None:
+        _, ax = _create_axes_grid(length_plotters, rows, cols, figsize=figsize, squeeze=False)
+    ax = np.ravel(ax)
+
+    axis_map = {label: ax_ for label, ax_ in zip(labels, ax)}
+    for density in densities:
+        _d_helper(
+            density,
+            colors[density["model"]],
+            titlesize,
+            xt_labelsize,
+            linewidth,
+            markersize,
+            hpd_markers,
+            outline,
+            shade,
+            axis_map[density["label"]],
+        )
 
-    if n_data > 1:
+    if len(data_labels) > 1:
         for m_idx, label in enumerate(data_labels):
             ax[0].plot([], label=label, c=colors[m_idx], markersize=markersize)
         ax[0].legend(fontsize=xt_labelsize)
@@ -212,17 +268,65 @@ def plot_density(
     return ax
 
 
+def _d_data(vec, intervals, bw, credible_interval, point_estimate):
+    """Compute the density of an individual dimension.
+
+    Parameters
+    ----------
+    vec : array
+        1D array from trace
+    intervals : array
+        Lower and upper hpd values, unless `credible_interval` is 1, followed by the median
+        if `point_estimate` is "median"
+    bw : float
+        Bandwidth scaling factor. Should be larger than 0. The higher this number the smoother the
+        KDE will be. Defaults to 4.5 which is essentially the same as the Scott's rule of thumb
+        (the default used rule by SciPy).
+    credible_interval : float
+        Credible intervals. Defaults to 0.94
+    point_estimate : str or None
+        'mean' or 'median'
+
+    Returns
+    -------
+    dict
+        KDE of continuous variables or histogram of discrete ones within the hpd interval,
+        limits of the interval and point estimate.
+    """
+    if vec.dtype.kind == "f":
+        if credible_interval != 1:
+            new_vec = vec[(vec >= intervals[0]) & (vec <= intervals[1])]
+        else:
+            new_vec = vec
+
+        density, xmin, xmax = _fast_kde(new_vec, bw=bw)
+        density *= credible_interval
+        d_data = {"density": density}
+    else:
+        if credible_interval != 1:
+            xmin, xmax = int(intervals[0]), int(intervals[1])
+        else:
+            xmin, xmax = vec.min(), vec.max()
+        counts, bins = np.histogram(vec, bins=range(xmin, xmax + 2))
+        d_data = {"counts": counts, "bins": bins}
+
+    if point_estimate == "mean":
+        est = np.mean(vec)
+    elif point_estimate == "median":
+        est = intervals[-1]
+    else:
+        est = None
+    d_data.update(xmin=xmin, xmax=xmax, point_estimate=est)
+    return d_data
+
+
 def _d_helper(
-    vec,
-    vname,
+    d_data,
     color,
-    bw,
     titlesize,
     xt_labelsize,
     linewidth,
     markersize,
-    credible_interval,
-    point_estimate,
     hpd_markers,
     outline,
     shade,
@@ -232,16 +336,10 @@ def _d_helper(
 
     Parameters
     ----------
-    vec : array
-        1D array from trace
-    vname : str
-        variable name
+    d_data : dict
+        Density computed by `_d_data`
     color : str
         matplotlib color
-    bw : float
-        Bandwidth scaling factor. Should be larger than 0. The higher this number the smoother the
-        KDE will be. Defaults to 4.5 which is essentially the same as the Scott's rule of thumb
-        (the default used rule by SciPy).
     titlesize : float
         font size for title
     xt_labelsize : float
@@ -250,24 +348,14 @@ def _d_helper(
         Thickness of lines
     markersize : float
         Size of markers
-    credible_interval : float
-        Credible intervals. Defaults to 0.94
-    point_estimate : str or None
-        'mean' or 'median'
     shade : float
         Alpha blending value for the shaded area under the curve, between 0 (no shade) and 1
         (opaque). Defaults to 0.
     ax : matplotlib axes
     """
-    if vec.dtype.kind == "f":
-        if credible_interval != 1:
-            hpd_ = hpd(vec, credible_interval)
-            new_vec = vec[(vec >= hpd_[0]) & (vec <= hpd_[1])]
-        else:
-            new_vec = vec
-
-        density, xmin, xmax = _fast_kde(new_vec, bw=bw)
-        density *= credible_interval
+    xmin, xmax = d_data["xmin"], d_data["xmax"]
+    if "density" in d_data:
+        density = d_data["density"]
         x = np.linspace(xmin, xmax, len(density))
         ymin = density[0]
         ymax = density[-1]
@@ -281,26 +369,35 @@ def _d_helper(
             ax.fill_between(x, density, color=color, alpha=shade)
 
     else:
-        xmin, xmax = hpd(vec, credible_interval)
-        bins = range(xmin, xmax + 2)
+        counts, bins = d_data["counts"], d_data["bins"]
         if outline:
-            ax.hist(vec, bins=bins, color=color, histtype="step", align="left")
+            ax.hist(
+                bins[:-1],
+                bins=bins,
+                weights=counts,
+                color=color,
+                histtype="step",
+                align="left",
+            )
         if shade:
-            ax.hist(vec, bins=bins, color=color, alpha=shade)
+            ax.hist(bins[:-1], bins=bins, weights=counts, color=color, alpha=shade)
 
     if hpd_markers:
         ax.plot(xmin, 0, hpd_markers, color=color, markeredgecolor="k", markersize=markersize)
         ax.plot(xmax, 0, hpd_markers, color=color, markeredgecolor="k", markersize=markersize)
 
-    if point_estimate is not None:
-        if point_estimate == "mean":
-            est = np.mean(vec)
-        elif point_estimate == "median":
-            est = np.median(vec)
-        ax.plot(est, 0, "o", color=color, markeredgecolor="k", markersize=markersize)
+    if d_data["point_estimate"] is not None:
+        ax.plot(
+            d_data["point_estimate"],
+            0,
+            "o",
+            color=color,
+            markeredgecolor="k",
+            markersize=markersize,
+        )
 
     ax.set_yticks([])
-    ax.set_title(vname, fontsize=titlesize, wrap=True)
+    ax.set_title(d_data["label"], fontsize=titlesize, wrap=True)
     for pos in ["left", "right", "top"]:
         ax.spines[pos].set_visible(False)
     ax.tick_params(labelsize=xt_labelsize)
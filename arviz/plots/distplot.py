@@ -1,10 +1,14 @@
 """Plot distribution as histogram or kernel density estimates."""
+import numpy as np
 import matplotlib.pyplot as plt
 
-from .kdeplot import plot_kde
+from .kdeplot import _kde_data, _draw_kde
+from .plot_data import PlotData, renderer
 from .plot_utils import get_bins
+from ..profiling import traced
 
 
+@traced()
 def plot_dist(
     values,
     values2=None,
@@ -25,6 +29,7 @@ def plot_dist(
     contour_kwargs=None,
     hist_kwargs=None,
     ax=None,
+    compute_only=False,
 ):
     """Plot distribution as histogram or kernel density estimates.
 
@@ -78,17 +83,78 @@ def plot_dist(
     hist_kwargs : dict
         Keywords passed to the histogram.
     ax : matplotlib axes
+    compute_only : bool, optional
+        If True, compute the histogram or KDE and return it as a :class:`PlotData` without
+        drawing it. Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
     """
+    if kind == "auto":
+        kind = "hist" if values.dtype.kind == "i" else "density"
+
+    if kind == "hist":
+        if values2 is not None:
+            raise NotImplementedError("Insert hexbin plot here")
+        bins = None if hist_kwargs is None else hist_kwargs.get("bins")
+        if bins is None:
+            bins = get_bins(values)
+        counts, bins = np.histogram(values, bins=bins)
+        dist = {"kind": kind, "counts": counts, "bins": bins}
+    else:
+        dist = {"kind": kind, "kde": _kde_data(values, values2, cumulative, bw, contour, rug)}
+
+    plot_data = PlotData(
+        "plot_dist",
+        dict(
+            dist=dist,
+            color=color,
+            cumulative=cumulative,
+            label=label,
+            rotated=rotated,
+            rug=rug,
+            quantiles=quantiles,
+            contour=contour,
+            fill_last=fill_last,
+            textsize=textsize,
+            plot_kwargs=plot_kwargs,
+            fill_kwargs=fill_kwargs,
+            rug_kwargs=rug_kwargs,
+            contour_kwargs=contour_kwargs,
+            hist_kwargs=hist_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_dist")
+def _draw_dist(
+    ax=None,
+    dist=None,
+    color="C0",
+    cumulative=False,
+    label=None,
+    rotated=False,
+    rug=False,
+    quantiles=None,
+    contour=True,
+    fill_last=True,
+    textsize=None,
+    plot_kwargs=None,
+    fill_kwargs=None,
+    rug_kwargs=None,
+    contour_kwargs=None,
+    hist_kwargs=None,
+):
+    """Draw a histogram or KDE computed by `plot_dist`, see `plot_dist` for the arguments."""
     if ax is None:
         ax = plt.gca()
 
-    if hist_kwargs is None:
-        hist_kwargs = {}
-    hist_kwargs.setdefault("bins", None)
+    hist_kwargs = {} if hist_kwargs is None else dict(hist_kwargs)
+    hist_kwargs.pop("bins", None)
     hist_kwargs.setdefault("cumulative", cumulative)
     hist_kwargs.setdefault("color", color)
     hist_kwargs.setdefault("label", label)
@@ -96,32 +162,25 @@ def plot_dist(
     hist_kwargs.setdefault("align", "left")
     hist_kwargs.setdefault("density", True)
 
-    if plot_kwargs is None:
-        plot_kwargs = {}
+    plot_kwargs = {} if plot_kwargs is None else dict(plot_kwargs)
 
     if rotated:
         hist_kwargs.setdefault("orientation", "horizontal")
     else:
         hist_kwargs.setdefault("orientation", "vertical")
 
-    if kind == "auto":
-        kind = "hist" if values.dtype.kind == "i" else "density"
-
-    if kind == "hist":
-        _histplot_op(
-            values=values, values2=values2, rotated=rotated, ax=ax, hist_kwargs=hist_kwargs
-        )
-    elif kind == "density":
+    if dist["kind"] == "hist":
+        _histplot_op(dist["counts"], dist["bins"], rotated=rotated, ax=ax, hist_kwargs=hist_kwargs)
+    elif dist["kind"] == "density":
         plot_kwargs.setdefault("color", color)
         legend = label is not None
 
-        plot_kde(
-            values,
-            values2,
+        _draw_kde(
+            ax,
+            dist["kde"],
             cumulative=cumulative,
             rug=rug,
             label=label,
-            bw=bw,
             quantiles=quantiles,
             rotated=rotated,
             contour=contour,
@@ -132,20 +191,14 @@ def plot_dist(
             fill_kwargs=fill_kwargs,
             rug_kwargs=rug_kwargs,
             contour_kwargs=contour_kwargs,
-            ax=ax,
         )
     return ax
 
 
-def _histplot_op(values, values2, rotated, ax, hist_kwargs):
-    """Add a histogram for the data to the axes."""
-    if values2 is not None:
-        raise NotImplementedError("Insert hexbin plot here")
-
-    bins = hist_kwargs.pop("bins")
-    if bins is None:
-        bins = get_bins(values)
-    ax.hist(values, bins=bins, **hist_kwargs)
+def _histplot_op(counts, bins, rotated, ax, hist_kwargs):
+    """Add a histogram computed with `np.histogram` to the axes."""
+    # each bin is represented by its left edge weighted by its count
+    ax.hist(bins[:-1], bins=bins, weights=counts, **hist_kwargs)
     if rotated:
         ax.set_yticks(bins[:-1])
     else:
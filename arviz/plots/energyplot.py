@@ -3,10 +3,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from ..data import convert_to_dataset
 from ..stats import bfmi as e_bfmi
-from .kdeplot import plot_kde
+from .kdeplot import _kde_data, _draw_kde
+from .plot_data import PlotData, renderer
 from .plot_utils import _scale_fig_size
+from ..profiling import traced
 
 
+@traced()
 def plot_energy(
     data,
     kind="kde",
@@ -20,6 +23,7 @@ def plot_energy(
     fill_kwargs=None,
     plot_kwargs=None,
     ax=None,
+    compute_only=False,
 ):
     """Plot energy transition distribution and marginal energy distribution in HMC algorithms.
 
@@ -56,10 +60,13 @@ def plot_energy(
         Additional keywords passed to `arviz.plot_kde` or `plt.hist` (if type='hist')
     ax : axes
         Matplotlib axes.
+    compute_only : bool, optional
+        If True, compute the energy distributions and return them as a :class:`PlotData`
+        without drawing them. Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -82,58 +89,91 @@ def plot_energy(
     """
     energy = convert_to_dataset(data, group="sample_stats").energy.values
 
+    series = []
+    for label, value in zip(
+        ("Marginal Energy", "Energy transition"), (energy - energy.mean(), np.diff(energy))
+    ):
+        if kind == "kde":
+            series.append({"label": label, "kde": _kde_data(value, bw=bw)})
+        elif kind == "hist":
+            counts, bins = np.histogram(value.flatten(), bins="auto")
+            series.append({"label": label, "counts": counts, "bins": bins})
+        else:
+            raise ValueError("Plot type {} not recognized.".format(kind))
+
+    plot_data = PlotData(
+        "plot_energy",
+        dict(
+            series=series,
+            bfmi=e_bfmi(energy) if bfmi else None,
+            figsize=figsize,
+            legend=legend,
+            fill_alpha=fill_alpha,
+            fill_color=fill_color,
+            textsize=textsize,
+            fill_kwargs=fill_kwargs,
+            plot_kwargs=plot_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_energy")
+def _draw_energy(
+    ax=None,
+    series=(),
+    bfmi=None,
+    figsize=None,
+    legend=True,
+    fill_alpha=(1, 0.75),
+    fill_color=("C0", "C5"),
+    textsize=None,
+    fill_kwargs=None,
+    plot_kwargs=None,
+):
+    """Draw the energy distributions computed by `plot_energy`."""
     if ax is None:
         _, ax = plt.subplots(figsize=figsize, constrained_layout=True)
 
-    if fill_kwargs is None:
-        fill_kwargs = {}
+    fill_kwargs = {} if fill_kwargs is None else dict(fill_kwargs)
 
-    if plot_kwargs is None:
-        plot_kwargs = {}
+    plot_kwargs = {} if plot_kwargs is None else dict(plot_kwargs)
 
     figsize, _, _, xt_labelsize, linewidth, _ = _scale_fig_size(figsize, textsize, 1, 1)
 
-    series = zip(
-        fill_alpha,
-        fill_color,
-        ("Marginal Energy", "Energy transition"),
-        (energy - energy.mean(), np.diff(energy)),
-    )
-
-    if kind == "kde":
-        for alpha, color, label, value in series:
+    for alpha, color, energy_series in zip(fill_alpha, fill_color, series):
+        if "kde" in energy_series:
             fill_kwargs["alpha"] = alpha
             fill_kwargs["color"] = color
             plot_kwargs.setdefault("color", color)
             plot_kwargs.setdefault("alpha", 0)
             plot_kwargs.setdefault("linewidth", linewidth)
-            plot_kde(
-                value,
-                bw=bw,
-                label=label,
+            _draw_kde(
+                ax,
+                energy_series["kde"],
+                label=energy_series["label"],
                 textsize=xt_labelsize,
                 fill_kwargs=fill_kwargs,
                 plot_kwargs=plot_kwargs,
-                ax=ax,
                 legend=False,
             )
-    elif kind == "hist":
-        for alpha, color, label, value in series:
+        else:
+            bins = energy_series["bins"]
             ax.hist(
-                value.flatten(),
-                bins="auto",
+                bins[:-1],
+                bins=bins,
+                weights=energy_series["counts"],
                 density=True,
                 alpha=alpha,
-                label=label,
+                label=energy_series["label"],
                 color=color,
                 **plot_kwargs
             )
 
-    else:
-        raise ValueError("Plot type {} not recognized.".format(kind))
-
-    if bfmi:
-        for idx, val in enumerate(e_bfmi(energy)):
+    if bfmi is not None:
+        for idx, val in enumerate(bfmi):
             ax.plot([], label="chain {:>2} BFMI = {:.2f}".format(idx, val), alpha=0)
     if legend:
         ax.legend()
@@ -6,11 +6,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from ..data import convert_to_dataset
-from ..stats import hpd
+from ..stats.stats import _intervals
 from ..stats.diagnostics import _ess, _rhat
 from .plot_utils import _scale_fig_size, xarray_var_iter, make_label
 from .kdeplot import _fast_kde
 from ..utils import _var_names
+from ..profiling import traced
+from .plot_data import PlotData, renderer
 
 
 def pairwise(iterable):
@@ -20,6 +22,7 @@ def pairwise(iterable):
     return zip(first, second)
 
 
+@traced()
 def plot_forest(
     data,
     kind="forestplot",
@@ -38,6 +41,7 @@ def plot_forest(
     ridgeplot_alpha=None,
     ridgeplot_overlap=2,
     figsize=None,
+    compute_only=False,
 ):
     """Forest plot to compare credible intervals from a number of distributions.
 
@@ -92,10 +96,13 @@ def plot_forest(
         Overlap height for ridgeplots.
     figsize : tuple
         Figure size. If None it will be defined automatically.
+    compute_only : bool, optional
+        If True, compute the intervals, densities and diagnostics and return them as a
+        :class:`PlotData` without drawing them. Defaults to False.
 
     Returns
     -------
-    gridspec : matplotlib GridSpec
+    gridspec : matplotlib GridSpec, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -162,75 +169,229 @@ def plot_forest(
     if markersize is None:
         markersize = auto_markersize
 
-    fig, axes = plt.subplots(
-        nrows=1,
-        ncols=ncols,
-        figsize=figsize,
-        gridspec_kw={"width_ratios": width_ratios},
-        sharey=True,
-        constrained_layout=True,
+    rope_span = None
+    if kind == "forestplot":
+        if not (rope is None or isinstance(rope, dict)):
+            if len(rope) != 2:
+                raise ValueError(
+                    "Argument `rope` must be None, a dictionary like"
+                    '{"var_name": {"rope": (lo, hi)}}, or an '
+                    "iterable of length 2"
+                )
+            rope_span = tuple(rope)
+        rows = plot_handler.forestplot(credible_interval, quartiles, rope)
+    elif kind == "ridgeplot":
+        rows = plot_handler.ridgeplot(ridgeplot_overlap)
+    else:
+        raise TypeError(
+            "Argument 'kind' must be one of 'forestplot' or "
+            "'ridgeplot' (you provided {})".format(kind)
+        )
+
+    labels, ticks = plot_handler.labels_and_ticks()
+    all_plotters = list(plot_handler.plotters.values())
+    y_max = plot_handler.y_max() - all_plotters[-1].group_offset
+    if kind == "ridgeplot":  # space at the top
+        y_max += ridgeplot_overlap
+
+    plot_data = PlotData(
+        "plot_forest",
+        dict(
+            kind=kind,
+            rows=rows,
+            ess=plot_handler.ess() if ess else None,
+            r_hat=plot_handler.r_hat() if r_hat else None,
+            labels=[str(label) for label in labels],
+            ticks=ticks,
+            bands=plot_handler.band_limits() if len(plot_handler.data) > 1 else None,
+            ylim=(-all_plotters[0].group_offset, y_max),
+            rope_span=rope_span,
+            rope_ymax=plot_handler.y_max(),
+            credible_interval=credible_interval,
+            width_ratios=width_ratios,
+            figsize=figsize,
+            titlesize=titlesize,
+            xt_labelsize=xt_labelsize,
+            linewidth=linewidth,
+            markersize=markersize,
+            ridgeplot_alpha=ridgeplot_alpha,
+        ),
     )
+    if compute_only:
+        return plot_data
+    return plot_data.render()
+
+
+@renderer("plot_forest")
+def _draw_forest(
+    ax=None,
+    kind="forestplot",
+    rows=(),
+    ess=None,
+    r_hat=None,
+    labels=(),
+    ticks=(),
+    bands=None,
+    ylim=None,
+    rope_span=None,
+    rope_ymax=None,
+    credible_interval=0.94,
+    width_ratios=(3,),
+    figsize=None,
+    titlesize=None,
+    xt_labelsize=None,
+    linewidth=None,
+    markersize=None,
+    ridgeplot_alpha=None,
+):
+    """Draw the forest plot computed by `plot_forest`, return the figure and the axes."""
+    if ax is None:
+        fig, axes = plt.subplots(
+            nrows=1,
+            ncols=len(width_ratios),
+            figsize=figsize,
+            gridspec_kw={"width_ratios": list(width_ratios)},
+            sharey=True,
+            constrained_layout=True,
+        )
+        axes = np.atleast_1d(axes)
+    else:
+        axes = np.atleast_1d(ax)
+        fig = axes[0].figure
 
-    axes = np.atleast_1d(axes)
     if kind == "forestplot":
-        plot_handler.forestplot(
+        _draw_treeplot(
+            axes[0],
+            rows,
             credible_interval,
-            quartiles,
+            rope_span,
+            rope_ymax,
             xt_labelsize,
             titlesize,
             linewidth,
             markersize,
-            axes[0],
-            rope,
         )
-    elif kind == "ridgeplot":
-        plot_handler.ridgeplot(ridgeplot_overlap, linewidth, ridgeplot_alpha, axes[0])
     else:
-        raise TypeError(
-            "Argument 'kind' must be one of 'forestplot' or "
-            "'ridgeplot' (you provided {})".format(kind)
-        )
+        _draw_ridgeplot(axes[0], rows, linewidth, ridgeplot_alpha)
 
     idx = 1
-    if ess:
-        plot_handler.plot_neff(axes[idx], xt_labelsize, titlesize, markersize)
+    if ess is not None:
+        _draw_diagnostic(axes[idx], ess, xt_labelsize, markersize, clip_on=False)
+        axes[idx].set_xlim(left=0)
+        axes[idx].set_title("ess", fontsize=titlesize, wrap=True)
         idx += 1
 
-    if r_hat:
-        plot_handler.plot_rhat(axes[idx], xt_labelsize, titlesize, markersize)
+    if r_hat is not None:
+        _draw_diagnostic(axes[idx], r_hat, xt_labelsize, markersize)
+        axes[idx].set_xlim(left=0.9, right=2.1)
+        axes[idx].set_xticks([1, 2])
+        axes[idx].set_title("r_hat", fontsize=titlesize, wrap=True)
         idx += 1
 
-    for ax in axes:
-        ax.grid(False)
+    for ax_ in axes:
+        ax_.grid(False)
         # Remove ticklines on y-axes
-        for ticks in ax.yaxis.get_major_ticks():
-            ticks.tick1On = False
-            ticks.tick2On = False
+        for ticks_ in ax_.yaxis.get_major_ticks():
+            ticks_.tick1On = False
+            ticks_.tick2On = False
 
-        for loc, spine in ax.spines.items():
+        for loc, spine in ax_.spines.items():
             if loc in ["left", "right"]:
                 spine.set_visible(False)
 
-        if len(plot_handler.data) > 1:
-            plot_handler.make_bands(ax)
+        if bands is not None:
+            for band_idx, (y_start, y_stop) in enumerate(pairwise(bands)):
+                ax_.axhspan(y_start, y_stop, color="k", alpha=0.1 * (band_idx % 2))
 
-    labels, ticks = plot_handler.labels_and_ticks()
     axes[0].set_yticks(ticks)
     axes[0].set_yticklabels(labels)
-    all_plotters = list(plot_handler.plotters.values())
-    y_max = plot_handler.y_max() - all_plotters[-1].group_offset
-    if kind == "ridgeplot":  # space at the top
-        y_max += ridgeplot_overlap
-    axes[0].set_ylim(-all_plotters[0].group_offset, y_max)
+    axes[0].set_ylim(*ylim)
 
     return fig, axes
 
 
+def _draw_treeplot(
+    ax,
+    rows,
+    credible_interval,
+    rope_span,
+    rope_ymax,
+    xt_labelsize,
+    titlesize,
+    linewidth,
+    markersize,
+):
+    """Draw the credible intervals and quartiles of each row."""
+    for row in rows:
+        y, values, color = row["y"], row["ntiles"], row["color"]
+        if row["rope"] is not None:
+            ax.plot(
+                row["rope"],
+                (y + 0.05, y + 0.05),
+                lw=linewidth * 2,
+                color="C2",
+                solid_capstyle="round",
+                zorder=0,
+                alpha=0.7,
+            )
+
+        mid = len(values) // 2
+        param_iter = zip(
+            np.linspace(2 * linewidth, linewidth, mid, endpoint=True)[-1::-1], range(mid)
+        )
+        for width, j in param_iter:
+            ax.hlines(y, values[j], values[-(j + 1)], linewidth=width, color=color)
+        ax.plot(
+            values[mid], y, "o", mfc=ax.get_facecolor(), markersize=markersize * 0.75, color=color
+        )
+    ax.tick_params(labelsize=xt_labelsize)
+    ax.set_title(
+        "{:.1%} Credible Interval".format(credible_interval), fontsize=titlesize, wrap=True
+    )
+    if rope_span is not None:
+        ax.axvspan(rope_span[0], rope_span[1], 0, rope_ymax, color="C2", alpha=0.5)
+    return ax
+
+
+def _draw_ridgeplot(ax, rows, linewidth, alpha):
+    """Draw the scaled density of each row."""
+    if alpha is None:
+        alpha = 1.0
+    zorder = 0
+    for row in rows:
+        x, color = row["x"], row["color"]
+        y_min = row["y"] * np.ones_like(x)
+        y_max = row["density"] + y_min
+        if alpha == 0:
+            border = color
+        else:
+            border = "k"
+        ax.plot(x, y_max, "-", linewidth=linewidth, color=border, zorder=zorder)
+        ax.plot(x, y_min, "-", linewidth=linewidth, color=border, zorder=zorder)
+        ax.fill_between(x, y_min, y_max, alpha=alpha, color=color, zorder=zorder)
+        zorder -= 1
+    return ax
+
+
+def _draw_diagnostic(ax, points, xt_labelsize, markersize, **kwargs):
+    """Draw the effective sample size or r_hat of each label."""
+    for point in points:
+        ax.plot(
+            point["value"],
+            point["y"],
+            "o",
+            color=point["color"],
+            markersize=markersize,
+            markeredgecolor="k",
+            **kwargs
+        )
+    ax.tick_params(labelsize=xt_labelsize)
+    return ax
+
+
 class PlotHandler:
     """Class to handle logic from ForestPlot."""
 
-    # pylint: disable=inconsistent-return-statements
-
     def __init__(self, datasets, var_names, model_names, combined, colors):
         self.data = datasets
 
@@ -291,53 +452,22 @@ class PlotHandler:
             idxs.append(sub_idxs)
         return np.concatenate(labels), np.concatenate(idxs)
 
-    def display_multiple_ropes(self, rope, ax, y, linewidth, rope_var):
-        """Display ROPE when more than one interval is provided."""
-        vals = dict(rope[rope_var][0])["rope"]
-        ax.plot(
-            vals,
-            (y + 0.05, y + 0.05),
-            lw=linewidth * 2,
-            color="C2",
-            solid_capstyle="round",
-            zorder=0,
-            alpha=0.7,
-        )
-        return ax
-
-    def ridgeplot(self, mult, linewidth, alpha, ax):
-        """Draw ridgeplot for each plotter.
+    def ridgeplot(self, mult):
+        """Get the scaled density of each row.
 
         Parameters
         ----------
         mult : float
             How much to multiply height by. Set this to greater than 1 to have some overlap.
-        linewidth : float
-            Width of line on border of ridges
-        alpha : float
-            Transparency of ridges
-        ax : Axes
-            Axes to draw on
         """
-        if alpha is None:
-            alpha = 1.0
-        zorder = 0
+        rows = []
         for plotter in self.plotters.values():
             for x, y_min, y_max, color in plotter.ridgeplot(mult):
-                if alpha == 0:
-                    border = color
-                else:
-                    border = "k"
-                ax.plot(x, y_max, "-", linewidth=linewidth, color=border, zorder=zorder)
-                ax.plot(x, y_min, "-", linewidth=linewidth, color=border, zorder=zorder)
-                ax.fill_between(x, y_min, y_max, alpha=alpha, color=color, zorder=zorder)
-                zorder -= 1
-        return ax
-
-    def forestplot(
-        self, credible_interval, quartiles, xt_labelsize, titlesize, linewidth, markersize, ax, rope
-    ):
-        """Draw forestplot for each plotter.
+                rows.append({"y": y_min[0], "x": x, "density": y_max - y_min, "color": color})
+        return rows
+
+    def forestplot(self, credible_interval, quartiles, rope):
+        """Get the credible interval and quantiles of each row.
 
         Parameters
         ----------
@@ -345,16 +475,8 @@ class PlotHandler:
             How wide each line should be
         quartiles : bool
             Whether to mark quartiles
-        xt_textsize : float
-            Size of tick text
-        titlesize : float
-            Size of title text
-        linewidth : float
-            Width of forestplot line
-        markersize : float
-            Size of marker in center of forestplot line
-        ax : Axes
-            Axes to draw on
+        rope : dict, optional
+            ROPE of each variable, like {"var_name": {"rope": (lo, hi)}}
         """
         # Quantiles to be calculated
         endpoint = 100 * (1 - credible_interval) / 2
@@ -363,74 +485,35 @@ class PlotHandler:
         else:
             qlist = [endpoint, 50, 100 - endpoint]
 
+        rows = []
         for plotter in self.plotters.values():
             for y, rope_var, values, color in plotter.treeplot(qlist, credible_interval):
+                row_rope = None
                 if isinstance(rope, dict):
-                    self.display_multiple_ropes(rope, ax, y, linewidth, rope_var)
+                    row_rope = tuple(dict(rope[rope_var][0])["rope"])
+                rows.append({"y": y, "ntiles": values, "color": color, "rope": row_rope})
+        return rows
 
-                mid = len(values) // 2
-                param_iter = zip(
-                    np.linspace(2 * linewidth, linewidth, mid, endpoint=True)[-1::-1], range(mid)
-                )
-                for width, j in param_iter:
-                    ax.hlines(y, values[j], values[-(j + 1)], linewidth=width, color=color)
-                ax.plot(
-                    values[mid],
-                    y,
-                    "o",
-                    mfc=ax.get_facecolor(),
-                    markersize=markersize * 0.75,
-                    color=color,
-                )
-        ax.tick_params(labelsize=xt_labelsize)
-        ax.set_title(
-            "{:.1%} Credible Interval".format(credible_interval), fontsize=titlesize, wrap=True
-        )
-        if rope is None or isinstance(rope, dict):
-            return
-        elif len(rope) == 2:
-            ax.axvspan(rope[0], rope[1], 0, self.y_max(), color="C2", alpha=0.5)
-        else:
-            raise ValueError(
-                "Argument `rope` must be None, a dictionary like"
-                '{"var_name": {"rope": (lo, hi)}}, or an '
-                "iterable of length 2"
-            )
-        return ax
+    def ess(self):
+        """Get the effective sample size of each label."""
+        return [
+            {"y": y, "value": ess, "color": color}
+            for plotter in self.plotters.values()
+            for y, ess, color in plotter.ess()
+            if ess is not None
+        ]
 
-    def plot_neff(self, ax, xt_labelsize, titlesize, markersize):
-        """Draw effective n for each plotter."""
-        for plotter in self.plotters.values():
-            for y, ess, color in plotter.ess():
-                if ess is not None:
-                    ax.plot(
-                        ess,
-                        y,
-                        "o",
-                        color=color,
-                        clip_on=False,
-                        markersize=markersize,
-                        markeredgecolor="k",
-                    )
-        ax.set_xlim(left=0)
-        ax.set_title("ess", fontsize=titlesize, wrap=True)
-        ax.tick_params(labelsize=xt_labelsize)
-        return ax
-
-    def plot_rhat(self, ax, xt_labelsize, titlesize, markersize):
-        """Draw r-hat for each plotter."""
-        for plotter in self.plotters.values():
-            for y, r_hat, color in plotter.r_hat():
-                if r_hat is not None:
-                    ax.plot(r_hat, y, "o", color=color, markersize=markersize, markeredgecolor="k")
-        ax.set_xlim(left=0.9, right=2.1)
-        ax.set_xticks([1, 2])
-        ax.tick_params(labelsize=xt_labelsize)
-        ax.set_title("r_hat", fontsize=titlesize, wrap=True)
-        return ax
-
-    def make_bands(self, ax):
-        """Draw shaded horizontal bands for each plotter."""
+    def r_hat(self):
+        """Get the r_hat of each label."""
+        return [
+            {"y": y, "value": r_hat, "color": color}
+            for plotter in self.plotters.values()
+            for y, r_hat, color in plotter.r_hat()
+            if r_hat is not None
+        ]
+
+    def band_limits(self):
+        """Get the limits of the shaded horizontal bands for each plotter."""
         y_vals, y_prev, is_zero = [0], None, False
         prev_color_index = 0
         for plotter in self.plotters.values():
@@ -447,9 +530,7 @@ class PlotHandler:
         offset = plotter.group_offset  # pylint: disable=undefined-loop-variable
 
         y_vals.append(y_prev + offset)
-        for idx, (y_start, y_stop) in enumerate(pairwise(y_vals)):
-            ax.axhspan(y_start, y_stop, color="k", alpha=0.1 * (idx % 2))
-        return ax
+        return y_vals
 
     def fig_height(self):
         """Figure out the height of this plot."""
@@ -537,8 +618,10 @@ class VarHandler:
     def treeplot(self, qlist, credible_interval):
         """Get data for each treeplot for the variable."""
         for y, _, label, values, color in self.iterator():
-            ntiles = np.percentile(values.flatten(), qlist)
-            ntiles[0], ntiles[-1] = hpd(values.flatten(), credible_interval)
+            hpd_lower, hpd_upper, *quantiles = _intervals(
+                values.flatten(), [credible_interval], np.array(qlist[1:-1]) / 100
+            )
+            ntiles = np.array([hpd_lower, *quantiles, hpd_upper])
             yield y, label, ntiles, color
 
     def ridgeplot(self, mult):
@@ -547,7 +630,7 @@ class VarHandler:
         for y, *_, values, color in self.iterator():
             yvals.append(y)
             colors.append(color)
-            values = values.flatten()
+            values = np.ravel(values)
             density, lower, upper = _fast_kde(values)
             xvals.append(np.linspace(lower, upper, len(density)))
             pdfs.append(density)
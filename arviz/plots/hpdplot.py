@@ -5,8 +5,11 @@ from scipy.interpolate import griddata
 from scipy.signal import savgol_filter
 
 from ..stats import hpd
+from .plot_data import PlotData, renderer
+from ..profiling import traced
 
 
+@traced()
 def plot_hpd(
     x,
     y,
@@ -18,6 +21,7 @@ def plot_hpd(
     fill_kwargs=None,
     plot_kwargs=None,
     ax=None,
+    compute_only=False,
 ):
     """
     Plot hpd intervals for regression data.
@@ -47,24 +51,14 @@ def plot_hpd(
     plot_kwargs : dict
         Keywords passed to HPD limits
     ax : matplotlib axes
+    compute_only : bool, optional
+        If True, compute the hpd band and return it as a :class:`PlotData` without drawing it.
+        Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
     """
-    if plot_kwargs is None:
-        plot_kwargs = {}
-    plot_kwargs.setdefault("color", color)
-    plot_kwargs.setdefault("alpha", 0)
-
-    if fill_kwargs is None:
-        fill_kwargs = {}
-    fill_kwargs.setdefault("color", color)
-    fill_kwargs.setdefault("alpha", 0.5)
-
-    if ax is None:
-        ax = gca()
-
     x = np.asarray(x)
     y = np.asarray(y)
 
@@ -95,6 +89,35 @@ def plot_hpd(
         x_data = x[idx]
         y_data = hpd_[idx]
 
+    plot_data = PlotData(
+        "plot_hpd",
+        dict(
+            x_data=x_data,
+            y_data=y_data,
+            color=color,
+            fill_kwargs=fill_kwargs,
+            plot_kwargs=plot_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_hpd")
+def _draw_hpd(ax=None, x_data=None, y_data=None, color="C1", fill_kwargs=None, plot_kwargs=None):
+    """Draw the hpd band computed by `plot_hpd`."""
+    plot_kwargs = {} if plot_kwargs is None else dict(plot_kwargs)
+    plot_kwargs.setdefault("color", color)
+    plot_kwargs.setdefault("alpha", 0)
+
+    fill_kwargs = {} if fill_kwargs is None else dict(fill_kwargs)
+    fill_kwargs.setdefault("color", color)
+    fill_kwargs.setdefault("alpha", 0.5)
+
+    if ax is None:
+        ax = gca()
+
     ax.plot(x_data, y_data, **plot_kwargs)
     ax.fill_between(x_data, y_data[:, 0], y_data[:, 1], **fill_kwargs)
 
@@ -2,12 +2,22 @@
 import matplotlib.pyplot as plt
 
 from ..data import convert_to_dataset
-from .distplot import plot_dist
-from .kdeplot import plot_kde
-from .plot_utils import _scale_fig_size, xarray_var_iter, make_label, get_coords
+from .distplot import plot_dist, _draw_dist
+from .kdeplot import plot_kde, _draw_kde
+from .plot_data import PlotData, renderer
+from .plot_utils import (
+    _scale_fig_size,
+    xarray_var_iter,
+    make_label,
+    get_coords,
+    histogram_2d,
+    plot_histogram_2d,
+)
 from ..utils import _var_names
+from ..profiling import traced
 
 
+@traced()
 def plot_joint(
     data,
     var_names=None,
@@ -20,6 +30,8 @@ def plot_joint(
     fill_last=True,
     joint_kwargs=None,
     marginal_kwargs=None,
+    aggregate=False,
+    compute_only=False,
 ):
     """
     Plot a scatter or hexbin of two variables with their respective marginals distributions.
@@ -51,12 +63,19 @@ def plot_joint(
         Additional keywords modifying the join distribution (central subplot)
     marginal_kwargs : dicts, optional
         Additional keywords modifying the marginals distributions (top and right subplot)
+    aggregate : bool, optional
+        Only works for kind=scatter. If True, draw the number of draws in each pixel of the
+        central subplot as an image instead of one marker per draw. Defaults to False.
+    compute_only : bool, optional
+        If True, compute the joint and marginal distributions and return them as a
+        :class:`PlotData` without drawing them. Defaults to False.
 
     Returns
     -------
     axjoin : matplotlib axes, join (central) distribution
     ax_hist_x : matplotlib axes, x (top) distribution
     ax_hist_y : matplotlib axes, y (right) distribution
+    plot_data : PlotData, instead of the axes if `compute_only` is True
 
     Examples
     --------
@@ -126,45 +145,108 @@ def plot_joint(
     marginal_kwargs.setdefault("plot_kwargs", {})
     marginal_kwargs["plot_kwargs"]["linewidth"] = linewidth
 
-    # Instantiate figure and grid
-    fig, _ = plt.subplots(0, 0, figsize=figsize, constrained_layout=True)
-    grid = plt.GridSpec(4, 4, hspace=0.1, wspace=0.1, figure=fig)
-
-    # Set up main plot
-    axjoin = fig.add_subplot(grid[1:, :-1])
-
-    # Set up top KDE
-    ax_hist_x = fig.add_subplot(grid[0, :-1], sharex=axjoin)
-    ax_hist_x.tick_params(labelleft=False, labelbottom=False)
-
-    # Set up right KDE
-    ax_hist_y = fig.add_subplot(grid[1:, -1], sharey=axjoin)
-    ax_hist_y.tick_params(labelleft=False, labelbottom=False)
-
     # Set labels for axes
     x_var_name = make_label(plotters[0][0], plotters[0][1])
     y_var_name = make_label(plotters[1][0], plotters[1][1])
 
-    axjoin.set_xlabel(x_var_name, fontsize=ax_labelsize)
-    axjoin.set_ylabel(y_var_name, fontsize=ax_labelsize)
-    axjoin.tick_params(labelsize=xt_labelsize)
-
     # Flatten data
     x = plotters[0][2].flatten()
     y = plotters[1][2].flatten()
 
-    if kind == "scatter":
-        axjoin.scatter(x, y, **joint_kwargs)
-    elif kind == "kde":
-        plot_kde(x, y, contour=contour, fill_last=fill_last, ax=axjoin, **joint_kwargs)
+    joint = {"kind": kind}
+    if kind == "kde":
+        joint["kde"] = plot_kde(
+            x, y, contour=contour, fill_last=fill_last, compute_only=True, **joint_kwargs
+        ).data
+    elif kind == "scatter" and aggregate:
+        # one cell per pixel of the central subplot, which spans 3/4 of the figure
+        dpi = plt.rcParams["figure.dpi"]
+        shape = tuple(int(0.75 * size * dpi) for size in figsize)
+        joint["counts"], joint["extent"] = histogram_2d(x, y, shape)
     else:
-        if gridsize == "auto":
+        joint["x"], joint["y"] = x, y
+        if kind == "hexbin" and gridsize == "auto":
             gridsize = int(len(x) ** 0.35)
-        axjoin.hexbin(x, y, mincnt=1, gridsize=gridsize, **joint_kwargs)
+
+    marginals = [
+        plot_dist(
+            val, textsize=xt_labelsize, rotated=rotate, compute_only=True, **marginal_kwargs
+        ).data
+        for val, rotate in ((x, False), (y, True))
+    ]
+
+    plot_data = PlotData(
+        "plot_joint",
+        dict(
+            joint=joint,
+            marginals=marginals,
+            x_var_name=x_var_name,
+            y_var_name=y_var_name,
+            gridsize=gridsize,
+            figsize=figsize,
+            ax_labelsize=ax_labelsize,
+            xt_labelsize=xt_labelsize,
+            joint_kwargs=joint_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render()
+
+
+@renderer("plot_joint")
+def _draw_joint(
+    ax=None,
+    joint=None,
+    marginals=(),
+    x_var_name="",
+    y_var_name="",
+    gridsize=None,
+    figsize=None,
+    ax_labelsize=None,
+    xt_labelsize=None,
+    joint_kwargs=None,
+):
+    """Draw the joint plot computed by `plot_joint`.
+
+    `ax` is None or the tuple of the central, top and right axes.
+    """
+    joint_kwargs = {} if joint_kwargs is None else joint_kwargs
+
+    if ax is None:
+        # Instantiate figure and grid
+        fig, _ = plt.subplots(0, 0, figsize=figsize, constrained_layout=True)
+        grid = plt.GridSpec(4, 4, hspace=0.1, wspace=0.1, figure=fig)
+
+        # Set up main plot
+        axjoin = fig.add_subplot(grid[1:, :-1])
+
+        # Set up top KDE
+        ax_hist_x = fig.add_subplot(grid[0, :-1], sharex=axjoin)
+        ax_hist_x.tick_params(labelleft=False, labelbottom=False)
+
+        # Set up right KDE
+        ax_hist_y = fig.add_subplot(grid[1:, -1], sharey=axjoin)
+        ax_hist_y.tick_params(labelleft=False, labelbottom=False)
+    else:
+        axjoin, ax_hist_x, ax_hist_y = ax
+
+    axjoin.set_xlabel(x_var_name, fontsize=ax_labelsize)
+    axjoin.set_ylabel(y_var_name, fontsize=ax_labelsize)
+    axjoin.tick_params(labelsize=xt_labelsize)
+
+    if "counts" in joint:
+        plot_histogram_2d(axjoin, joint["counts"], joint["extent"], **joint_kwargs)
+    elif joint["kind"] == "scatter":
+        axjoin.scatter(joint["x"], joint["y"], **joint_kwargs)
+    elif joint["kind"] == "kde":
+        _draw_kde(ax=axjoin, **joint["kde"])
+    else:
+        axjoin.hexbin(joint["x"], joint["y"], mincnt=1, gridsize=gridsize, **joint_kwargs)
         axjoin.grid(False)
 
-    for val, ax, rotate in ((x, ax_hist_x, False), (y, ax_hist_y, True)):
-        plot_dist(val, textsize=xt_labelsize, rotated=rotate, ax=ax, **marginal_kwargs)
+    for marginal, ax_ in zip(marginals, (ax_hist_x, ax_hist_y)):
+        _draw_dist(ax=ax_, **marginal)
 
     ax_hist_x.set_xlim(axjoin.get_xlim())
     ax_hist_y.set_ylim(axjoin.get_ylim())
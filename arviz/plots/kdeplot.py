@@ -2,14 +2,21 @@
 import warnings
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.signal import gaussian, convolve, convolve2d  # pylint: disable=no-name-in-module
-from scipy.sparse import coo_matrix
+from scipy.signal import convolve  # pylint: disable=no-name-in-module
 import xarray as xr
 from ..data.inference_data import InferenceData
-from ..utils import conditional_jit
+from ..rcparams import rcParams
+from ..stats import kernels as _kernels
+from ..stats.cache import cached as _cached
+from .plot_data import PlotData, renderer
 from .plot_utils import _scale_fig_size
+from ..profiling import traced
 
+# Gaussian kernels are truncated at this number of standard deviations
+_KERNEL_SUPPORT = 4
 
+
+@traced()
 def plot_kde(
     values,
     values2=None,
@@ -30,6 +37,7 @@ def plot_kde(
     pcolormesh_kwargs=None,
     ax=None,
     legend=True,
+    compute_only=False,
 ):
     """1D or 2D KDE plot taking into account boundary conditions.
 
@@ -80,10 +88,13 @@ def plot_kde(
     ax : matplotlib axes
     legend : bool
         Add legend to the figure. By default True.
+    compute_only : bool, optional
+        If True, compute the KDE and return it as a :class:`PlotData` without drawing it.
+        Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -146,13 +157,6 @@ def plot_kde(
         >>> az.plot_kde(mu_posterior, values2=tau_posterior, contour=False)
 
     """
-    if ax is None:
-        ax = plt.gca()
-
-    figsize = ax.get_figure().get_size_inches()
-
-    figsize, *_, xt_labelsize, linewidth, markersize = _scale_fig_size(figsize, textsize, 1, 1)
-
     if isinstance(values, xr.Dataset):
         raise ValueError(
             "Xarray dataset object detected.Use plot_posterior, plot_density, plot_joint"
@@ -161,20 +165,88 @@ def plot_kde(
     if isinstance(values, InferenceData):
         raise ValueError(" Inference Data object detected. Use plot_posterior instead of plot_kde")
 
+    plot_data = PlotData(
+        "plot_kde",
+        dict(
+            kde=_kde_data(values, values2, cumulative, bw, contour, rug),
+            cumulative=cumulative,
+            rug=rug,
+            label=label,
+            quantiles=quantiles,
+            rotated=rotated,
+            contour=contour,
+            fill_last=fill_last,
+            textsize=textsize,
+            plot_kwargs=plot_kwargs,
+            fill_kwargs=fill_kwargs,
+            rug_kwargs=rug_kwargs,
+            contour_kwargs=contour_kwargs,
+            contourf_kwargs=contourf_kwargs,
+            pcolormesh_kwargs=pcolormesh_kwargs,
+            legend=legend,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+def _kde_data(values, values2=None, cumulative=False, bw=4.5, contour=True, rug=False):
+    """Compute the 1D or 2D KDE drawn by `plot_kde`.
+
+    The samples are only kept if they are needed to draw the rug of a 1D KDE.
+    """
     if values2 is None:
-        if plot_kwargs is None:
-            plot_kwargs = {}
+        density, lower, upper = _fast_kde(values, cumulative, bw)
+        kde = {"density": density, "lower": lower, "upper": upper}
+        if rug:
+            kde["values"] = np.asarray(values)
+        return kde
+
+    gridsize = (128, 128) if contour else (256, 256)
+    density, xmin, xmax, ymin, ymax = _fast_kde_2d(values, values2, gridsize=gridsize)
+    return {"density": density, "xmin": xmin, "xmax": xmax, "ymin": ymin, "ymax": ymax}
+
+
+@renderer("plot_kde")
+def _draw_kde(
+    ax=None,
+    kde=None,
+    cumulative=False,
+    rug=False,
+    label=None,
+    quantiles=None,
+    rotated=False,
+    contour=True,
+    fill_last=True,
+    textsize=None,
+    plot_kwargs=None,
+    fill_kwargs=None,
+    rug_kwargs=None,
+    contour_kwargs=None,
+    contourf_kwargs=None,
+    pcolormesh_kwargs=None,
+    legend=True,
+):
+    """Draw a KDE computed by `_kde_data`, see `plot_kde` for the other arguments."""
+    if ax is None:
+        ax = plt.gca()
+
+    figsize = ax.get_figure().get_size_inches()
+
+    figsize, *_, xt_labelsize, linewidth, markersize = _scale_fig_size(figsize, textsize, 1, 1)
+
+    if "xmin" not in kde:
+        plot_kwargs = {} if plot_kwargs is None else dict(plot_kwargs)
         plot_kwargs.setdefault("color", "C0")
 
         default_color = plot_kwargs.get("color")
 
-        if fill_kwargs is None:
-            fill_kwargs = {}
+        fill_kwargs = {} if fill_kwargs is None else dict(fill_kwargs)
 
         fill_kwargs.setdefault("color", default_color)
 
-        if rug_kwargs is None:
-            rug_kwargs = {}
+        rug_kwargs = {} if rug_kwargs is None else dict(rug_kwargs)
         rug_kwargs.setdefault("marker", "_" if rotated else "|")
         rug_kwargs.setdefault("linestyle", "None")
         rug_kwargs.setdefault("color", default_color)
@@ -183,7 +255,7 @@ def plot_kde(
         plot_kwargs.setdefault("linewidth", linewidth)
         rug_kwargs.setdefault("markersize", 2 * markersize)
 
-        density, lower, upper = _fast_kde(values, cumulative, bw)
+        density, lower, upper = kde["density"], kde["lower"], kde["upper"]
 
         rug_space = max(density) * rug_kwargs.pop("space")
 
@@ -203,12 +275,15 @@ def plot_kde(
 
         if rotated:
             ax.set_xlim(0, auto=True)
-            rug_x, rug_y = np.zeros_like(values) - rug_space, values
         else:
             ax.set_ylim(0, auto=True)
-            rug_x, rug_y = values, np.zeros_like(values) - rug_space
 
         if rug:
+            values = kde["values"]
+            if rotated:
+                rug_x, rug_y = np.zeros_like(values) - rug_space, values
+            else:
+                rug_x, rug_y = values, np.zeros_like(values) - rug_space
             ax.plot(rug_x, rug_y, **rug_kwargs)
 
         if quantiles is not None:
@@ -233,18 +308,16 @@ def plot_kde(
         if legend and label:
             ax.legend()
     else:
-        if contour_kwargs is None:
-            contour_kwargs = {}
+        contour_kwargs = {} if contour_kwargs is None else dict(contour_kwargs)
         contour_kwargs.setdefault("colors", "0.5")
         if contourf_kwargs is None:
             contourf_kwargs = {}
         if pcolormesh_kwargs is None:
             pcolormesh_kwargs = {}
 
-        gridsize = (128, 128) if contour else (256, 256)
-
-        density, xmin, xmax, ymin, ymax = _fast_kde_2d(values, values2, gridsize=gridsize)
-        g_s = complex(gridsize[0])
+        density = kde["density"]
+        xmin, xmax, ymin, ymax = kde["xmin"], kde["xmax"], kde["ymin"], kde["ymax"]
+        g_s = complex(density.shape[0])
         x_x, y_y = np.mgrid[xmin:xmax:g_s, ymin:ymax:g_s]
 
         ax.grid(False)
@@ -262,7 +335,9 @@ def plot_kde(
     return ax
 
 
-def _fast_kde(x, cumulative=False, bw=4.5, xmin=None, xmax=None):
+@traced()
+@_cached(rc_keys=("kde.grid_size",))
+def _fast_kde(x, cumulative=False, bw=4.5, xmin=None, xmax=None, reflect=True):
     """Fast Fourier transform-based Gaussian kernel density estimate (KDE).
 
     The code was adapted from https://github.com/mfouesneau/faststats
@@ -280,6 +355,9 @@ def _fast_kde(x, cumulative=False, bw=4.5, xmin=None, xmax=None):
         Manually set lower limit.
     xmax : float
         Manually set upper limit.
+    reflect : bool
+        If True, the density that would fall outside of the limits is reflected back inside.
+        Defaults to True.
 
     Returns
     -------
@@ -293,8 +371,7 @@ def _fast_kde(x, cumulative=False, bw=4.5, xmin=None, xmax=None):
         warnings.warn("kde plot failed, you may want to check your data")
         return np.array([np.nan]), np.nan, np.nan
 
-    len_x = len(x)
-    n_points = 200 if (xmin or xmax) is None else 500
+    n_points = rcParams["kde.grid_size"] if (xmin or xmax) is None else 500
 
     if xmin is None:
         xmin = np.min(x)
@@ -304,39 +381,153 @@ def _fast_kde(x, cumulative=False, bw=4.5, xmin=None, xmax=None):
     assert np.min(x) >= xmin
     assert np.max(x) <= xmax
 
+    density = _kde_rows(
+        x[np.newaxis], np.array([xmin]), np.array([xmax]), n_points, bw, cumulative, reflect
+    )
+    if density is None:
+        warnings.warn("kde plot failed, you may want to check your data")
+        return np.array([np.nan]), np.nan, np.nan
+
+    return density[0], xmin, xmax
+
+
+@traced()
+def _fast_kde_batch(
+    ary, cumulative=False, bw=4.5, xmin=None, xmax=None, shared_grid=False, reflect=True
+):
+    """Compute the Gaussian KDE of every row of a 2D array at once.
+
+    All the rows are binned with a single ``np.bincount`` and convolved with the same kernel
+    along the grid axis. Each row gives the same result as `_fast_kde` when it has no missing
+    values, otherwise the missing values are ignored but the bandwidth and number of grid
+    points are still computed from the number of columns.
+
+    Parameters
+    ----------
+    ary : 2D array_like
+        Samples with shape (n_series, n_samples).
+    cumulative : bool
+        If true, estimate the cdfs instead of the pdfs
+    bw : float
+        Bandwidth scaling factor for the KDE, see `_fast_kde`.
+    xmin : float or 1D array_like, optional
+        Lower limit of the grid, common or for each row. Defaults to the minimum of each row.
+    xmax : float or 1D array_like, optional
+        Upper limit of the grid, common or for each row. Defaults to the maximum of each row.
+    shared_grid : bool
+        If True, the default limits are the minimum and maximum of the whole array, so that all
+        the densities are evaluated on the same grid.
+    reflect : bool
+        If True, the density that would fall outside of the limits is reflected back inside.
+        Defaults to True.
+
+    Returns
+    -------
+    density: 2D array with the gridded KDE of each row
+    xmin: 1D array with the lower limit of the grid of each row
+    xmax: 1D array with the upper limit of the grid of each row
+    """
+    ary = np.atleast_2d(np.asarray(ary, dtype=float))
+    n_series = len(ary)
+    n_points = rcParams["kde.grid_size"] if xmin is None and xmax is None else 500
+    finite_ary = np.where(np.isfinite(ary), ary, np.nan)
+    axis = None if shared_grid else 1
+    with warnings.catch_warnings():
+        # rows without finite values have NaN limits
+        warnings.simplefilter("ignore", RuntimeWarning)
+        row_min = np.broadcast_to(np.nanmin(finite_ary, axis=axis), n_series)
+        row_max = np.broadcast_to(np.nanmax(finite_ary, axis=axis), n_series)
+    xmin = row_min if xmin is None else np.broadcast_to(np.asarray(xmin, dtype=float), n_series)
+    xmax = row_max if xmax is None else np.broadcast_to(np.asarray(xmax, dtype=float), n_series)
+
+    density = _kde_rows(ary, xmin, xmax, n_points, bw, cumulative, reflect)
+    if density is None:
+        warnings.warn("kde plot failed, you may want to check your data")
+        return np.full((n_series, 1), np.nan), np.full(n_series, np.nan), np.full(n_series, np.nan)
+    return density, xmin, xmax
+
+
+def _kde_rows(ary, xmin, xmax, n_points, bw, cumulative, reflect):
+    """Compute the KDE of each row of `ary` on a grid between `xmin` and `xmax` of that row.
+
+    Return None if there are too few samples for a grid of at least two points.
+    """
+    len_x = ary.shape[1]
     log_len_x = np.log(len_x) * bw
 
     n_bins = min(int(len_x ** (1 / 3) * log_len_x * 2), n_points)
     if n_bins < 2:
-        warnings.warn("kde plot failed, you may want to check your data")
-        return np.array([np.nan]), np.nan, np.nan
+        return None
 
     d_x = (xmax - xmin) / (n_bins - 1)
-    grid = _histogram(x, n_bins, range_hist=(xmin, xmax))
+    grid = _linear_binning_rows(ary, n_bins, xmin, xmax)
+    n_samples = grid.sum(axis=1)
 
+    # kernel standard deviation in grid units
     scotts_factor = len_x ** (-0.2)
-    kern_nx = int(scotts_factor * 2 * np.pi * log_len_x)
-    kernel = gaussian(kern_nx, scotts_factor * log_len_x)
+    kernel, half_width = _gaussian_kernel(scotts_factor * log_len_x, n_bins)
 
-    npad = min(n_bins, 2 * kern_nx)
-    grid = np.concatenate([grid[npad:0:-1], grid, grid[n_bins : n_bins - npad : -1]])
-    density = convolve(grid, kernel, mode="same", method="direct")[npad : npad + n_bins]
-    norm_factor = len_x * d_x * (2 * np.pi * log_len_x ** 2 * scotts_factor ** 2) ** 0.5
+    if reflect:
+        grid = np.pad(grid, ((0, 0), (half_width, half_width)), mode="reflect")
+        density = convolve(grid, kernel[np.newaxis], mode="valid", method="auto")
+    else:
+        density = convolve(grid, kernel[np.newaxis], mode="same", method="auto")
+    # fft convolution can leave tiny negative values
+    density = np.maximum(density, 0)
 
-    density /= norm_factor
+    with np.errstate(invalid="ignore", divide="ignore"):
+        density /= (n_samples * d_x * kernel.sum())[:, np.newaxis]
 
-    if cumulative:
-        density = density.cumsum() / density.sum()
+        if cumulative:
+            density = density.cumsum(axis=1) / density.sum(axis=1, keepdims=True)
 
-    return density, xmin, xmax
+    return density
 
 
-@conditional_jit
-def _histogram(x, n_bins, range_hist=None):
-    grid, _ = np.histogram(x, bins=n_bins, range=range_hist)
-    return grid
+def _gaussian_kernel(std, n_bins):
+    """Gaussian kernel of `std` grid units, truncated at `_KERNEL_SUPPORT` standard deviations.
 
+    The support is also capped to the size of the grid, `n_bins`, kernel values farther away
+    never reach the grid. Return the kernel and its half width.
+    """
+    half_width = int(min(np.ceil(_KERNEL_SUPPORT * std), n_bins - 1))
+    offsets = np.arange(-half_width, half_width + 1)
+    return np.exp(-0.5 * (offsets / std) ** 2), half_width
 
+
+def _linear_binning_rows(ary, n_bins, xmin, xmax):
+    """Linear binning of each row of `ary` on a grid of `n_bins` points from `xmin` to `xmax`.
+
+    Each sample is split between its two closest grid points, proportionally to its
+    proximity to each of them. All the rows are binned with a single bincount, values
+    outside the grid are ignored.
+    """
+    if _kernels.use_kernels():
+        return _kernels.linear_binning_rows(
+            np.ascontiguousarray(ary),
+            n_bins,
+            np.ascontiguousarray(xmin),
+            np.ascontiguousarray(xmax),
+        )
+    n_series = len(ary)
+    xmin = xmin[:, np.newaxis]
+    xmax = xmax[:, np.newaxis]
+    d_x = (xmax - xmin) / (n_bins - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        keep = (ary >= xmin) & (ary <= xmax)
+        # empty ranges put all the samples in the first grid point
+        position = np.where(keep & (d_x > 0), (ary - xmin) / d_x, 0)
+    lower = np.clip(np.floor(position).astype(np.intp), 0, n_bins - 2)
+    upper_weight = (position - lower) * keep
+    lower_weight = keep - upper_weight
+    lower += np.arange(n_series)[:, np.newaxis] * n_bins
+    size = n_series * n_bins
+    grid = np.bincount(lower.ravel(), lower_weight.ravel(), minlength=size)
+    grid += np.bincount(lower.ravel() + 1, upper_weight.ravel(), minlength=size)[:size]
+    return grid.reshape(n_series, n_bins)
+
+
+@traced()
 def _fast_kde_2d(x, y, gridsize=(128, 128), circular=False):
     """
     2D fft-based Gaussian kernel density estimate (KDE).
@@ -360,49 +551,63 @@ def _fast_kde_2d(x, y, gridsize=(128, 128), circular=False):
     ymax: maximum value of y
     """
     x = np.asarray(x, dtype=float)
-    x = x[np.isfinite(x)]
     y = np.asarray(y, dtype=float)
-    y = y[np.isfinite(y)]
+    finite = np.isfinite(x) & np.isfinite(y)
+    x = x[finite]
+    y = y[finite]
 
     xmin, xmax = x.min(), x.max()
     ymin, ymax = y.min(), y.max()
 
     len_x = len(x)
-    weights = np.ones(len_x)
     n_x, n_y = gridsize
 
     d_x = (xmax - xmin) / (n_x - 1)
     d_y = (ymax - ymin) / (n_y - 1)
 
-    xyi = np.vstack((x, y)).T
-    xyi -= [xmin, ymin]
-    xyi /= [d_x, d_y]
-    xyi = np.floor(xyi, xyi).T
-
-    scotts_factor = len_x ** (-1 / 6)
-    cov = np.cov(xyi)
-    std_devs = np.diag(cov ** 0.5)
-    kern_nx, kern_ny = np.round(scotts_factor * 2 * np.pi * std_devs)
-
-    inv_cov = np.linalg.inv(cov * scotts_factor ** 2)
-
-    x_x = np.arange(kern_nx) - kern_nx / 2
-    y_y = np.arange(kern_ny) - kern_ny / 2
-    x_x, y_y = np.meshgrid(x_x, y_y)
+    # positions in grid units
+    x_pos = (x - xmin) / d_x
+    y_pos = (y - ymin) / d_y
 
-    kernel = np.vstack((x_x.flatten(), y_y.flatten()))
-    kernel = np.dot(inv_cov, kernel) * kernel
-    kernel = np.exp(-kernel.sum(axis=0) / 2)
-    kernel = kernel.reshape((int(kern_ny), int(kern_nx)))
-
-    boundary = "wrap" if circular else "symm"
-
-    grid = coo_matrix((weights, xyi), shape=(n_x, n_y)).toarray()
-    grid = convolve2d(grid, kernel, mode="same", boundary=boundary)
-
-    norm_factor = np.linalg.det(2 * np.pi * cov * scotts_factor ** 2)
-    norm_factor = len_x * d_x * d_y * norm_factor ** 0.5
+    # bilinear binning, each sample is split between its 4 closest grid points
+    if _kernels.use_kernels():
+        grid = _kernels.bilinear_binning(x_pos, y_pos, n_x, n_y)
+    else:
+        x_lower = np.clip(np.floor(x_pos).astype(np.intp), 0, n_x - 2)
+        y_lower = np.clip(np.floor(y_pos).astype(np.intp), 0, n_y - 2)
+        x_weight = x_pos - x_lower
+        y_weight = y_pos - y_lower
+        grid = np.zeros(n_x * n_y)
+        for x_shift, x_weights in ((0, 1 - x_weight), (1, x_weight)):
+            for y_shift, y_weights in ((0, 1 - y_weight), (1, y_weight)):
+                grid += np.bincount(
+                    (x_lower + x_shift) * n_y + y_lower + y_shift,
+                    x_weights * y_weights,
+                    minlength=n_x * n_y,
+                )
+        grid = grid.reshape(n_x, n_y)
 
-    grid /= norm_factor
+    scotts_factor = len_x ** (-1 / 6)
+    cov = np.cov(x_pos, y_pos) * scotts_factor ** 2
+    inv_cov = np.linalg.inv(cov)
+
+    # kernel with the same (x, y) axes as the grid, and support capped to the grid size
+    half_x, half_y = [
+        int(min(np.ceil(_KERNEL_SUPPORT * std), size - 1))
+        for std, size in zip(np.diag(cov) ** 0.5, gridsize)
+    ]
+    x_x, y_y = np.meshgrid(
+        np.arange(-half_x, half_x + 1), np.arange(-half_y, half_y + 1), indexing="ij"
+    )
+    offsets = np.stack((x_x, y_y), axis=-1)
+    kernel = np.exp(-0.5 * np.einsum("...i,ij,...j", offsets, inv_cov, offsets))
+
+    grid = np.pad(
+        grid, ((half_x, half_x), (half_y, half_y)), mode="wrap" if circular else "reflect"
+    )
+    grid = convolve(grid, kernel, mode="valid", method="auto")
+    grid = np.maximum(grid, 0)
+
+    grid /= len_x * d_x * d_y * kernel.sum()
 
     return grid, xmin, xmax, ymin, ymax
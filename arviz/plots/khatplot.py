@@ -2,11 +2,21 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from .plot_data import PlotData, renderer
 from .plot_utils import _scale_fig_size
+from ..profiling import traced
 
 
+@traced()
 def plot_khat(
-    khats, figsize=None, textsize=None, markersize=None, ax=None, hlines_kwargs=None, **kwargs
+    khats,
+    figsize=None,
+    textsize=None,
+    markersize=None,
+    ax=None,
+    hlines_kwargs=None,
+    compute_only=False,
+    **kwargs
 ):
     """
     Plot Pareto tail indices.
@@ -27,13 +37,16 @@ def plot_khat(
       Matplotlib axes
     hlines_kwargs: dictionary
       Additional keywords passed to ax.hlines
+    compute_only : bool, optional
+      If True, return the data of the plot as a :class:`PlotData` without drawing it.
+      Defaults to False.
     kwargs :
       Additional keywords passed to ax.scatter
 
     Returns
     -------
     ax : axes
-      Matplotlib axes.
+      Matplotlib axes, or PlotData if `compute_only` is True.
 
     Examples
     --------
@@ -48,6 +61,33 @@ def plot_khat(
         >>> az.plot_khat(pareto_k)
 
     """
+    plot_data = PlotData(
+        "plot_khat",
+        dict(
+            khats=np.asarray(khats),
+            figsize=figsize,
+            textsize=textsize,
+            markersize=markersize,
+            hlines_kwargs=hlines_kwargs,
+            scatter_kwargs=kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_khat")
+def _draw_khat(
+    ax=None,
+    khats=None,
+    figsize=None,
+    textsize=None,
+    markersize=None,
+    hlines_kwargs=None,
+    scatter_kwargs=None,
+):
+    """Draw the Pareto tail indices given to `plot_khat`."""
     if hlines_kwargs is None:
         hlines_kwargs = {}
 
@@ -74,7 +114,7 @@ def plot_khat(
     rgba_c = np.zeros((len(khats), 4))
     rgba_c[:, 2] = 0.8
     rgba_c[:, 3] = alphas
-    ax.scatter(np.arange(len(khats)), khats, c=rgba_c, marker="+", s=markersize, **kwargs)
+    ax.scatter(np.arange(len(khats)), khats, c=rgba_c, marker="+", s=markersize, **scatter_kwargs)
     ax.set_xlabel("Data point", fontsize=ax_labelsize)
     ax.set_ylabel(r"Shape parameter κ", fontsize=ax_labelsize)
     ax.tick_params(labelsize=xt_labelsize)
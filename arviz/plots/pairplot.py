@@ -6,11 +6,23 @@ from matplotlib.ticker import NullFormatter
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 from ..data import convert_to_dataset, convert_to_inference_data
-from .kdeplot import plot_kde
-from .plot_utils import _scale_fig_size, xarray_to_ndarray, get_coords
-from ..utils import _var_names
-
-
+from .kdeplot import plot_kde, _draw_kde
+from .plot_data import PlotData, renderer
+from .plot_utils import (
+    _scale_fig_size,
+    xarray_to_ndarray,
+    get_coords,
+    histogram_2d,
+    histogram_hex,
+    plot_histogram_2d,
+    plot_histogram_hex,
+    HEXBIN_BINNING_KWARGS,
+)
+from ..utils import _var_names, _parallel_map
+from ..profiling import traced
+
+
+@traced()
 def plot_pair(
     data,
     var_names=None,
@@ -26,6 +38,8 @@ def plot_pair(
     ax=None,
     divergences_kwargs=None,
     plot_kwargs=None,
+    aggregate=False,
+    compute_only=False,
 ):
     """
     Plot a scatter or hexbin matrix of the sampled parameters.
@@ -65,10 +79,25 @@ def plot_pair(
     divergences_kwargs : dicts, optional
         Additional keywords passed to ax.scatter for divergences
     plot_kwargs : dicts, optional
-        Additional keywords passed to ax.plot, az.plot_kde or ax.hexbin
+        Additional keywords passed to ax.plot, az.plot_kde, ax.hexbin or, if `aggregate` is
+        True, ax.imshow
+    aggregate : bool, optional
+        Only works for kind=scatter. If True, draw the number of draws in each pixel of the axes
+        as an image instead of one marker per draw, the divergences are still drawn as points.
+        The time and memory needed to draw the plot do not depend on the number of draws.
+        Defaults to False.
+    compute_only : bool, optional
+        If True, compute the 2D KDEs or histograms or gather the samples and return them as a
+        :class:`PlotData` without drawing them. Defaults to False.
+
+    Notes
+    -----
+    The 2D KDEs and histograms of the panels are computed on ``rcParams["stats.n_jobs"]``
+    threads, the panels are then drawn one after the other.
+
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -121,7 +150,7 @@ def plot_pair(
     if plot_kwargs is None:
         plot_kwargs = {}
 
-    if kind == "scatter":
+    if kind == "scatter" and not aggregate:
         plot_kwargs.setdefault("marker", ".")
         plot_kwargs.setdefault("lw", 0)
 
@@ -171,98 +200,170 @@ def plot_pair(
         (figsize, ax_labelsize, _, xt_labelsize, _, _) = _scale_fig_size(
             figsize, textsize, numvars - 1, numvars - 1
         )
+    else:
+        (figsize, ax_labelsize, _, xt_labelsize, _, _) = _scale_fig_size(
+            figsize, textsize, numvars - 2, numvars - 2
+        )
+
+    aggregate = aggregate and kind == "scatter"
+    # hexbins binned differently than histogram_hex are drawn from the samples
+    hexbin_samples = kind == "hexbin" and not HEXBIN_BINNING_KWARGS.isdisjoint(plot_kwargs)
+    panels = None
+    if (kind != "scatter" or aggregate) and not hexbin_samples:
+        bins = gridsize
+        if aggregate:
+            # one cell per pixel of each panel
+            dpi = plt.rcParams["figure.dpi"]
+            bins = tuple(int(size * dpi / (numvars - 1)) for size in figsize)
+        kde_kwargs = dict(contour=contour, fill_last=fill_last, **plot_kwargs)
+        panels = _parallel_map(
+            _compute_pair_panel,
+            (
+                (kind, i, j, _posterior[i], _posterior[j + 1], bins, kde_kwargs)
+                for i in range(0, numvars - 1)
+                for j in range(i, numvars - 1)
+            ),
+        )
+
+    plot_data = PlotData(
+        "plot_pair",
+        dict(
+            kind=kind,
+            var_names=[str(var_name) for var_name in flat_var_names],
+            posterior=None if panels is not None else _posterior,
+            panels=panels,
+            divergent=_posterior[:, diverging_mask] if divergences else None,
+            gridsize=gridsize,
+            colorbar=colorbar,
+            figsize=figsize,
+            ax_labelsize=ax_labelsize,
+            xt_labelsize=xt_labelsize,
+            divergences_kwargs=divergences_kwargs,
+            plot_kwargs=plot_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
 
+@renderer("plot_pair")
+def _draw_pair(
+    ax=None,
+    kind="scatter",
+    var_names=(),
+    posterior=None,
+    panels=None,
+    divergent=None,
+    gridsize=None,
+    colorbar=False,
+    figsize=None,
+    ax_labelsize=None,
+    xt_labelsize=None,
+    divergences_kwargs=None,
+    plot_kwargs=None,
+):
+    """Draw the pair plot computed by `plot_pair`, see `plot_pair` for the arguments."""
+    divergences_kwargs = {} if divergences_kwargs is None else divergences_kwargs
+    plot_kwargs = {} if plot_kwargs is None else plot_kwargs
+    numvars = len(var_names)
+    if panels is not None:
+        panels = {(panel["i"], panel["j"]): panel for panel in panels}
+
+    if numvars == 2:
         if ax is None:
-            fig, ax = plt.subplots(figsize=figsize, constrained_layout=True)
-
-        if kind == "scatter":
-            ax.plot(_posterior[0], _posterior[1], **plot_kwargs)
-        elif kind == "kde":
-            plot_kde(
-                _posterior[0],
-                _posterior[1],
-                contour=contour,
-                fill_last=fill_last,
-                ax=ax,
-                **plot_kwargs
-            )
-        else:
-            hexbin = ax.hexbin(
-                _posterior[0], _posterior[1], mincnt=1, gridsize=gridsize, **plot_kwargs
-            )
-            ax.grid(False)
+            _, ax = plt.subplots(figsize=figsize, constrained_layout=True)
+
+        hexbin = _draw_pair_panel(ax, kind, posterior, panels, 0, 0, gridsize, plot_kwargs)
 
         if kind == "hexbin" and colorbar:
             cbar = ax.figure.colorbar(hexbin, ticks=[hexbin.norm.vmin, hexbin.norm.vmax], ax=ax)
             cbar.ax.set_yticklabels(["low", "high"], fontsize=ax_labelsize)
 
-        if divergences:
-            ax.plot(
-                _posterior[0][diverging_mask], _posterior[1][diverging_mask], **divergences_kwargs
-            )
+        if divergent is not None:
+            ax.plot(divergent[0], divergent[1], **divergences_kwargs)
 
-        ax.set_xlabel("{}".format(flat_var_names[0]), fontsize=ax_labelsize, wrap=True)
-        ax.set_ylabel("{}".format(flat_var_names[1]), fontsize=ax_labelsize, wrap=True)
+        ax.set_xlabel("{}".format(var_names[0]), fontsize=ax_labelsize, wrap=True)
+        ax.set_ylabel("{}".format(var_names[1]), fontsize=ax_labelsize, wrap=True)
         ax.tick_params(labelsize=xt_labelsize)
 
     else:
-        (figsize, ax_labelsize, _, xt_labelsize, _, _) = _scale_fig_size(
-            figsize, textsize, numvars - 2, numvars - 2
-        )
-
         if ax is None:
-            fig, ax = plt.subplots(
-                numvars - 1, numvars - 1, figsize=figsize, constrained_layout=True
-            )
+            _, ax = plt.subplots(numvars - 1, numvars - 1, figsize=figsize, constrained_layout=True)
         hexbin_values = []
         for i in range(0, numvars - 1):
-            var1 = _posterior[i]
-
             for j in range(0, numvars - 1):
                 if j < i:
                     ax[j, i].axis("off")
                     continue
 
-                var2 = _posterior[j + 1]
-
-                if kind == "scatter":
-                    ax[j, i].plot(var1, var2, **plot_kwargs)
-
-                elif kind == "kde":
-                    plot_kde(
-                        var1, var2, contour=contour, fill_last=fill_last, ax=ax[j, i], **plot_kwargs
-                    )
-
-                else:
-                    ax[j, i].grid(False)
-                    hexbin = ax[j, i].hexbin(var1, var2, mincnt=1, gridsize=gridsize, **plot_kwargs)
+                hexbin = _draw_pair_panel(
+                    ax[j, i], kind, posterior, panels, i, j, gridsize, plot_kwargs
+                )
                 if kind == "hexbin" and colorbar:
                     hexbin_values.append(hexbin.norm.vmin)
                     hexbin_values.append(hexbin.norm.vmax)
                     if j == i == 0 and colorbar:
                         divider = make_axes_locatable(ax[0, 1])
                         cax = divider.append_axes("left", size="7%")
-                        cbar = fig.colorbar(
+                        cbar = ax[0, 1].figure.colorbar(
                             hexbin, ticks=[hexbin.norm.vmin, hexbin.norm.vmax], cax=cax
                         )
                         cbar.ax.set_yticklabels(["low", "high"], fontsize=ax_labelsize)
 
-                if divergences:
-                    ax[j, i].plot(var1[diverging_mask], var2[diverging_mask], **divergences_kwargs)
+                if divergent is not None:
+                    ax[j, i].plot(divergent[i], divergent[j + 1], **divergences_kwargs)
 
                 if j + 1 != numvars - 1:
                     ax[j, i].axes.get_xaxis().set_major_formatter(NullFormatter())
                 else:
-                    ax[j, i].set_xlabel(
-                        "{}".format(flat_var_names[i]), fontsize=ax_labelsize, wrap=True
-                    )
+                    ax[j, i].set_xlabel("{}".format(var_names[i]), fontsize=ax_labelsize, wrap=True)
                 if i != 0:
                     ax[j, i].axes.get_yaxis().set_major_formatter(NullFormatter())
                 else:
                     ax[j, i].set_ylabel(
-                        "{}".format(flat_var_names[j + 1]), fontsize=ax_labelsize, wrap=True
+                        "{}".format(var_names[j + 1]), fontsize=ax_labelsize, wrap=True
                     )
 
                 ax[j, i].tick_params(labelsize=xt_labelsize)
 
     return ax
+
+
+def _compute_pair_panel(kind, i, j, x, y, bins, kde_kwargs):
+    """Compute the 2D KDE or histogram of variable i against variable j + 1.
+
+    `bins` is the gridsize of the hexbin or the shape of the histogram of the aggregated
+    scatter plot.
+    """
+    if kind == "kde":
+        return {"i": i, "j": j, "kde": plot_kde(x, y, compute_only=True, **kde_kwargs).data}
+    if kind == "hexbin":
+        centers, counts, extent = histogram_hex(x, y, bins)
+        return {"i": i, "j": j, "centers": centers, "counts": counts, "extent": extent}
+    counts, extent = histogram_2d(x, y, bins)
+    return {"i": i, "j": j, "counts": counts, "extent": extent}
+
+
+def _draw_pair_panel(ax, kind, posterior, panels, i, j, gridsize, plot_kwargs):
+    """Draw the samples of variable i against variable j + 1, return the hexbin if any."""
+    hexbin = None
+    if kind == "kde":
+        _draw_kde(ax=ax, **panels[(i, j)]["kde"])
+    elif kind == "hexbin":
+        ax.grid(False)
+        if panels is None:
+            hexbin_kwargs = dict(plot_kwargs)
+            hexbin_kwargs.setdefault("mincnt", 1)
+            hexbin = ax.hexbin(posterior[i], posterior[j + 1], gridsize=gridsize, **hexbin_kwargs)
+        else:
+            panel = panels[(i, j)]
+            hexbin = plot_histogram_hex(
+                ax, panel["centers"], panel["counts"], panel["extent"], gridsize, **plot_kwargs
+            )
+    elif panels is not None:
+        panel = panels[(i, j)]
+        plot_histogram_2d(ax, panel["counts"], panel["extent"], **plot_kwargs)
+    else:
+        ax.plot(posterior[i], posterior[j + 1], **plot_kwargs)
+    return hexbin
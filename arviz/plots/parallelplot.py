@@ -4,10 +4,13 @@ import numpy as np
 
 from scipy.stats.mstats import rankdata
 from ..data import convert_to_dataset
-from .plot_utils import _scale_fig_size, xarray_to_ndarray, get_coords
+from .plot_data import PlotData, renderer
+from .plot_utils import _scale_fig_size, xarray_to_ndarray, get_coords, plot_lines
 from ..utils import _var_names
+from ..profiling import traced
 
 
+@traced()
 def plot_parallel(
     data,
     var_names=None,
@@ -20,6 +23,8 @@ def plot_parallel(
     shadend=0.025,
     ax=None,
     norm_method=None,
+    max_lines=None,
+    compute_only=False,
 ):
     """
     Plot parallel coordinates plot showing posterior points with and without divergences.
@@ -55,10 +60,16 @@ def plot_parallel(
     norm_method : str
         Method for normalizing the data. Methods include normal, minmax and rank.
         Defaults to none.
+    max_lines : int, optional
+        Maximum number of non-divergent draws to draw, evenly spaced over the draws. The
+        divergent draws are always drawn. Defaults to drawing all the draws.
+    compute_only : bool, optional
+        If True, return the data of the plot as a :class:`PlotData` without drawing it.
+        Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -112,15 +123,56 @@ def plot_parallel(
         else:
             raise ValueError("{} is not supported. Use normal, minmax or rank.".format(norm_method))
 
+    if max_lines is not None and np.sum(~diverging_mask) > max_lines:
+        non_divergent = np.flatnonzero(~diverging_mask)
+        keep = diverging_mask.copy()
+        keep[non_divergent[np.linspace(0, len(non_divergent) - 1, max_lines).astype(int)]] = True
+        _posterior = _posterior[:, keep]
+        diverging_mask = diverging_mask[keep]
+
+    plot_data = PlotData(
+        "plot_parallel",
+        dict(
+            var_names=[str(var_name) for var_name in var_names],
+            posterior=_posterior,
+            diverging_mask=diverging_mask,
+            figsize=figsize,
+            textsize=textsize,
+            legend=legend,
+            colornd=colornd,
+            colord=colord,
+            shadend=shadend,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_parallel")
+def _draw_parallel(
+    ax=None,
+    var_names=(),
+    posterior=None,
+    diverging_mask=None,
+    figsize=None,
+    textsize=None,
+    legend=True,
+    colornd="k",
+    colord="C1",
+    shadend=0.025,
+):
+    """Draw the parallel coordinates computed by `plot_parallel`."""
     figsize, _, _, xt_labelsize, _, _ = _scale_fig_size(figsize, textsize, 1, 1)
 
     if ax is None:
         _, ax = plt.subplots(figsize=figsize, constrained_layout=True)
 
-    ax.plot(_posterior[:, ~diverging_mask], color=colornd, alpha=shadend)
+    x_values = np.arange(len(var_names))
+    plot_lines(ax, _vertices(x_values, posterior[:, ~diverging_mask]), color=colornd, alpha=shadend)
 
     if np.any(diverging_mask):
-        ax.plot(_posterior[:, diverging_mask], color=colord, lw=1)
+        plot_lines(ax, _vertices(x_values, posterior[:, diverging_mask]), color=colord, lw=1)
 
     ax.tick_params(labelsize=textsize)
     ax.set_xticks(range(len(var_names)))
@@ -133,3 +185,8 @@ def plot_parallel(
         ax.legend(fontsize=xt_labelsize)
 
     return ax
+
+
+def _vertices(x_values, y_values):
+    """Get the vertices of the lines of each column of y_values, shape (n_lines, n_points, 2)."""
+    return np.stack(np.broadcast_arrays(x_values[None, :], y_values.T), axis=-1)
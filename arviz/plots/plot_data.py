@@ -0,0 +1,136 @@
+"""Plot data computed separately from drawing.
+
+Every ``plot_*`` function accepts ``compute_only=True`` to compute the arrays and labels of
+the plot (KDEs, hpd intervals, ranks, autocorrelations, diagnostics...) without drawing
+anything. The result is a :class:`PlotData`, which can be pickled or converted to JSON, sent
+to another process and drawn there with :meth:`PlotData.render`.
+
+Each plot module registers the function that draws its data with :func:`renderer`. The
+drawing functions take the axes to draw on as `ax` and the values stored in the plot data as
+keyword arguments.
+"""
+import json
+
+import numpy as np
+
+from ..profiling import span as _span
+
+__all__ = ["PlotData"]
+
+_RENDERERS = {}
+
+
+def renderer(plot):
+    """Register the function that draws the data computed by the `plot` function."""
+
+    def decorator(func):
+        _RENDERERS[plot] = func
+        return func
+
+    return decorator
+
+
+def _encode(value):
+    """Convert numpy arrays and tuples in a nested structure to JSON compatible objects."""
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value):
+    """Undo `_encode`."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if "__ndarray__" in value:
+            return np.array(value["__ndarray__"], dtype=value["dtype"])
+        if "__tuple__" in value:
+            return tuple(_decode(item) for item in value["__tuple__"])
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+class PlotData:
+    """Arrays, labels and options needed to draw a plot.
+
+    It is returned by the ``plot_*`` functions called with ``compute_only=True``.
+
+    Parameters
+    ----------
+    plot : str
+        Name of the plot function that computed the data, for example ``"plot_posterior"``.
+    data : dict
+        Keyword arguments of the function that draws the plot. The values are numpy arrays,
+        numbers, strings, None or lists, tuples and dicts of them.
+
+    Examples
+    --------
+    Compute a posterior plot, serialize it to JSON and draw it:
+
+    .. plot::
+        :context: close-figs
+
+        >>> import arviz as az
+        >>> data = az.load_arviz_data('centered_eight')
+        >>> plot_data = az.plot_posterior(data, var_names=["mu", "tau"], compute_only=True)
+        >>> json_string = plot_data.to_json()
+        >>> az.PlotData.from_json(json_string).render()
+    """
+
+    def __init__(self, plot, data):
+        self.plot = plot
+        self.data = data
+
+    def __getitem__(self, key):
+        """Return a value of the plot data."""
+        return self.data[key]
+
+    def __repr__(self):
+        """Show the plot and the names of its values."""
+        return "PlotData({!r}, keys: {})".format(self.plot, ", ".join(self.data))
+
+    def render(self, ax=None):
+        """Draw the plot.
+
+        Parameters
+        ----------
+        ax : axes, optional
+            Matplotlib axes or array of axes to draw on, like the `ax` argument of the plot
+            function. New axes are created if None.
+
+        Returns
+        -------
+        Same as the plot function that computed the data, usually the matplotlib axes.
+        """
+        try:
+            draw = _RENDERERS[self.plot]
+        except KeyError:
+            raise ValueError("There is no renderer for {}".format(self.plot))
+        with _span("{}.render".format(self.plot)):
+            return draw(ax=ax, **self.data)
+
+    def to_dict(self):
+        """Convert to a dictionary of JSON compatible objects."""
+        return {"plot": self.plot, "data": _encode(self.data)}
+
+    @classmethod
+    def from_dict(cls, plot_dict):
+        """Create a PlotData from the output of `to_dict`."""
+        return cls(plot_dict["plot"], _decode(plot_dict["data"]))
+
+    def to_json(self):
+        """Serialize to a JSON string."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_string):
+        """Create a PlotData from the output of `to_json`."""
+        return cls.from_dict(json.loads(json_string))
@@ -4,6 +4,8 @@ from itertools import product
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
+from matplotlib.cbook import pts_to_prestep
+from matplotlib.collections import LineCollection
 import xarray as xr
 
 
@@ -126,6 +128,302 @@ def get_bins(values):
     return np.arange(x_min, x_max + width + 1, width)
 
 
+def downsample_indices(values, n_buckets, method="minmax", keep=None):
+    """
+    Select the points of a long series that preserve its shape when drawn as a line.
+
+    Parameters
+    ----------
+    values : 1D numpy array
+        Values of the series.
+    n_buckets : int
+        Number of buckets the series is divided in, usually the width in pixels of the line.
+    method : {"minmax", "lttb"}
+        "minmax" keeps the minimum and the maximum of each bucket, so every peak is drawn.
+        "lttb" (largest triangle three buckets) keeps one point per bucket, the one making the
+        largest triangle with the points selected in the previous and next buckets.
+    keep : array of int, optional
+        Indices that are always selected, for example the divergent draws.
+
+    Returns
+    -------
+    array of int
+        Sorted indices of the selected points. The first and last points are always selected.
+    """
+    values = np.asarray(values)
+    n_values = len(values)
+    if n_values <= 2 * n_buckets:
+        return np.arange(n_values)
+
+    if method == "minmax":
+        bucket_size = -(-n_values // n_buckets)
+        n_buckets = -(-n_values // bucket_size)
+        # pad the last bucket with the last value, the padding indices are clipped below
+        padded = np.full(n_buckets * bucket_size, values[-1], dtype=values.dtype)
+        padded[:n_values] = values
+        padded = padded.reshape(n_buckets, bucket_size)
+        offsets = np.arange(n_buckets) * bucket_size
+        selected = [offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)]
+    elif method == "lttb":
+        selected = [_lttb(values, n_buckets)]
+    else:
+        raise ValueError("method must be 'minmax' or 'lttb', got {!r}".format(method))
+
+    selected.append([0, n_values - 1])
+    if keep is not None:
+        selected.append(keep)
+    return np.unique(np.clip(np.concatenate(selected), 0, n_values - 1)).astype(int)
+
+
+def _lttb(values, n_buckets):
+    """Select one point per bucket with the largest triangle three buckets algorithm."""
+    n_values = len(values)
+    # the first and last points are buckets of their own
+    edges = np.linspace(1, n_values - 1, n_buckets + 1).astype(int)
+    selected = np.empty(n_buckets, dtype=int)
+    prev_x, prev_y = 0, values[0]
+    for i in range(n_buckets):
+        start, stop = edges[i], edges[i + 1]
+        if i + 1 < n_buckets:
+            next_x = 0.5 * (edges[i + 1] + edges[i + 2] - 1)
+            next_y = values[edges[i + 1] : edges[i + 2]].mean()
+        else:
+            next_x, next_y = n_values - 1, values[-1]
+        bucket_x, bucket_y = np.arange(start, stop), values[start:stop]
+        areas = np.abs(
+            (prev_x - next_x) * (bucket_y - prev_y) - (prev_x - bucket_x) * (next_y - prev_y)
+        )
+        idx = start + np.argmax(areas)
+        selected[i] = idx
+        prev_x, prev_y = idx, values[idx]
+    return selected
+
+
+def plot_lines(ax, lines, drawstyle=None, **kwargs):
+    """
+    Draw many lines with the same style as a single LineCollection.
+
+    Drawing each line with `ax.plot` creates one artist per line, whose overhead dominates the
+    rendering time of plots with thousands of lines.
+
+    Parameters
+    ----------
+    ax : axes
+        Matplotlib axes.
+    lines : array of shape (n_lines, n_points, 2) or list of arrays of shape (n_points, 2)
+        x and y coordinates of the vertices of each line.
+    drawstyle : {None, "default", "steps-pre"}
+        Draw the lines as steps, like the `drawstyle` argument of `ax.plot`.
+    **kwargs
+        Passed to `LineCollection`, for example color, alpha or linewidth.
+
+    Returns
+    -------
+    LineCollection
+    """
+    if drawstyle == "steps-pre":
+        lines = [pts_to_prestep(line[:, 0], line[:, 1]).T for line in lines]
+    elif drawstyle not in (None, "default"):
+        raise ValueError("drawstyle {!r} is not supported".format(drawstyle))
+    kwargs.setdefault("zorder", 2)
+    collection = LineCollection(lines, **kwargs)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
+
+
+def histogram_2d(x, y, shape):
+    """
+    Count the points in each cell of a regular grid spanning their range.
+
+    The cell of each point is computed directly from its coordinates, which is faster than
+    `np.histogram2d` for large arrays. Points with non finite coordinates are ignored.
+
+    Parameters
+    ----------
+    x, y : 1D numpy arrays
+        Coordinates of the points.
+    shape : (int, int)
+        Number of cells in the x and y directions, usually the size in pixels of the axes.
+
+    Returns
+    -------
+    counts : array of int, shape (shape[1], shape[0])
+        Number of points in each cell, the rows correspond to y.
+    extent : tuple
+        (xmin, xmax, ymin, ymax) limits of the grid, as expected by `ax.imshow`.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    extent, cells = [], []
+    for values, n_cells in zip((x, y), shape):
+        v_min, v_max = (values.min(), values.max()) if values.size else (0.0, 1.0)
+        if v_min == v_max:
+            v_min, v_max = v_min - 0.5, v_max + 0.5
+        cell = ((values - v_min) * (n_cells / (v_max - v_min))).astype(np.intp)
+        # the maximum is in the last cell
+        np.minimum(cell, n_cells - 1, out=cell)
+        extent.extend((v_min, v_max))
+        cells.append(cell)
+    n_x, n_y = shape
+    counts = np.bincount(cells[1] * n_x + cells[0], minlength=n_x * n_y).reshape(n_y, n_x)
+    return counts, tuple(extent)
+
+
+def plot_histogram_2d(ax, counts, extent, **kwargs):
+    """
+    Draw the output of `histogram_2d` as an image, the empty cells are transparent.
+
+    Parameters
+    ----------
+    ax : axes
+        Matplotlib axes.
+    counts : 2D array
+        Number of points in each cell, the rows correspond to y.
+    extent : tuple
+        (xmin, xmax, ymin, ymax) limits of the grid.
+    **kwargs
+        Passed to `ax.imshow`, for example cmap or alpha.
+
+    Returns
+    -------
+    AxesImage
+    """
+    kwargs.setdefault("origin", "lower")
+    kwargs.setdefault("aspect", "auto")
+    kwargs.setdefault("interpolation", "nearest")
+    return ax.imshow(np.ma.masked_equal(counts, 0), extent=extent, **kwargs)
+
+
+# arguments of ax.hexbin that change the binning, they need the points and not their counts
+HEXBIN_BINNING_KWARGS = {
+    "C",
+    "reduce_C_function",
+    "mincnt",
+    "extent",
+    "xscale",
+    "yscale",
+    "marginals",
+}
+
+
+def histogram_hex(x, y, gridsize):
+    """
+    Count the points in each hexagon of the grid used by `ax.hexbin`.
+
+    The hexagons are the same as the ones of ``ax.hexbin(x, y, gridsize=gridsize)``, so that
+    the binning can be computed apart from the drawing, see `plot_histogram_hex`. Points with
+    non finite coordinates are ignored.
+
+    Parameters
+    ----------
+    x, y : 1D numpy arrays
+        Coordinates of the points.
+    gridsize : int or (int, int)
+        Number of hexagons in the x direction, or in the x and y directions.
+
+    Returns
+    -------
+    centers : array, shape (n_hexagons, 2)
+        Centers of the hexagons containing at least one point.
+    counts : array of int, shape (n_hexagons,)
+        Number of points in each of these hexagons.
+    extent : tuple
+        (xmin, xmax, ymin, ymax) limits of the grid.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if np.iterable(gridsize):
+        n_x, n_y = gridsize
+    else:
+        n_x = gridsize
+        n_y = int(n_x / np.sqrt(3))
+    extent, padded = [], []
+    for values in (x, y):
+        v_min, v_max = (values.min(), values.max()) if values.size else (0.0, 1.0)
+        v_min, v_max = mpl.transforms.nonsingular(v_min, v_max, expander=0.1)
+        extent.extend((v_min, v_max))
+        # same padding as ax.hexbin, which avoids roundoff errors at the limits
+        padding = 1e-9 * (v_max - v_min)
+        padded.append((v_min - padding, v_max + padding))
+    x_min, x_max = padded[0]
+    y_min, y_max = padded[1]
+    step_x = (x_max - x_min) / n_x
+    step_y = (y_max - y_min) / n_y
+    x_pos = (x - x_min) / step_x
+    y_pos = (y - y_min) / step_y
+
+    # the hexagons are centered on two interleaved rectangular lattices, every point belongs
+    # to the closest center of either lattice
+    x_1, y_1 = np.round(x_pos).astype(np.intp), np.round(y_pos).astype(np.intp)
+    x_2, y_2 = np.floor(x_pos).astype(np.intp), np.floor(y_pos).astype(np.intp)
+    first = (x_pos - x_1) ** 2 + 3 * (y_pos - y_1) ** 2 < (
+        (x_pos - x_2 - 0.5) ** 2 + 3 * (y_pos - y_2 - 0.5) ** 2
+    )
+    centers, counts = [], []
+    for in_lattice, x_idx, y_idx, shift, size_x, size_y in (
+        (first, x_1, y_1, 0, n_x + 1, n_y + 1),
+        (~first, x_2, y_2, 0.5, n_x, n_y),
+    ):
+        lattice_counts = np.bincount(
+            x_idx[in_lattice] * size_y + y_idx[in_lattice], minlength=size_x * size_y
+        )
+        (cells,) = np.nonzero(lattice_counts)
+        centers.append(
+            np.column_stack(
+                (
+                    x_min + (cells // size_y + shift) * step_x,
+                    y_min + (cells % size_y + shift) * step_y,
+                )
+            )
+        )
+        counts.append(lattice_counts[cells])
+    return np.concatenate(centers), np.concatenate(counts), tuple(extent)
+
+
+def plot_histogram_hex(ax, centers, counts, extent, gridsize, **kwargs):
+    """
+    Draw the output of `histogram_hex` as `ax.hexbin` would draw the points.
+
+    Parameters
+    ----------
+    ax : axes
+        Matplotlib axes.
+    centers : array, shape (n_hexagons, 2)
+        Centers of the non empty hexagons.
+    counts : 1D array
+        Number of points in each hexagon.
+    extent : tuple
+        (xmin, xmax, ymin, ymax) limits of the grid.
+    gridsize : int or (int, int)
+        Number of hexagons in the x direction, or in the x and y directions.
+    **kwargs
+        Passed to `ax.hexbin`, for example cmap or bins. The arguments changing the binning
+        of the points, listed in ``HEXBIN_BINNING_KWARGS``, are not supported.
+
+    Returns
+    -------
+    PolyCollection
+    """
+    binning_kwargs = sorted(HEXBIN_BINNING_KWARGS.intersection(kwargs))
+    if binning_kwargs:
+        raise ValueError(
+            "{} can not be used with precomputed hexagon counts".format(", ".join(binning_kwargs))
+        )
+    # each center falls in its own hexagon, whose value is the sum of the counts given as C
+    return ax.hexbin(
+        centers[:, 0],
+        centers[:, 1],
+        C=counts,
+        reduce_C_function=sum,
+        gridsize=gridsize,
+        extent=extent,
+        **kwargs
+    )
+
+
 def default_grid(n_items, max_cols=4, min_cols=3):  # noqa: D202
     """Make a grid for subplots.
 
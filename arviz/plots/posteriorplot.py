@@ -4,8 +4,9 @@ import numpy as np
 from scipy.stats import mode
 
 from ..data import convert_to_dataset
-from ..stats import hpd
-from .kdeplot import plot_kde, _fast_kde
+from ..stats import posterior_intervals
+from .kdeplot import _kde_data, _draw_kde, _fast_kde
+from .plot_data import PlotData, renderer
 from .plot_utils import (
     xarray_var_iter,
     _scale_fig_size,
@@ -15,8 +16,10 @@ from .plot_utils import (
     get_coords,
 )
 from ..utils import _var_names
+from ..profiling import traced
 
 
+@traced()
 def plot_posterior(
     data,
     var_names=None,
@@ -32,6 +35,7 @@ def plot_posterior(
     bw=4.5,
     bins=None,
     ax=None,
+    compute_only=False,
     **kwargs
 ):
     """Plot Posterior densities in the style of John K. Kruschke's book.
@@ -75,12 +79,15 @@ def plot_posterior(
         `range(xmin, xmax + 1)` for discrete variables.
     ax : axes
         Matplotlib axes. Defaults to None.
+    compute_only : bool, optional
+        If True, compute the densities, intervals and point estimates and return them as a
+        :class:`PlotData` without drawing them. Defaults to False.
     **kwargs
         Passed as-is to plt.hist() or plt.plot() function depending on the value of `kind`.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -150,13 +157,68 @@ def plot_posterior(
     if coords is None:
         coords = {}
 
-    plotters = list(xarray_var_iter(get_coords(data, coords), var_names=var_names, combined=True))
-    length_plotters = len(plotters)
+    data = get_coords(data, coords)
+    plotters = list(xarray_var_iter(data, var_names=var_names, combined=True))
+    # hpd bounds (and median) of all the variables, sorting the samples only once
+    intervals = posterior_intervals(
+        data,
+        var_names=var_names,
+        credible_interval=credible_interval,
+        quantiles=[0.5] if point_estimate == "median" else None,
+    )
+    panels = [
+        _posterior_data(
+            np.ravel(x),
+            var_name,
+            selection,
+            intervals[var_name].sel(selection).values,
+            bw=bw,
+            bins=bins,
+            kind=kind,
+            point_estimate=point_estimate,
+            round_to=round_to,
+            ref_val=ref_val,
+            rope=rope,
+        )
+        for var_name, selection, x in plotters
+    ]
+
+    plot_data = PlotData(
+        "plot_posterior",
+        dict(
+            panels=panels,
+            figsize=figsize,
+            textsize=textsize,
+            credible_interval=credible_interval,
+            round_to=round_to,
+            point_estimate=point_estimate,
+            hist_kwargs=kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_posterior")
+def _draw_posterior(
+    ax=None,
+    panels=(),
+    figsize=None,
+    textsize=None,
+    credible_interval=0.94,
+    round_to=1,
+    point_estimate="mean",
+    hist_kwargs=None,
+):
+    """Draw the posteriors computed by `plot_posterior`."""
+    length_plotters = len(panels)
     rows, cols = default_grid(length_plotters)
 
     (figsize, ax_labelsize, titlesize, xt_labelsize, _linewidth, _) = _scale_fig_size(
         figsize, textsize, rows, cols
     )
+    kwargs = dict(hist_kwargs or {})
     kwargs.setdefault("linewidth", _linewidth)
 
     if ax is None:
@@ -164,44 +226,115 @@ def plot_posterior(
             length_plotters, rows, cols, figsize=figsize, squeeze=False, constrained_layout=True
         )
 
-    for (var_name, selection, x), ax_ in zip(plotters, np.ravel(ax)):
+    for panel, ax_ in zip(panels, np.ravel(ax)):
         _plot_posterior_op(
-            x.flatten(),
-            var_name,
-            selection,
+            panel,
             ax=ax_,
-            bw=bw,
-            bins=bins,
-            kind=kind,
             point_estimate=point_estimate,
             round_to=round_to,
             credible_interval=credible_interval,
-            ref_val=ref_val,
-            rope=rope,
             ax_labelsize=ax_labelsize,
             xt_labelsize=xt_labelsize,
             **kwargs
         )
 
-        ax_.set_title(make_label(var_name, selection), fontsize=titlesize, wrap=True)
+        ax_.set_title(panel["label"], fontsize=titlesize, wrap=True)
 
     return ax
 
 
-def _plot_posterior_op(
+def _posterior_data(
     values,
     var_name,
     selection,
-    ax,
+    intervals,
     bw,
-    linewidth,
     bins,
     kind,
     point_estimate,
     round_to,
-    credible_interval,
     ref_val,
     rope,
+):
+    """Compute the density, hpd, point estimate, reference value and rope of a posterior."""
+    panel = {"label": make_label(var_name, selection), "hpd": intervals[:2], "mean": values.mean()}
+
+    if kind == "kde" and values.dtype.kind == "f":
+        panel["kde"] = _kde_data(values, bw=bw)
+    else:
+        if bins is None:
+            if values.dtype.kind == "i":
+                xmin = values.min()
+                xmax = values.max()
+                bins = range(xmin, xmax + 2)
+                panel["xlim"] = (xmin - 0.5, xmax + 0.5)
+            else:
+                bins = "auto"
+        panel["counts"], panel["bins"] = np.histogram(values, bins=bins)
+
+    point_value = None
+    if point_estimate:
+        if point_estimate not in ("mode", "mean", "median"):
+            raise ValueError("Point Estimate should be in ('mode','mean','median')")
+        if point_estimate == "mean":
+            point_value = values.mean()
+        elif point_estimate == "mode":
+            if isinstance(values[0], float):
+                density, lower, upper = _fast_kde(values, bw=bw)
+                x = np.linspace(lower, upper, len(density))
+                point_value = x[np.argmax(density)]
+            else:
+                point_value = mode(values.round(round_to))[0][0]
+        elif point_estimate == "median":
+            point_value = intervals[2]
+    panel["point_value"] = point_value
+
+    val = None
+    if ref_val is None:
+        pass
+    elif isinstance(ref_val, dict):
+        for sel in ref_val.get(var_name, []):
+            if all(k in selection and selection[k] == v for k, v in sel.items() if k != "ref_val"):
+                val = sel["ref_val"]
+                break
+    elif isinstance(ref_val, Number):
+        val = ref_val
+    else:
+        raise ValueError(
+            "Argument `ref_val` must be None, a constant, or a "
+            'dictionary like {"var_name": {"ref_val": (lo, hi)}}'
+        )
+    panel["ref_val"] = val
+    if val is not None:
+        panel["ref_probabilities"] = ((values < val).mean(), (values >= val).mean())
+
+    vals = None
+    if rope is None:
+        pass
+    elif isinstance(rope, dict):
+        for sel in rope.get(var_name, []):
+            if all(k in selection and selection[k] == v for k, v in sel.items() if k != "rope"):
+                vals = sel["rope"]
+                break
+    elif len(rope) == 2:
+        vals = rope
+    else:
+        raise ValueError(
+            "Argument `rope` must be None, a dictionary like"
+            '{"var_name": {"rope": (lo, hi)}}, or an'
+            "iterable of length 2"
+        )
+    panel["rope"] = vals
+    return panel
+
+
+def _plot_posterior_op(
+    panel,
+    ax,
+    linewidth,
+    point_estimate,
+    round_to,
+    credible_interval,
     ax_labelsize,
     xt_labelsize,
     **kwargs
@@ -212,27 +345,10 @@ def _plot_posterior_op(
         return "{0:.{1:d}f}%".format(100 * x, round_to)
 
     def display_ref_val():
-        if ref_val is None:
+        val = panel["ref_val"]
+        if val is None:
             return
-        elif isinstance(ref_val, dict):
-            val = None
-            for sel in ref_val.get(var_name, []):
-                if all(
-                    k in selection and selection[k] == v for k, v in sel.items() if k != "ref_val"
-                ):
-                    val = sel["ref_val"]
-                    break
-            if val is None:
-                return
-        elif isinstance(ref_val, Number):
-            val = ref_val
-        else:
-            raise ValueError(
-                "Argument `ref_val` must be None, a constant, or a "
-                'dictionary like {"var_name": {"ref_val": (lo, hi)}}'
-            )
-        less_than_ref_probability = (values < val).mean()
-        greater_than_ref_probability = (values >= val).mean()
+        less_than_ref_probability, greater_than_ref_probability = panel["ref_probabilities"]
         ref_in_posterior = "{} <{:g}< {}".format(
             format_as_percent(less_than_ref_probability, 1),
             val,
@@ -240,7 +356,7 @@ def _plot_posterior_op(
         )
         ax.axvline(val, ymin=0.05, ymax=0.75, color="C1", lw=linewidth, alpha=0.65)
         ax.text(
-            values.mean(),
+            panel["mean"],
             plot_height * 0.6,
             ref_in_posterior,
             size=ax_labelsize,
@@ -250,24 +366,9 @@ def _plot_posterior_op(
         )
 
     def display_rope():
-        if rope is None:
+        vals = panel["rope"]
+        if vals is None:
             return
-        elif isinstance(rope, dict):
-            vals = None
-            for sel in rope.get(var_name, []):
-                if all(k in selection and selection[k] == v for k, v in sel.items() if k != "rope"):
-                    vals = sel["rope"]
-                    break
-            if vals is None:
-                return
-        elif len(rope) == 2:
-            vals = rope
-        else:
-            raise ValueError(
-                "Argument `rope` must be None, a dictionary like"
-                '{"var_name": {"rope": (lo, hi)}}, or an'
-                "iterable of length 2"
-            )
 
         ax.plot(
             vals,
@@ -283,21 +384,9 @@ def _plot_posterior_op(
         ax.text(vals[1], plot_height * 0.2, vals[1], weight="semibold", **text_props)
 
     def display_point_estimate():
-        if not point_estimate:
+        point_value = panel["point_value"]
+        if point_value is None:
             return
-        if point_estimate not in ("mode", "mean", "median"):
-            raise ValueError("Point Estimate should be in ('mode','mean','median')")
-        if point_estimate == "mean":
-            point_value = values.mean()
-        elif point_estimate == "mode":
-            if isinstance(values[0], float):
-                density, lower, upper = _fast_kde(values, bw=bw)
-                x = np.linspace(lower, upper, len(density))
-                point_value = x[np.argmax(density)]
-            else:
-                point_value = mode(values.round(round_to))[0][0]
-        elif point_estimate == "median":
-            point_value = np.median(values)
         point_text = "{}={:.{}f}".format(point_estimate, point_value, round_to)
 
         ax.text(
@@ -309,7 +398,7 @@ def _plot_posterior_op(
         )
 
     def display_hpd():
-        hpd_intervals = hpd(values, credible_interval=credible_interval)
+        hpd_intervals = panel["hpd"]
         ax.plot(
             hpd_intervals,
             (plot_height * 0.02, plot_height * 0.02),
@@ -351,27 +440,22 @@ def _plot_posterior_op(
         )
         ax.spines["bottom"].set_color("0.5")
 
-    if kind == "kde" and values.dtype.kind == "f":
-        plot_kde(
-            values,
-            bw=bw,
+    if "kde" in panel:
+        _draw_kde(
+            ax,
+            panel["kde"],
             fill_kwargs={"alpha": kwargs.pop("fill_alpha", 0)},
             plot_kwargs={"linewidth": linewidth},
-            ax=ax,
             rug=False,
         )
     else:
-        if bins is None:
-            if values.dtype.kind == "i":
-                xmin = values.min()
-                xmax = values.max()
-                bins = range(xmin, xmax + 2)
-                ax.set_xlim(xmin - 0.5, xmax + 0.5)
-            else:
-                bins = "auto"
+        if "xlim" in panel:
+            ax.set_xlim(*panel["xlim"])
+        kwargs.pop("fill_alpha", None)
         kwargs.setdefault("align", "left")
         kwargs.setdefault("color", "C0")
-        ax.hist(values, bins=bins, alpha=0.35, **kwargs)
+        bins = panel["bins"]
+        ax.hist(bins[:-1], bins=bins, weights=panel["counts"], alpha=0.35, **kwargs)
 
     plot_height = ax.get_ylim()[1]
 
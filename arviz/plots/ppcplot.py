@@ -4,19 +4,23 @@ import platform
 import logging
 import numpy as np
 from matplotlib import animation
-from .kdeplot import plot_kde, _fast_kde
+from .kdeplot import _kde_data, _draw_kde, _fast_kde_batch
+from .plot_data import PlotData, renderer
 from .plot_utils import (
     xarray_var_iter,
     _scale_fig_size,
     default_grid,
     make_label,
     _create_axes_grid,
+    plot_lines,
 )
 from ..utils import _var_names
+from ..profiling import traced
 
 _log = logging.getLogger(__name__)
 
 
+@traced()
 def plot_ppc(
     data,
     kind="density",
@@ -35,6 +39,7 @@ def plot_ppc(
     animated=False,
     animation_kwargs=None,
     legend=True,
+    compute_only=False,
 ):
     """
     Plot for posterior predictive checks.
@@ -98,10 +103,13 @@ def plot_ppc(
         Keywords passed to `animation.FuncAnimation`.
     legend : bool
         Add legend to figure. By default True.
+    compute_only : bool, optional
+        If True, compute the densities or cumulative distributions and return them as a
+        :class:`PlotData` without drawing them. Defaults to False.
 
     Returns
     -------
-    axes : matplotlib axes
+    axes : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -246,11 +254,10 @@ def plot_ppc(
         figsize, textsize, rows, cols
     )
 
-    fig, axes = _create_axes_grid(length_plotters, rows, cols, figsize=figsize)
-
-    for i, ax in enumerate(axes):
-        var_name, selection, obs_vals = obs_plotters[i]
-        pp_var_name, _, pp_vals = pp_plotters[i]
+    panels = []
+    for (var_name, selection, obs_vals), (pp_var_name, _, pp_vals) in zip(
+        obs_plotters, pp_plotters
+    ):
         dtype = posterior_predictive[pp_var_name].dtype.kind
 
         # flatten non-specified dimensions
@@ -258,93 +265,162 @@ def plot_ppc(
         pp_vals = pp_vals.reshape(total_pp_samples, -1)
         pp_sampled_vals = pp_vals[pp_sample_ix]
 
+        if var_name != pp_var_name:
+            xlabel = "{} / {}".format(var_name, pp_var_name)
+        else:
+            xlabel = var_name
+        panel = {
+            "var_name": var_name,
+            "pp_var_name": pp_var_name,
+            "xlabel": make_label(xlabel, selection),
+            "dtype": dtype,
+            "pp_sampled": pp_sampled_vals if animated or kind == "scatter" else None,
+            "mean": None,
+        }
+
+        if kind == "density":
+            if dtype == "f":
+                panel["observed"] = {"kde": _kde_data(obs_vals)}
+            else:
+                panel["observed"] = {"hist": _density_hist(obs_vals)}
+            if not animated:
+                # compute all the lines to draw them with one plot call
+                if dtype == "f":
+                    # compute the kdes of all the samples at once
+                    pp_density, lower, upper = _fast_kde_batch(
+                        pp_sampled_vals.reshape(len(pp_sampled_vals), -1)
+                    )
+                    pp_x = np.linspace(lower, upper, pp_density.shape[1], axis=1)
+                    panel["pp_lines"] = np.stack((pp_x, pp_density), axis=-1)
+                else:
+                    panel["pp_lines"] = [
+                        np.column_stack(_density_hist(np.array([vals]).flatten()))
+                        for vals in pp_sampled_vals
+                    ]
+
+        elif kind == "cumulative":
+            panel["observed"] = {"cdf": _empirical_cdf(obs_vals)}
+            if not animated:
+                panel["pp_lines"] = [
+                    np.column_stack(_empirical_cdf(np.array([vals]).flatten()))
+                    for vals in pp_sampled_vals
+                ]
+            if mean:
+                panel["mean"] = {"cdf": _empirical_cdf(pp_vals.flatten())}
+
+        else:
+            panel["observed"] = {"values": obs_vals}
+
+        if mean and kind in ("density", "scatter"):
+            if dtype == "f":
+                panel["mean"] = {"kde": _kde_data(pp_vals.flatten())}
+            else:
+                panel["mean"] = {"hist": _density_hist(pp_vals.flatten())}
+
+        panels.append(panel)
+
+    plot_data = PlotData(
+        "plot_ppc",
+        dict(
+            kind=kind,
+            panels=panels,
+            alpha=alpha,
+            jitter=jitter,
+            legend=legend,
+            animated=animated,
+            animation_kwargs=animation_kwargs,
+            rows=rows,
+            cols=cols,
+            figsize=figsize,
+            ax_labelsize=ax_labelsize,
+            xt_labelsize=xt_labelsize,
+            linewidth=linewidth,
+            markersize=markersize,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render()
+
+
+@renderer("plot_ppc")
+def _draw_ppc(
+    ax=None,
+    kind="density",
+    panels=(),
+    alpha=None,
+    jitter=0.0,
+    legend=True,
+    animated=False,
+    animation_kwargs=None,
+    rows=1,
+    cols=1,
+    figsize=None,
+    ax_labelsize=None,
+    xt_labelsize=None,
+    linewidth=None,
+    markersize=None,
+):
+    """Draw the posterior predictive checks computed by `plot_ppc`.
+
+    The jitter of the scatter plots is drawn from ``np.random`` when rendering.
+    """
+    if ax is None:
+        fig, axes = _create_axes_grid(len(panels), rows, cols, figsize=figsize)
+    else:
+        axes = np.ravel(ax)
+        fig = axes[0].figure
+
+    for i, (ax_, panel) in enumerate(zip(axes, panels)):
+        var_name, pp_var_name, dtype = panel["var_name"], panel["pp_var_name"], panel["dtype"]
+        pp_sampled_vals = panel["pp_sampled"]
+        observed, mean = panel["observed"], panel["mean"]
+        mean_label = "Posterior predictive mean {}".format(pp_var_name)
+
         if kind == "density":
             plot_kwargs = {"color": "C5", "alpha": alpha, "linewidth": 0.5 * linewidth}
             if dtype == "i":
                 plot_kwargs["drawstyle"] = "steps-pre"
-            ax.plot([], color="C5", label="Posterior predictive {}".format(pp_var_name))
+            ax_.plot([], color="C5", label="Posterior predictive {}".format(pp_var_name))
 
-            if dtype == "f":
-                plot_kde(
-                    obs_vals,
+            if "kde" in observed:
+                _draw_kde(
+                    ax_,
+                    observed["kde"],
                     label="Observed {}".format(var_name),
                     plot_kwargs={"color": "k", "linewidth": linewidth, "zorder": 3},
                     fill_kwargs={"alpha": 0},
-                    ax=ax,
                     legend=legend,
                 )
             else:
-                nbins = round(len(obs_vals) ** 0.5)
-                hist, bin_edges = np.histogram(obs_vals, bins=nbins, density=True)
-                hist = np.concatenate((hist[:1], hist))
-                ax.plot(
-                    bin_edges,
-                    hist,
+                ax_.plot(
+                    *observed["hist"],
                     label="Observed {}".format(var_name),
                     color="k",
                     linewidth=linewidth,
                     zorder=3,
-                    drawstyle=plot_kwargs["drawstyle"],
+                    drawstyle=plot_kwargs["drawstyle"]
                 )
 
             if animated:
                 animate, init = _set_animation(
-                    pp_sampled_vals, ax, dtype=dtype, kind=kind, plot_kwargs=plot_kwargs
+                    pp_sampled_vals, ax_, dtype=dtype, kind=kind, plot_kwargs=plot_kwargs
                 )
 
             else:
-                # run plot_kde manually with one plot call
-                pp_densities = []
-                for vals in pp_sampled_vals:
-                    vals = np.array([vals]).flatten()
-                    if dtype == "f":
-                        pp_density, lower, upper = _fast_kde(vals)
-                        pp_x = np.linspace(lower, upper, len(pp_density))
-                        pp_densities.extend([pp_x, pp_density])
-                    else:
-                        nbins = round(len(vals) ** 0.5)
-                        hist, bin_edges = np.histogram(vals, bins=nbins, density=True)
-                        hist = np.concatenate((hist[:1], hist))
-                        pp_densities.extend([bin_edges, hist])
-
-                ax.plot(*pp_densities, **plot_kwargs)
+                plot_lines(ax_, panel["pp_lines"], **plot_kwargs)
 
-            if mean:
-                if dtype == "f":
-                    plot_kde(
-                        pp_vals.flatten(),
-                        plot_kwargs={
-                            "color": "C0",
-                            "linestyle": "--",
-                            "linewidth": linewidth,
-                            "zorder": 2,
-                        },
-                        label="Posterior predictive mean {}".format(pp_var_name),
-                        ax=ax,
-                        legend=legend,
-                    )
-                else:
-                    vals = pp_vals.flatten()
-                    nbins = round(len(vals) ** 0.5)
-                    hist, bin_edges = np.histogram(vals, bins=nbins, density=True)
-                    hist = np.concatenate((hist[:1], hist))
-                    ax.plot(
-                        bin_edges,
-                        hist,
-                        color="C0",
-                        linewidth=linewidth,
-                        label="Posterior predictive mean {}".format(pp_var_name),
-                        zorder=2,
-                        linestyle="--",
-                        drawstyle=plot_kwargs["drawstyle"],
-                    )
-            ax.tick_params(labelsize=xt_labelsize)
-            ax.set_yticks([])
+            if mean is not None:
+                _draw_ppc_mean(
+                    ax_, mean, mean_label, linewidth, 2, legend, plot_kwargs.get("drawstyle")
+                )
+            ax_.tick_params(labelsize=xt_labelsize)
+            ax_.set_yticks([])
 
         elif kind == "cumulative":
             drawstyle = "default" if dtype == "f" else "steps-pre"
-            ax.plot(
-                *_empirical_cdf(obs_vals),
+            ax_.plot(
+                *observed["cdf"],
                 color="k",
                 linewidth=linewidth,
                 label="Observed {}".format(var_name),
@@ -354,7 +430,7 @@ def plot_ppc(
             if animated:
                 animate, init = _set_animation(
                     pp_sampled_vals,
-                    ax,
+                    ax_,
                     kind=kind,
                     alpha=alpha,
                     drawstyle=drawstyle,
@@ -362,62 +438,34 @@ def plot_ppc(
                 )
 
             else:
-                # run plot_kde manually with one plot call
-                pp_densities = []
-                for vals in pp_sampled_vals:
-                    vals = np.array([vals]).flatten()
-                    pp_x, pp_density = _empirical_cdf(vals)
-                    pp_densities.extend([pp_x, pp_density])
-
-                ax.plot(
-                    *pp_densities, alpha=alpha, color="C5", drawstyle=drawstyle, linewidth=linewidth
+                plot_lines(
+                    ax_,
+                    panel["pp_lines"],
+                    alpha=alpha,
+                    color="C5",
+                    drawstyle=drawstyle,
+                    linewidth=linewidth,
                 )
-            ax.plot([], color="C5", label="Posterior predictive {}".format(pp_var_name))
-            if mean:
-                ax.plot(
-                    *_empirical_cdf(pp_vals.flatten()),
+            ax_.plot([], color="C5", label="Posterior predictive {}".format(pp_var_name))
+            if mean is not None:
+                ax_.plot(
+                    *mean["cdf"],
                     color="C0",
                     linestyle="--",
                     linewidth=linewidth,
                     drawstyle=drawstyle,
-                    label="Posterior predictive mean {}".format(pp_var_name)
+                    label=mean_label
                 )
-            ax.set_yticks([0, 0.5, 1])
+            ax_.set_yticks([0, 0.5, 1])
 
         elif kind == "scatter":
-            if mean:
-                if dtype == "f":
-                    plot_kde(
-                        pp_vals.flatten(),
-                        plot_kwargs={
-                            "color": "C0",
-                            "linestyle": "--",
-                            "linewidth": linewidth,
-                            "zorder": 3,
-                        },
-                        label="Posterior predictive mean {}".format(pp_var_name),
-                        ax=ax,
-                        legend=legend,
-                    )
-                else:
-                    vals = pp_vals.flatten()
-                    nbins = round(len(vals) ** 0.5)
-                    hist, bin_edges = np.histogram(vals, bins=nbins, density=True)
-                    hist = np.concatenate((hist[:1], hist))
-                    ax.plot(
-                        bin_edges,
-                        hist,
-                        color="C0",
-                        linewidth=linewidth,
-                        label="Posterior predictive mean {}".format(pp_var_name),
-                        zorder=3,
-                        linestyle="--",
-                        drawstyle="steps-pre",
-                    )
+            if mean is not None:
+                _draw_ppc_mean(ax_, mean, mean_label, linewidth, 3, legend, "steps-pre")
 
-            _, limit = ax.get_ylim()
+            obs_vals = observed["values"]
+            _, limit = ax_.get_ylim()
             limit *= 1.05
-            y_rows = np.linspace(0, limit, num_pp_samples + 1)
+            y_rows = np.linspace(0, limit, len(pp_sampled_vals) + 1)
             jitter_scale = y_rows[1] - y_rows[0]
             scale_low = 0
             scale_high = jitter_scale * jitter
@@ -425,7 +473,7 @@ def plot_ppc(
             obs_yvals = np.zeros_like(obs_vals, dtype=np.float64)
             if jitter:
                 obs_yvals += np.random.uniform(low=scale_low, high=scale_high, size=len(obs_vals))
-            ax.plot(
+            ax_.plot(
                 obs_vals,
                 obs_yvals,
                 "o",
@@ -439,47 +487,88 @@ def plot_ppc(
             if animated:
                 animate, init = _set_animation(
                     pp_sampled_vals,
-                    ax,
+                    ax_,
                     kind=kind,
                     height=y_rows.mean() * 0.5,
                     markersize=markersize,
                 )
 
             else:
-                for vals, y in zip(pp_sampled_vals, y_rows[1:]):
-                    vals = np.ravel(vals)
-                    yvals = np.full_like(vals, y, dtype=np.float64)
-                    if jitter:
-                        yvals += np.random.uniform(low=scale_low, high=scale_high, size=len(vals))
-                    ax.plot(
-                        vals, yvals, "o", zorder=2, color="C5", markersize=markersize, alpha=alpha
-                    )
+                # all the samples are drawn as a single line of markers
+                vals = pp_sampled_vals.reshape(len(pp_sampled_vals), -1)
+                yvals = np.repeat(y_rows[1:, None], vals.shape[1], axis=1)
+                if jitter:
+                    yvals += np.random.uniform(low=scale_low, high=scale_high, size=vals.shape)
+                ax_.plot(
+                    vals.ravel(),
+                    yvals.ravel(),
+                    "o",
+                    zorder=2,
+                    color="C5",
+                    markersize=markersize,
+                    alpha=alpha,
+                )
 
-            ax.plot([], "C5o", label="Posterior predictive {}".format(pp_var_name))
+            ax_.plot([], "C5o", label="Posterior predictive {}".format(pp_var_name))
 
-            ax.set_yticks([])
+            ax_.set_yticks([])
 
-        if var_name != pp_var_name:
-            xlabel = "{} / {}".format(var_name, pp_var_name)
-        else:
-            xlabel = var_name
-        ax.set_xlabel(make_label(xlabel, selection), fontsize=ax_labelsize)
+        ax_.set_xlabel(panel["xlabel"], fontsize=ax_labelsize)
 
         if legend:
             if i == 0:
-                ax.legend(fontsize=xt_labelsize * 0.75)
+                ax_.legend(fontsize=xt_labelsize * 0.75)
             else:
-                ax.legend([])
+                ax_.legend([])
 
     if animated:
         ani = animation.FuncAnimation(
-            fig, animate, np.arange(0, num_pp_samples), init_func=init, **animation_kwargs
+            fig,
+            animate,
+            np.arange(0, len(panels[0]["pp_sampled"])),
+            init_func=init,
+            **animation_kwargs
         )
         return axes, ani
     else:
         return axes
 
 
+def _draw_ppc_mean(ax, mean, label, linewidth, zorder, legend, drawstyle):
+    """Draw the KDE or histogram of all the posterior predictive samples."""
+    if "kde" in mean:
+        _draw_kde(
+            ax,
+            mean["kde"],
+            plot_kwargs={
+                "color": "C0",
+                "linestyle": "--",
+                "linewidth": linewidth,
+                "zorder": zorder,
+            },
+            label=label,
+            legend=legend,
+        )
+    else:
+        ax.plot(
+            *mean["hist"],
+            color="C0",
+            linewidth=linewidth,
+            label=label,
+            zorder=zorder,
+            linestyle="--",
+            drawstyle=drawstyle
+        )
+
+
+def _density_hist(vals):
+    """Compute the x and y values to draw the histogram of vals as a line."""
+    nbins = round(len(vals) ** 0.5)
+    hist, bin_edges = np.histogram(vals, bins=nbins, density=True)
+    hist = np.concatenate((hist[:1], hist))
+    return bin_edges, hist
+
+
 def _set_animation(
     pp_sampled_vals,
     ax,
@@ -495,19 +584,15 @@ def _set_animation(
     if kind == "density":
         length = len(pp_sampled_vals)
         if dtype == "f":
-            y_vals, lower, upper = _fast_kde(pp_sampled_vals[0])
-            x_vals = np.linspace(lower, upper, len(y_vals))
+            pp_density, lower, upper = _fast_kde_batch(pp_sampled_vals.reshape(length, -1))
+            pp_x = np.linspace(lower, upper, pp_density.shape[1], axis=1)
 
-            max_max = max([max(_fast_kde(pp_sampled_vals[i])[0]) for i in range(length)])
-
-            ax.set_ylim(0, max_max)
+            ax.set_ylim(0, pp_density.max())
 
-            line, = ax.plot(x_vals, y_vals, **plot_kwargs)
+            line, = ax.plot(pp_x[0], pp_density[0], **plot_kwargs)
 
             def animate(i):
-                y_vals, lower, upper = _fast_kde(pp_sampled_vals[i])
-                x_vals = np.linspace(lower, upper, len(y_vals))
-                line.set_data(x_vals, y_vals)
+                line.set_data(pp_x[i], pp_density[i])
                 return line
 
         else:
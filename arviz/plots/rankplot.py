@@ -1,8 +1,8 @@
 """Histograms of ranked posterior draws, plotted for each chain."""
 import numpy as np
-import scipy.stats
 
 from ..data import convert_to_dataset
+from ..stats import rank_histogram
 from .plot_utils import (
     _scale_fig_size,
     xarray_var_iter,
@@ -10,7 +10,9 @@ from .plot_utils import (
     _create_axes_grid,
     make_label,
 )
+from .plot_data import PlotData, renderer
 from ..utils import _var_names
+from ..profiling import traced
 
 
 def _sturges_formula(dataset, mult=1):
@@ -35,7 +37,17 @@ def _sturges_formula(dataset, mult=1):
     return int(np.ceil(mult * np.log2(dataset.draw.size)) + 1)
 
 
-def plot_rank(data, var_names=None, coords=None, bins=None, ref_line=True, figsize=None, axes=None):
+@traced()
+def plot_rank(
+    data,
+    var_names=None,
+    coords=None,
+    bins=None,
+    ref_line=True,
+    figsize=None,
+    axes=None,
+    compute_only=False,
+):
     """Plot rank order statistics of chains.
 
     From the paper: Rank plots are histograms of the ranked posterior
@@ -65,7 +77,7 @@ def plot_rank(data, var_names=None, coords=None, bins=None, ref_line=True, figsi
     bins : None or passed to np.histogram
         Binning strategy used for histogram. By default uses twice the
         result of Sturges' formula. See `np.histogram` documenation for
-        other available arguments.
+        other available arguments and :func:`arviz.rank_histogram`.
     ref_line : boolean
         Whether to include a dashed line showing where a uniform
         distribution would lie
@@ -73,10 +85,13 @@ def plot_rank(data, var_names=None, coords=None, bins=None, ref_line=True, figsi
         Figure size. If None it will be defined automatically.
     ax : axes
         Matplotlib axes. Defaults to None.
+    compute_only : bool, optional
+        If True, compute the rank histograms and return them as a :class:`PlotData` without
+        drawing them. Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
 
     Examples
     --------
@@ -108,21 +123,32 @@ def plot_rank(data, var_names=None, coords=None, bins=None, ref_line=True, figsi
         # Use double Sturges' formula
         bins = _sturges_formula(posterior_data, mult=2)
 
+    # rank and count all the variables at once
+    all_counts, bin_ary = rank_histogram(
+        np.stack([var_data for _, _, var_data in plotters]), bins=bins
+    )
+    panels = [
+        {"label": make_label(var_name, selection), "counts": counts, "bins": bin_ary}
+        for (var_name, selection, _), counts in zip(plotters, all_counts)
+    ]
+
+    plot_data = PlotData("plot_rank", dict(panels=panels, ref_line=ref_line, figsize=figsize))
+    if compute_only:
+        return plot_data
+    return plot_data.render(axes)
+
+
+@renderer("plot_rank")
+def _draw_rank(ax=None, panels=(), ref_line=True, figsize=None):
+    """Draw the rank histograms computed by `plot_rank`."""
+    axes = ax
+    rows, cols = default_grid(len(panels))
+    figsize, ax_labelsize, titlesize, _, _, _ = _scale_fig_size(figsize, None, rows=rows, cols=cols)
     if axes is None:
-        rows, cols = default_grid(len(plotters))
-
-        figsize, ax_labelsize, titlesize, _, _, _ = _scale_fig_size(
-            figsize, None, rows=rows, cols=cols
-        )
-        _, axes = _create_axes_grid(len(plotters), rows, cols, figsize=figsize, squeeze=False)
-
-    for ax, (var_name, selection, var_data) in zip(axes.ravel(), plotters):
-        ranks = scipy.stats.rankdata(var_data).reshape(var_data.shape)
-        all_counts = []
-        for row in ranks:
-            counts, bin_ary = np.histogram(row, bins=bins, range=(0, ranks.size))
-            all_counts.append(counts)
-        all_counts = np.array(all_counts)
+        _, axes = _create_axes_grid(len(panels), rows, cols, figsize=figsize, squeeze=False)
+
+    for ax_, panel in zip(np.ravel(axes), panels):
+        all_counts, bin_ary = panel["counts"], panel["bins"]
         gap = all_counts.max() * 1.05
         width = bin_ary[1] - bin_ary[0]
 
@@ -134,22 +160,22 @@ def plot_rank(data, var_names=None, coords=None, bins=None, ref_line=True, figsi
             y_ticks.append(idx * gap)
             if ref_line:
                 # Line where data is uniform
-                ax.axhline(y=y_ticks[-1] + counts.mean(), linestyle="--", color="C1")
+                ax_.axhline(y=y_ticks[-1] + counts.mean(), linestyle="--", color="C1")
             # fake an x-axis
-            ax.axhline(y=y_ticks[-1], color="k", lw=1)
-            ax.bar(
+            ax_.axhline(y=y_ticks[-1], color="k", lw=1)
+            ax_.bar(
                 bin_ary,
                 counts,
                 bottom=y_ticks[-1],
                 width=width,
                 align="center",
                 color="C0",
-                edgecolor=ax.get_facecolor(),
+                edgecolor=ax_.get_facecolor(),
             )
-        ax.set_xlabel("Rank (all chains)", fontsize=ax_labelsize)
-        ax.set_ylabel("Chain", fontsize=ax_labelsize)
-        ax.set_yticks(y_ticks)
-        ax.set_yticklabels(np.arange(len(y_ticks)))
-        ax.set_title(make_label(var_name, selection), fontsize=titlesize)
+        ax_.set_xlabel("Rank (all chains)", fontsize=ax_labelsize)
+        ax_.set_ylabel("Chain", fontsize=ax_labelsize)
+        ax_.set_yticks(y_ticks)
+        ax_.set_yticklabels(np.arange(len(y_ticks)))
+        ax_.set_title(panel["label"], fontsize=titlesize)
 
     return axes
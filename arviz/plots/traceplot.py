@@ -6,11 +6,22 @@ from matplotlib.lines import Line2D
 import numpy as np
 
 from ..data import convert_to_dataset
-from .distplot import plot_dist
-from .plot_utils import _scale_fig_size, get_bins, xarray_var_iter, make_label, get_coords
+from .distplot import plot_dist, _draw_dist
+from .plot_data import PlotData, renderer
+from .plot_utils import (
+    _scale_fig_size,
+    downsample_indices,
+    get_bins,
+    xarray_var_iter,
+    make_label,
+    get_coords,
+)
+from ..rcparams import rcParams
 from ..utils import _var_names
+from ..profiling import traced
 
 
+@traced()
 def plot_trace(
     data,
     var_names=None,
@@ -28,6 +39,8 @@ def plot_trace(
     hist_kwargs=None,
     trace_kwargs=None,
     max_plots=40,
+    downsample="auto",
+    compute_only=False,
 ):
     """Plot distribution (histogram or kernel density estimates) and sampled values.
 
@@ -70,9 +83,21 @@ def plot_trace(
         Extra keyword arguments passed to `arviz.plot_dist`. Only affects discrete variables.
     trace_kwargs : dict
         Extra keyword arguments passed to `plt.plot`
+    max_plots : int, optional
+        Maximum number of variables to plot. Defaults to 40.
+    downsample : {"auto", "minmax", "lttb", None}, optional
+        Draw only a subset of the draws of each chain on the traces, about two points ("minmax")
+        or one point ("lttb") per pixel of width of the trace axes, see
+        :func:`arviz.plots.plot_utils.downsample_indices`. The divergent draws are always drawn.
+        "auto", the default, uses "minmax" for chains longer than
+        ``rcParams["plot.trace_downsample_threshold"]`` draws. None draws every draw.
+    compute_only : bool, optional
+        If True, compute the distributions, traces and divergences and return them as a
+        :class:`PlotData` without drawing them. Defaults to False.
+
     Returns
     -------
-    axes : matplotlib axes
+    axes : matplotlib axes, or PlotData if `compute_only` is True
 
 
     Examples
@@ -113,6 +138,11 @@ def plot_trace(
         >>> az.plot_trace(data, var_names=('theta_t', 'theta'), coords=coords, lines=lines)
 
     """
+    if downsample not in ("auto", "minmax", "lttb", None, False):
+        raise ValueError(
+            "downsample must be 'auto', 'minmax', 'lttb' or None, got {!r}".format(downsample)
+        )
+
     if divergences:
         try:
             divergence_data = convert_to_dataset(data, group="sample_stats").diverging
@@ -181,114 +211,189 @@ def plot_trace(
     trace_kwargs.setdefault("linewidth", linewidth)
     plot_kwargs.setdefault("linewidth", linewidth)
 
-    _, axes = plt.subplots(
-        len(plotters), 2, squeeze=False, figsize=figsize, constrained_layout=True
-    )
+    draws = data.draw.values
+    if downsample == "auto":
+        downsample = "minmax" if len(draws) > rcParams["plot.trace_downsample_threshold"] else None
+    # one bucket per pixel of width of the trace axes
+    n_buckets = int(figsize[0] * plt.rcParams["figure.dpi"] / 2)
 
-    for idx, (var_name, selection, value) in enumerate(plotters):
+    panels = []
+    for var_name, selection, value in plotters:
         value = np.atleast_2d(value)
 
         if len(value.shape) == 2:
-            _plot_chains(
-                axes,
-                idx,
-                value,
-                data,
-                colors,
-                combined,
-                xt_labelsize,
-                trace_kwargs,
-                hist_kwargs,
-                plot_kwargs,
-                fill_kwargs,
-                rug_kwargs,
-            )
+            traces = [value]
         else:
             value = value.reshape((value.shape[0], value.shape[1], -1))
-            for sub_idx in range(value.shape[2]):
-                _plot_chains(
-                    axes,
-                    idx,
-                    value[..., sub_idx],
-                    data,
-                    colors,
-                    combined,
-                    xt_labelsize,
-                    trace_kwargs,
-                    hist_kwargs,
-                    plot_kwargs,
-                    fill_kwargs,
-                    rug_kwargs,
-                )
-
-        if value[0].dtype.kind == "i":
-            xticks = get_bins(value)
-            axes[idx, 0].set_xticks(xticks[:-1])
-        axes[idx, 0].set_yticks([])
-        for col in (0, 1):
-            axes[idx, col].set_title(make_label(var_name, selection), fontsize=titlesize, wrap=True)
-            axes[idx, col].tick_params(labelsize=xt_labelsize)
-
-        xlims = [ax.get_xlim() for ax in axes[idx, :]]
-        ylims = [ax.get_ylim() for ax in axes[idx, :]]
+            traces = [value[..., sub_idx] for sub_idx in range(value.shape[2])]
 
+        divs = None
         if divergences:
             div_selection = {k: v for k, v in selection.items() if k in divergence_data.dims}
-            divs = divergence_data.sel(**div_selection).values
-            # if combined:
-            #     divs = divs.flatten()
-            divs = np.atleast_2d(divs)
+            divs = np.atleast_2d(divergence_data.sel(**div_selection).values)
+
+        dists = []
+        for trace in traces:
+            if combined:
+                dist_values, dist_colors = [np.ravel(trace)], colors[-1:]
+            else:
+                dist_values, dist_colors = trace, colors
+            dists.append(
+                [
+                    plot_dist(
+                        row,
+                        textsize=xt_labelsize,
+                        hist_kwargs=hist_kwargs,
+                        plot_kwargs=dict(plot_kwargs, color=color),
+                        fill_kwargs=fill_kwargs,
+                        rug_kwargs=rug_kwargs,
+                        compute_only=True,
+                    ).data
+                    for row, color in zip(dist_values, dist_colors)
+                ]
+            )
+
+        xticks = get_bins(value)[:-1] if value[0].dtype.kind == "i" else None
 
+        if downsample:
+            traces = [
+                _downsample_trace(trace, draws, n_buckets, downsample, divs) for trace in traces
+            ]
+        else:
+            traces = [{"x": None, "y": trace} for trace in traces]
+
+        div_points = []
+        if divergences:
             for chain, chain_divs in enumerate(divs):
-                div_draws = data.draw.values[chain_divs]
                 div_idxs = np.arange(len(chain_divs))[chain_divs]
                 if div_idxs.size > 0:
-                    if divergences == "top":
-                        ylocs = [ylim[1] for ylim in ylims]
-                    else:
-                        ylocs = [ylim[0] for ylim in ylims]
-                    values = value[chain, div_idxs]
-                    axes[idx, 1].plot(
-                        div_draws,
-                        np.zeros_like(div_idxs) + ylocs[1],
-                        marker="|",
-                        color="black",
-                        markeredgewidth=1.5,
-                        markersize=30,
-                        linestyle="None",
-                        alpha=hist_kwargs["alpha"],
-                        zorder=-5,
+                    div_points.append(
+                        {"draws": draws[chain_divs], "values": value[chain, div_idxs]}
                     )
-                    axes[idx, 1].set_ylim(*ylims[1])
-                    axes[idx, 0].plot(
-                        values,
-                        np.zeros_like(values) + ylocs[0],
-                        marker="|",
-                        color="black",
-                        markeredgewidth=1.5,
-                        markersize=30,
-                        linestyle="None",
-                        alpha=trace_kwargs["alpha"],
-                        zorder=-5,
-                    )
-                    axes[idx, 0].set_ylim(*ylims[0])
 
+        line_values = []
         for _, _, vlines in (j for j in lines if j[0] == var_name and j[1] == selection):
             if isinstance(vlines, (float, int)):
-                line_values = [vlines]
+                line_values.append(np.array([vlines]))
             else:
-                line_values = np.atleast_1d(vlines).ravel()
+                line_values.append(np.atleast_1d(vlines).ravel())
+
+        panels.append(
+            {
+                "label": make_label(var_name, selection),
+                "traces": traces,
+                "dists": dists,
+                "xticks": xticks,
+                "divergences": div_points,
+                "lines": line_values,
+            }
+        )
+
+    plot_data = PlotData(
+        "plot_trace",
+        dict(
+            panels=panels,
+            draws=draws,
+            chains=list(data.chain.values),
+            colors=colors,
+            combined=combined,
+            divergences=divergences,
+            legend=legend,
+            figsize=figsize,
+            titlesize=titlesize,
+            xt_labelsize=xt_labelsize,
+            trace_kwargs=trace_kwargs,
+            hist_kwargs=hist_kwargs,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render()
+
+
+@renderer("plot_trace")
+def _draw_trace(
+    ax=None,
+    panels=(),
+    draws=None,
+    chains=(),
+    colors=(),
+    combined=False,
+    divergences="bottom",
+    legend=False,
+    figsize=None,
+    titlesize=None,
+    xt_labelsize=None,
+    trace_kwargs=None,
+    hist_kwargs=None,
+):
+    """Draw the distributions and traces computed by `plot_trace`."""
+    trace_kwargs = {} if trace_kwargs is None else trace_kwargs
+    hist_kwargs = {} if hist_kwargs is None else hist_kwargs
+
+    if ax is None:
+        _, axes = plt.subplots(
+            len(panels), 2, squeeze=False, figsize=figsize, constrained_layout=True
+        )
+    else:
+        axes = np.asarray(ax).reshape(-1, 2)
+
+    for idx, panel in enumerate(panels):
+        for trace, dists in zip(panel["traces"], panel["dists"]):
+            _plot_chains(axes[idx, 0], axes[idx, 1], trace, dists, draws, colors, trace_kwargs)
+
+        if panel["xticks"] is not None:
+            axes[idx, 0].set_xticks(panel["xticks"])
+        axes[idx, 0].set_yticks([])
+        for col in (0, 1):
+            axes[idx, col].set_title(panel["label"], fontsize=titlesize, wrap=True)
+            axes[idx, col].tick_params(labelsize=xt_labelsize)
+
+        xlims = [ax_.get_xlim() for ax_ in axes[idx, :]]
+        ylims = [ax_.get_ylim() for ax_ in axes[idx, :]]
+
+        for div_points in panel["divergences"]:
+            if divergences == "top":
+                ylocs = [ylim[1] for ylim in ylims]
+            else:
+                ylocs = [ylim[0] for ylim in ylims]
+            values = div_points["values"]
+            axes[idx, 1].plot(
+                div_points["draws"],
+                np.zeros(len(values)) + ylocs[1],
+                marker="|",
+                color="black",
+                markeredgewidth=1.5,
+                markersize=30,
+                linestyle="None",
+                alpha=hist_kwargs["alpha"],
+                zorder=-5,
+            )
+            axes[idx, 1].set_ylim(*ylims[1])
+            axes[idx, 0].plot(
+                values,
+                np.zeros_like(values) + ylocs[0],
+                marker="|",
+                color="black",
+                markeredgewidth=1.5,
+                markersize=30,
+                linestyle="None",
+                alpha=trace_kwargs["alpha"],
+                zorder=-5,
+            )
+            axes[idx, 0].set_ylim(*ylims[0])
+
+        for line_values in panel["lines"]:
             axes[idx, 0].vlines(line_values, *ylims[0], colors="black", linewidth=1.5, alpha=0.75)
             axes[idx, 1].hlines(
                 line_values, *xlims[1], colors="black", linewidth=1.5, alpha=trace_kwargs["alpha"]
             )
         axes[idx, 0].set_ylim(bottom=0, top=ylims[0][1])
-        axes[idx, 1].set_xlim(left=data.draw.min(), right=data.draw.max())
+        axes[idx, 1].set_xlim(left=np.min(draws), right=np.max(draws))
         axes[idx, 1].set_ylim(*ylims[1])
     if legend:
         handles = [
-            Line2D([], [], color=color, label=chain_id)
-            for chain_id, color in zip(data.chain.values, colors)
+            Line2D([], [], color=color, label=chain_id) for chain_id, color in zip(chains, colors)
         ]
         if combined:
             handles.insert(0, Line2D([], [], color=colors[-1], label="combined"))
@@ -296,43 +401,21 @@ def plot_trace(
     return axes
 
 
-def _plot_chains(
-    axes,
-    idx,
-    value,
-    data,
-    colors,
-    combined,
-    xt_labelsize,
-    trace_kwargs,
-    hist_kwargs,
-    plot_kwargs,
-    fill_kwargs,
-    rug_kwargs,
-):
-    for chain_idx, row in enumerate(value):
-        axes[idx, 1].plot(data.draw.values, row, color=colors[chain_idx], **trace_kwargs)
-
-        if not combined:
-            plot_kwargs["color"] = colors[chain_idx]
-            plot_dist(
-                row,
-                textsize=xt_labelsize,
-                ax=axes[idx, 0],
-                hist_kwargs=hist_kwargs,
-                plot_kwargs=plot_kwargs,
-                fill_kwargs=fill_kwargs,
-                rug_kwargs=rug_kwargs,
-            )
+def _downsample_trace(trace, draws, n_buckets, method, divs=None):
+    """Select the draws of each chain drawn on the trace, keeping the divergent ones."""
+    x_values, y_values = [], []
+    for chain_idx, row in enumerate(trace):
+        keep = None if divs is None else np.flatnonzero(divs[chain_idx])
+        idxs = downsample_indices(row, n_buckets, method=method, keep=keep)
+        x_values.append(draws[idxs])
+        y_values.append(row[idxs])
+    return {"x": x_values, "y": y_values}
 
-    if combined:
-        plot_kwargs["color"] = colors[-1]
-        plot_dist(
-            value.flatten(),
-            textsize=xt_labelsize,
-            ax=axes[idx, 0],
-            hist_kwargs=hist_kwargs,
-            plot_kwargs=plot_kwargs,
-            fill_kwargs=fill_kwargs,
-            rug_kwargs=rug_kwargs,
-        )
+
+def _plot_chains(ax_dist, ax_trace, trace, dists, draws, colors, trace_kwargs):
+    for chain_idx, row in enumerate(trace["y"]):
+        x_values = draws if trace["x"] is None else trace["x"][chain_idx]
+        ax_trace.plot(x_values, row, color=colors[chain_idx], **trace_kwargs)
+
+    for dist in dists:
+        _draw_dist(ax=ax_dist, **dist)
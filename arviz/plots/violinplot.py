@@ -5,10 +5,13 @@ import numpy as np
 from ..data import convert_to_dataset
 from ..stats import hpd
 from .kdeplot import _fast_kde
+from .plot_data import PlotData, renderer
 from .plot_utils import get_bins, _scale_fig_size, xarray_var_iter, make_label
 from ..utils import _var_names
+from ..profiling import traced
 
 
+@traced()
 def plot_violin(
     data,
     var_names=None,
@@ -21,6 +24,7 @@ def plot_violin(
     textsize=None,
     ax=None,
     kwargs_shade=None,
+    compute_only=False,
 ):
     """Plot posterior of traces as violin plot.
 
@@ -57,50 +61,95 @@ def plot_violin(
     ax : matplotlib axes
     kwargs_shade : dicts, optional
         Additional keywords passed to `fill_between`, or `barh` to control the shade
+    compute_only : bool, optional
+        If True, compute the densities and intervals and return them as a :class:`PlotData`
+        without drawing them. Defaults to False.
 
     Returns
     -------
-    ax : matplotlib axes
+    ax : matplotlib axes, or PlotData if `compute_only` is True
     """
     data = convert_to_dataset(data, group="posterior")
     var_names = _var_names(var_names, data)
 
     plotters = list(xarray_var_iter(data, var_names=var_names, combined=True))
 
+    panels = []
+    for var_name, selection, x in plotters:
+        val = np.ravel(x)
+        if val[0].dtype.kind == "i":
+            panel = _cat_hist_data(val)
+        else:
+            panel = _violin_data(val, bw)
+        panel.update(
+            label=make_label(var_name, selection),
+            percentiles=np.percentile(val, [25, 75, 50]),
+            hpd=hpd(val, credible_interval),
+        )
+        panels.append(panel)
+
+    plot_data = PlotData(
+        "plot_violin",
+        dict(
+            panels=panels,
+            quartiles=quartiles,
+            shade=shade,
+            sharey=sharey,
+            figsize=figsize,
+            textsize=textsize,
+            kwargs_shade=kwargs_shade,
+        ),
+    )
+    if compute_only:
+        return plot_data
+    return plot_data.render(ax)
+
+
+@renderer("plot_violin")
+def _draw_violin(
+    ax=None,
+    panels=(),
+    quartiles=True,
+    shade=0.35,
+    sharey=True,
+    figsize=None,
+    textsize=None,
+    kwargs_shade=None,
+):
+    """Draw the violins computed by `plot_violin`."""
     if kwargs_shade is None:
         kwargs_shade = {}
 
     (figsize, ax_labelsize, _, xt_labelsize, linewidth, _) = _scale_fig_size(
-        figsize, textsize, 1, len(plotters)
+        figsize, textsize, 1, len(panels)
     )
     ax_labelsize *= 2
 
     if ax is None:
         fig, ax = plt.subplots(
-            1, len(plotters), figsize=figsize, sharey=sharey, constrained_layout=True
+            1, len(panels), figsize=figsize, sharey=sharey, constrained_layout=True
         )
 
     else:
-        fig = ax.figure
+        fig = np.ravel(ax)[0].figure
 
     ax = np.atleast_1d(ax)
 
-    for axind, (var_name, selection, x) in enumerate(plotters):
-        val = x.flatten()
-        if val[0].dtype.kind == "i":
-            cat_hist(val, shade, ax[axind], **kwargs_shade)
+    for axind, panel in enumerate(panels):
+        if "centers" in panel:
+            cat_hist(panel, shade, ax[axind], **kwargs_shade)
         else:
-            _violinplot(val, shade, bw, ax[axind], **kwargs_shade)
+            _violinplot(panel, shade, ax[axind], **kwargs_shade)
 
-        per = np.percentile(val, [25, 75, 50])
-        hpd_intervals = hpd(val, credible_interval)
+        per = panel["percentiles"]
+        hpd_intervals = panel["hpd"]
 
         if quartiles:
             ax[axind].plot([0, 0], per[:2], lw=linewidth * 3, color="k", solid_capstyle="round")
         ax[axind].plot([0, 0], hpd_intervals, lw=linewidth, color="k", solid_capstyle="round")
         ax[axind].plot(0, per[-1], "wo", ms=linewidth * 1.5)
 
-        ax[axind].set_xlabel(make_label(var_name, selection), fontsize=ax_labelsize)
+        ax[axind].set_xlabel(panel["label"], fontsize=ax_labelsize)
         ax[axind].set_xticks([])
         ax[axind].tick_params(labelsize=xt_labelsize)
         ax[axind].grid(None, axis="x")
@@ -113,10 +162,16 @@ def plot_violin(
     return ax
 
 
-def _violinplot(val, shade, bw, ax, **kwargs_shade):
-    """Auxiliary function to plot violinplots."""
+def _violin_data(val, bw):
+    """Compute the KDE of a continuous violinplot."""
     density, low_b, up_b = _fast_kde(val, bw=bw)
-    x = np.linspace(low_b, up_b, len(density))
+    return {"density": density, "lower": low_b, "upper": up_b}
+
+
+def _violinplot(violin, shade, ax, **kwargs_shade):
+    """Auxiliary function to plot violinplots."""
+    density = violin["density"]
+    x = np.linspace(violin["lower"], violin["upper"], len(density))
 
     x = np.concatenate([x, x[::-1]])
     density = np.concatenate([-density, density[::-1]])
@@ -124,14 +179,26 @@ def _violinplot(val, shade, bw, ax, **kwargs_shade):
     ax.fill_betweenx(x, density, alpha=shade, lw=0, **kwargs_shade)
 
 
-def cat_hist(val, shade, ax, **kwargs_shade):
-    """Auxiliary function to plot discrete-violinplots."""
+def _cat_hist_data(val):
+    """Compute the histogram of a discrete violinplot."""
     bins = get_bins(val)
     binned_d, _ = np.histogram(val, bins=bins, normed=True)
 
     bin_edges = np.linspace(np.min(val), np.max(val), len(bins))
     centers = 0.5 * (bin_edges + np.roll(bin_edges, 1))[:-1]
     heights = np.diff(bin_edges)
+    return {"binned_d": binned_d, "centers": centers, "heights": heights}
 
+
+def cat_hist(hist_data, shade, ax, **kwargs_shade):
+    """Auxiliary function to plot discrete-violinplots."""
+    binned_d = hist_data["binned_d"]
     lefts = -0.5 * binned_d
-    ax.barh(centers, binned_d, height=heights, left=lefts, alpha=shade, **kwargs_shade)
+    ax.barh(
+        hist_data["centers"],
+        binned_d,
+        height=hist_data["heights"],
+        left=lefts,
+        alpha=shade,
+        **kwargs_shade
+    )
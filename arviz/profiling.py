@@ -0,0 +1,258 @@
+"""Lightweight timing and memory instrumentation of ArviZ internals.
+
+The slow stages of stats, converters and plots (parsing, unpacking, ufunc loops,
+rank normalization, autocovariance FFTs, dataframe formatting, drawing...) are
+wrapped in named spans. Spans are only recorded while a :class:`Profiler` is
+active, otherwise they cost a global lookup.
+
+Examples
+--------
+Record the stages of ``summary`` and export them::
+
+    import arviz as az
+    data = az.load_arviz_data("centered_eight")
+    with az.profiling.profile(trace_memory=True) as prof:
+        az.summary(data)
+    prof.to_dict()["totals"]
+    prof.to_chrome_trace("summary_trace.json")  # open in chrome://tracing
+
+"""
+from collections import OrderedDict
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+__all__ = ["Profiler", "profile", "enable", "disable", "span", "traced"]
+
+_ACTIVE = None
+_LOCAL = threading.local()
+
+
+class Profiler:
+    """Collect the spans recorded while active.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Record the net bytes allocated during each span using tracemalloc. This
+        slows down the profiled code. Defaults to False.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.spans = []
+        self._previous = None
+        self._started_tracemalloc = False
+        self._origin = time.perf_counter()
+
+    def start(self):
+        """Make this profiler the active one."""
+        global _ACTIVE  # pylint: disable=global-statement
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous = _ACTIVE
+        _ACTIVE = self
+        return self
+
+    def stop(self):
+        """Stop recording and restore the previously active profiler, if any."""
+        global _ACTIVE  # pylint: disable=global-statement
+        _ACTIVE = self._previous
+        self._previous = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        """Start recording spans."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop recording spans."""
+        self.stop()
+
+    def to_dict(self):
+        """Export the recorded spans.
+
+        Returns
+        -------
+        dict
+            ``spans`` is the list of recorded spans in completion order, each one with
+            ``name``, ``start`` (seconds since the profiler was created), ``duration``
+            (seconds), ``depth``, ``thread``, ``elements`` and ``allocated_bytes``.
+            ``totals`` maps each span name to its ``count``, total ``duration``,
+            ``elements`` and ``allocated_bytes``.
+        """
+        totals = OrderedDict()
+        for item in self.spans:
+            total = totals.setdefault(
+                item["name"], {"count": 0, "duration": 0.0, "elements": 0, "allocated_bytes": 0}
+            )
+            total["count"] += 1
+            total["duration"] += item["duration"]
+            total["elements"] += item["elements"] or 0
+            total["allocated_bytes"] += item["allocated_bytes"] or 0
+        return {"spans": [dict(item) for item in self.spans], "totals": dict(totals)}
+
+    def to_chrome_trace(self, filename=None):
+        """Export the recorded spans in Chrome trace event format.
+
+        Parameters
+        ----------
+        filename : str, optional
+            If given, write the trace as json to this file.
+
+        Returns
+        -------
+        dict
+            Trace that can be loaded in chrome://tracing or Perfetto.
+        """
+        pid = os.getpid()
+        events = []
+        for item in self.spans:
+            args = {
+                key: item[key] for key in ("elements", "allocated_bytes") if item[key] is not None
+            }
+            events.append(
+                {
+                    "name": item["name"],
+                    "cat": "arviz",
+                    "ph": "X",
+                    "ts": item["start"] * 1e6,
+                    "dur": item["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": item["thread"],
+                    "args": args,
+                }
+            )
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if filename is not None:
+            with open(filename, "w") as f_obj:
+                json.dump(trace, f_obj)
+        return trace
+
+
+class _Span:
+    """Context manager recording one span into a profiler."""
+
+    __slots__ = ("profiler", "name", "elements", "start", "memory")
+
+    def __init__(self, profiler, name, elements):
+        self.profiler = profiler
+        self.name = name
+        self.elements = elements
+
+    def __enter__(self):
+        _LOCAL.depth = getattr(_LOCAL, "depth", 0) + 1
+        self.memory = tracemalloc.get_traced_memory()[0] if self.profiler.trace_memory else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        _LOCAL.depth -= 1
+        allocated = None
+        if self.memory is not None:
+            allocated = tracemalloc.get_traced_memory()[0] - self.memory
+        self.profiler.spans.append(
+            {
+                "name": self.name,
+                "start": self.start - self.profiler._origin,  # pylint: disable=protected-access
+                "duration": end - self.start,
+                "depth": _LOCAL.depth,
+                "thread": threading.get_ident(),
+                "elements": self.elements,
+                "allocated_bytes": allocated,
+            }
+        )
+
+
+class _NullSpan:
+    """Context manager doing nothing, used when no profiler is active."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def profile(trace_memory=False):
+    """Context manager recording ArviZ spans, see :class:`Profiler`."""
+    return Profiler(trace_memory=trace_memory)
+
+
+def enable(trace_memory=False):
+    """Start recording ArviZ spans globally until :func:`disable` is called.
+
+    Returns
+    -------
+    Profiler
+    """
+    return Profiler(trace_memory=trace_memory).start()
+
+
+def disable():
+    """Stop the active profiler, if any.
+
+    Returns
+    -------
+    Profiler or None
+        The profiler that was active.
+    """
+    profiler = _ACTIVE
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def span(name, elements=None):
+    """Record the enclosed code as a span named `name` if a profiler is active.
+
+    Parameters
+    ----------
+    name : str
+    elements : int or callable, optional
+        Number of elements processed in the span. A callable returning it is only called
+        if a profiler is active.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        return _NULL_SPAN
+    if callable(elements):
+        elements = elements()
+    return _Span(profiler, name, elements)
+
+
+def traced(name=None):
+    """Decorate a function so that each call is recorded as a span.
+
+    Parameters
+    ----------
+    name : str, optional
+        Name of the span, defaults to the name of the function.
+    """
+
+    def decorator(func):
+        span_name = func.__name__ if name is None else name
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            profiler = _ACTIVE
+            if profiler is None:
+                return func(*args, **kwargs)
+            with _Span(profiler, span_name, None):
+                return func(*args, **kwargs)
+
+        return wrapped
+
+    return decorator
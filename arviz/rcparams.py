@@ -0,0 +1,264 @@
+"""ArviZ rcparams. Based on matplotlib's implementation.
+
+Settings are read, in increasing order of priority, from the defaults below, from the
+first ``arvizrc`` file found and from ``ARVIZ_<KEY>`` environment variables, where
+``<KEY>`` is the upper case key with dots replaced by underscores, for example
+``ARVIZ_STATS_N_JOBS=4``.
+
+The ``arvizrc`` file is searched in:
+
+1. The path given in the ``ARVIZ_RCFILE`` environment variable.
+2. ``arvizrc`` in the current working directory.
+3. ``~/.arviz/arvizrc``.
+
+It contains one ``key : value`` setting per line, ``#`` starts a comment.
+"""
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+import logging
+import os
+import pprint
+
+_log = logging.getLogger(__name__)
+
+STORAGE_DTYPES = ("float64", "float32", "int16")
+
+
+def _validate_boolean(value):
+    """Validate value is a boolean, also accepts its string representations."""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("true", "yes", "on", "1"):
+            return True
+        if value in ("false", "no", "off", "0"):
+            return False
+        raise ValueError("Could not convert {!r} to boolean".format(value))
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1):
+        return bool(value)
+    raise ValueError("Could not convert {!r} to boolean".format(value))
+
+
+def _validate_positive_int(value):
+    """Validate value is a natural number."""
+    try:
+        int_value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Could not convert {!r} to int".format(value))
+    if int_value != float(value) or int_value < 1:
+        raise ValueError("Only positive integers are valid, got {!r}".format(value))
+    return int_value
+
+
+def _validate_n_jobs(value):
+    """Validate value is a positive integer or -1, meaning all the available cores."""
+    if str(value).strip() == "-1":
+        return -1
+    return _validate_positive_int(value)
+
+
+def _make_validate_choice(accepted_values):
+    """Validate value is in accepted_values."""
+
+    def validate_choice(value):
+        if isinstance(value, str):
+            value = value.strip().lower()
+        if value not in accepted_values:
+            raise ValueError(
+                "{!r} is not one of {}".format(value, ", ".join(map(repr, accepted_values)))
+            )
+        return value
+
+    return validate_choice
+
+
+defaultParams = {  # pylint: disable=invalid-name
+    "cache.enabled": (False, _validate_boolean),
+    "cache.max_bytes": (2 ** 28, _validate_positive_int),
+    "data.compress": (True, _validate_boolean),
+    "data.storage_dtype": ("float64", _make_validate_choice(STORAGE_DTYPES)),
+    "kde.grid_size": (200, _validate_positive_int),
+    # the numba kernels differ from NumPy by rounding errors, see arviz.stats.kernels
+    "numba.enabled": (False, _validate_boolean),
+    "plot.trace_downsample_threshold": (20000, _validate_positive_int),
+    "stats.chunk_size": (1000, _validate_positive_int),
+    "stats.n_jobs": (1, _validate_n_jobs),
+}
+
+
+class RcParams(MutableMapping):
+    """Class to contain ArviZ default parameters.
+
+    It is implemented as a dict with validation when setting items.
+    """
+
+    validate = {key: validate_fun for key, (_, validate_fun) in defaultParams.items()}
+
+    # validate values on the way in
+    def __init__(self, *args, **kwargs):
+        self._underlying_storage = {}
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, val):
+        """Add validation to __setitem__ function."""
+        try:
+            validate_fun = self.validate[key]
+        except KeyError:
+            raise KeyError(
+                "{} is not a valid rc parameter (see rcParams.keys() for "
+                "a list of valid parameters)".format(key)
+            )
+        try:
+            cval = validate_fun(val)
+        except ValueError as verr:
+            raise ValueError("Key {}: {}".format(key, str(verr)))
+        self._underlying_storage[key] = cval
+
+    def __getitem__(self, key):
+        """Use underlying dict's getitem method."""
+        return self._underlying_storage[key]
+
+    def __delitem__(self, key):
+        """Raise TypeError if someone ever tries to delete a key from RcParams."""
+        raise TypeError("RcParams keys cannot be deleted")
+
+    def __len__(self):
+        """Return number of keys."""
+        return len(self._underlying_storage)
+
+    def __iter__(self):
+        """Iterate over the keys in sorted order."""
+        return iter(sorted(self._underlying_storage))
+
+    def __repr__(self):
+        """Customize repr of RcParams objects."""
+        class_name = self.__class__.__name__
+        indent = len(class_name) + 1
+        repr_split = pprint.pformat(
+            dict(self._underlying_storage), indent=1, width=80 - indent
+        ).split("\n")
+        repr_indented = ("\n" + " " * indent).join(repr_split)
+        return "{}({})".format(class_name, repr_indented)
+
+    def __str__(self):
+        """Customize str/print of RcParams objects."""
+        return "\n".join(map("{0[0]:<22}: {0[1]}".format, sorted(self.items())))
+
+    def copy(self):
+        """Get a copy of the RcParams object."""
+        return dict(self._underlying_storage)
+
+
+def get_arviz_rcfile():
+    """Get arvizrc file.
+
+    Returns
+    -------
+    str or None
+        Path of the first ``arvizrc`` file found, see module docstring for the
+        locations searched.
+    """
+    candidates = [
+        os.environ.get("ARVIZ_RCFILE"),
+        os.path.join(os.getcwd(), "arvizrc"),
+        os.path.join(os.path.expanduser("~"), ".arviz", "arvizrc"),
+    ]
+    for fname in candidates:
+        if fname and os.path.isfile(fname):
+            return fname
+    return None
+
+
+def read_rcfile(fname):
+    """Return :class:`arviz.RcParams` from the contents of the given file.
+
+    Unlike `rc_params`, the defaults are not used for the keys missing in the file.
+    """
+    config = RcParams()
+    with open(fname, "r") as rcfile:
+        for line_no, line in enumerate(rcfile, 1):
+            strippedline = line.split("#", 1)[0].strip()
+            if not strippedline:
+                continue
+            tup = strippedline.split(":", 1)
+            if len(tup) != 2:
+                raise ValueError(
+                    "Missing colon in file {}, line {} ({!r})".format(fname, line_no, line)
+                )
+            key, val = tup[0].strip(), tup[1].strip()
+            if key in config:
+                _log.warning("Duplicate key in file %s, line %s (%r)", fname, line_no, line)
+            config[key] = val
+    return config
+
+
+def _read_environ():
+    """Return the settings defined as ``ARVIZ_<KEY>`` environment variables."""
+    config = RcParams()
+    for key in defaultParams:
+        env_name = "ARVIZ_{}".format(key.replace(".", "_").upper())
+        if env_name in os.environ:
+            config[key] = os.environ[env_name]
+    return config
+
+
+def rc_params(ignore_files=False):
+    """Read and validate the ArviZ defaults, arvizrc file and environment variables.
+
+    Parameters
+    ----------
+    ignore_files : bool, optional
+        Return the default values without reading the arvizrc file nor the environment.
+
+    Returns
+    -------
+    RcParams
+    """
+    defaults = RcParams([(key, default) for key, (default, _) in defaultParams.items()])
+    if ignore_files:
+        return defaults
+    fname = get_arviz_rcfile()
+    if fname is not None:
+        defaults.update(read_rcfile(fname))
+    defaults.update(_read_environ())
+    return defaults
+
+
+rcParams = rc_params()  # pylint: disable=invalid-name
+
+
+@contextmanager
+def rc_context(rc=None, fname=None):
+    """
+    Return a context manager for managing rc settings.
+
+    Parameters
+    ----------
+    rc : dict, optional
+        Mapping containing the rcParams to modify temporally.
+    fname : str, optional
+        Filename of the file containing the rcParams to use inside the rc_context.
+
+    Examples
+    --------
+    Use the numba kernels in the computation of the kdes of a plot::
+
+        import arviz as az
+        with az.rc_context(rc={"numba.enabled": True}):
+            az.plot_density(data)
+
+    The rcParams are restored when leaving the context manager, even if an
+    exception is raised inside it.
+    """
+    orig = rcParams.copy()
+    try:
+        if fname:
+            rcParams.update(read_rcfile(fname))
+        if rc:
+            rcParams.update(rc)
+        yield
+    finally:
+        # update the underlying dict, to avoid running the validators again
+        rcParams._underlying_storage.update(orig)  # pylint: disable=protected-access
@@ -3,6 +3,8 @@
 from .stats_utils import *
 from .stats import *
 from .diagnostics import *
+from .streaming import *
+from .cache import *
 
 
 __all__ = [
@@ -10,6 +12,7 @@ __all__ = [
     "compare",
     "hpd",
     "loo",
+    "posterior_intervals",
     "psislw",
     "r2_score",
     "summary",
@@ -19,6 +22,10 @@ __all__ = [
     "rhat",
     "mcse",
     "geweke",
+    "rank_histogram",
     "autocorr",
     "autocov",
+    "StreamingDiagnostics",
+    "clear_cache",
+    "cache_info",
 ]
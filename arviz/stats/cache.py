@@ -0,0 +1,271 @@
+"""In memory cache of densities and intervals shared by the plots.
+
+Reports often call several plots on the same posterior, ``plot_posterior``,
+``plot_density``, ``plot_forest(kind="ridgeplot")``, ``plot_violin`` and ``plot_trace``
+all compute the KDE and hpd intervals of the same samples. When
+``rcParams["cache.enabled"]`` is True, the functions decorated with ``cached`` store
+their results keyed by a fingerprint of the input array and the value of every other
+argument, so that each density or interval is only computed once.
+
+The fingerprint identifies the memory of the array instead of hashing all its values, so
+that looking up a result does not depend on the number of samples. Results are shared
+between calls on the same array or on views of the same memory, like the samples of a
+variable selected from the posterior, but not between copies. The results of an array
+are removed when it is garbage collected. Modifying an array in place is only detected
+if the modified values are part of the sampled checksum, call :func:`clear_cache` after
+modifying the samples of a cached computation.
+
+The least recently used results are evicted when the cache holds more than
+``rcParams["cache.max_bytes"]`` bytes. They are only kept in memory, there is no cache
+directory, as the fingerprints identify arrays of the running process and can not be
+matched by another one.
+
+Examples
+--------
+Share the densities and intervals of the plots of a report::
+
+    import arviz as az
+    data = az.load_arviz_data("centered_eight")
+    with az.rc_context(rc={"cache.enabled": True}):
+        az.plot_posterior(data)
+        az.plot_density(data)
+        az.plot_violin(data)
+    az.cache_info()
+    az.clear_cache()
+
+"""
+from collections import OrderedDict
+import functools
+import inspect
+import threading
+import weakref
+
+import numpy as np
+
+from ..rcparams import rcParams
+
+__all__ = ["clear_cache", "cache_info"]
+
+# number of elements used in the checksum of the fingerprints
+_N_SAMPLES = 1024
+
+
+class _LRUCache:
+    """Thread safe mapping evicting the least recently used items above a size in bytes."""
+
+    def __init__(self):
+        self._items = OrderedDict()
+        # keys stored for each array owner, by id
+        self._owner_keys = {}
+        # reentrant, the finalizers calling forget may run in a garbage collection triggered
+        # while the lock is held
+        self._lock = threading.RLock()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the value stored for key or None, and mark it as recently used."""
+        with self._lock:
+            try:
+                value, _ = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, n_bytes, max_bytes, owner_id=None):
+        """Store value and evict the oldest items until the cache fits in max_bytes.
+
+        The item is removed with the other items of `owner_id` by :meth:`forget`.
+        """
+        if n_bytes > max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.n_bytes -= self._items.pop(key)[1]
+            if owner_id is not None:
+                if owner_id not in self._owner_keys:
+                    return
+                self._owner_keys[owner_id].add(key)
+            self._items[key] = (value, n_bytes)
+            self.n_bytes += n_bytes
+            while self.n_bytes > max_bytes:
+                _, (_, evicted_bytes) = self._items.popitem(last=False)
+                self.n_bytes -= evicted_bytes
+
+    def watch(self, owner):
+        """Call :meth:`forget` with the id of owner when it is garbage collected."""
+        owner_id = id(owner)
+        with self._lock:
+            if owner_id in self._owner_keys:
+                return
+            self._owner_keys[owner_id] = set()
+        weakref.finalize(owner, self.forget, owner_id)
+
+    def forget(self, owner_id):
+        """Remove the items stored for an array owner."""
+        with self._lock:
+            for key in self._owner_keys.pop(owner_id, ()):
+                item = self._items.pop(key, None)
+                if item is not None:
+                    self.n_bytes -= item[1]
+
+    def clear(self):
+        """Remove all the items and reset the statistics."""
+        with self._lock:
+            self._items.clear()
+            for keys in self._owner_keys.values():
+                keys.clear()
+            self.n_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        """Return the number of items stored."""
+        return len(self._items)
+
+
+_CACHE = _LRUCache()
+
+
+def clear_cache():
+    """Remove all the densities and intervals stored in the cache.
+
+    See ``rcParams["cache.enabled"]`` to enable the cache.
+    """
+    _CACHE.clear()
+
+
+def cache_info():
+    """Return the statistics of the cache of densities and intervals.
+
+    Returns
+    -------
+    dict
+        Number of ``hits`` and ``misses`` since the cache was last cleared, number of
+        ``entries`` stored, ``n_bytes`` used by them and ``max_bytes`` allowed.
+    """
+    return {
+        "hits": _CACHE.hits,
+        "misses": _CACHE.misses,
+        "entries": len(_CACHE),
+        "n_bytes": _CACHE.n_bytes,
+        "max_bytes": rcParams["cache.max_bytes"],
+    }
+
+
+def _owner(ary):
+    """Return the array owning the memory of ary, following the bases of the views."""
+    while isinstance(ary.base, np.ndarray):
+        ary = ary.base
+    return ary
+
+
+def _fingerprint(ary):
+    """Fingerprint an array in a time that does not depend on its size.
+
+    The fingerprint is made of the id of the array owning the memory, the address, shape,
+    strides and dtype of the view, and a checksum of at most ``_N_SAMPLES`` evenly spaced
+    elements. The owner is watched by the cache so that its results are removed before its
+    id can be reused.
+
+    Return None for object arrays, whose bytes are pointers and not the values.
+    """
+    ary = np.asarray(ary)
+    if ary.dtype.hasobject:
+        return None
+    owner = _owner(ary)
+    _CACHE.watch(owner)
+    sample = ary.reshape(-1) if ary.size <= _N_SAMPLES else ary.flat[_sample_indices(ary.size)]
+    return (
+        id(owner),
+        ary.__array_interface__["data"][0],
+        ary.shape,
+        ary.strides,
+        ary.dtype.str,
+        hash(np.ascontiguousarray(sample).tobytes()),
+    )
+
+
+def _sample_indices(size):
+    """Indices of ``_N_SAMPLES`` elements evenly spaced in an array of the given size."""
+    return np.linspace(0, size - 1, _N_SAMPLES).astype(np.intp)
+
+
+def _freeze(value):
+    """Convert an argument to a hashable key, raise TypeError if it can not be converted."""
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("Object arrays can not be part of a key")
+        # only the first argument is fingerprinted, the contents of other arrays are used
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _copy(value):
+    """Copy arrays so that callers can not modify the cached results."""
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return value
+
+
+def _n_bytes(value):
+    """Approximate memory used by a result."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_n_bytes(item) for item in value)
+    return 8
+
+
+def cached(rc_keys=()):
+    """Cache the results of a function of an array when ``rcParams["cache.enabled"]``.
+
+    The key is the fingerprint of the first argument, which must be array_like, the value of
+    every other argument including the defaults and the value of the `rc_keys` rcParams the
+    function depends on. Calls with unhashable arguments or object arrays are not cached.
+    The arrays returned are copies of the cached ones.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            if not rcParams["cache.enabled"]:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.values())
+            fingerprint = _fingerprint(arguments[0])
+            try:
+                key = (
+                    (func.__module__, func.__qualname__, fingerprint)
+                    + _freeze(arguments[1:])
+                    + tuple(rcParams[rc_key] for rc_key in rc_keys)
+                )
+                hash(key)
+            except TypeError:
+                fingerprint = None
+            if fingerprint is None:
+                return func(*args, **kwargs)
+            result = _CACHE.get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                _CACHE.put(
+                    key, result, _n_bytes(result), rcParams["cache.max_bytes"], fingerprint[0]
+                )
+            return _copy(result)
+
+        return wrapped
+
+    return decorator
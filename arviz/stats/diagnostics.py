@@ -1,11 +1,14 @@
 # pylint: disable=too-many-lines, too-many-function-args, redefined-outer-name
 """Diagnostic functions for ArviZ."""
 from collections.abc import Sequence
+import functools
 import warnings
 
 import numpy as np
 import pandas as pd
 from scipy import stats
+from scipy.special import ndtri
+import xarray as xr
 
 from .stats_utils import (
     rint as _rint,
@@ -14,11 +17,16 @@ from .stats_utils import (
     not_valid as _not_valid,
     wrap_xarray_ufunc as _wrap_xarray_ufunc,
 )
+from . import kernels as _kernels
 from ..data import convert_to_dataset
 from ..utils import _var_names
+from ..profiling import span as _span
 
 
-__all__ = ["bfmi", "effective_sample_size", "ess", "rhat", "mcse", "geweke"]
+__all__ = ["bfmi", "effective_sample_size", "ess", "rhat", "mcse", "geweke", "rank_histogram"]
+
+# ess methods that are vectorized over the dimensions other than chain and draw
+_BATCHED_ESS_METHODS = ("bulk", "folded", "mad", "z_scale")
 
 
 def bfmi(data):
@@ -248,8 +256,13 @@ def ess(data, *, var_names=None, method="bulk", relative=False, prob=None):
 
     dataset = dataset if var_names is None else dataset[var_names]
 
-    ufunc_kwargs = {"ravel": False}
     func_kwargs = {"relative": relative} if prob is None else {"prob": prob, "relative": relative}
+    if method in _BATCHED_ESS_METHODS:
+        # rank normalize all the parameters of each variable at once
+        return xr.apply_ufunc(
+            ess_func, dataset, input_core_dims=(("chain", "draw"),), kwargs=func_kwargs
+        )
+    ufunc_kwargs = {"ravel": False}
     return _wrap_xarray_ufunc(ess_func, dataset, ufunc_kwargs=ufunc_kwargs, func_kwargs=func_kwargs)
 
 
@@ -356,11 +369,8 @@ def rhat(data, *, var_names=None, method="rank"):
 
     dataset = dataset if var_names is None else dataset[var_names]
 
-    ufunc_kwargs = {"ravel": False}
-    func_kwargs = {}
-    return _wrap_xarray_ufunc(
-        rhat_func, dataset, ufunc_kwargs=ufunc_kwargs, func_kwargs=func_kwargs
-    )
+    # the rhat functions are vectorized over the dimensions other than chain and draw
+    return xr.apply_ufunc(rhat_func, dataset, input_core_dims=(("chain", "draw"),))
 
 
 def mcse(data, *, var_names=None, method="mean", prob=None):
@@ -491,9 +501,6 @@ def geweke(ary, first=0.1, last=0.5, intervals=20):
     if first + last >= 1:
         raise ValueError("Invalid intervals for Geweke convergence analysis", (first, last))
 
-    # Initialize list of z-scores
-    zscores = []
-
     # Last index value
     end = len(ary) - 1
 
@@ -503,6 +510,13 @@ def geweke(ary, first=0.1, last=0.5, intervals=20):
     # Calculate starting indices
     start_indices = np.linspace(0, last_start_idx, num=intervals, endpoint=True, dtype=int)
 
+    if _kernels.use_kernels():
+        zscores = _kernels.geweke_zscores(np.asarray(ary, dtype=float), start_indices, first, last)
+        return np.column_stack((start_indices, zscores))
+
+    # Initialize list of z-scores
+    zscores = []
+
     # Loop over start indices
     for start in start_indices:
         # Calculate slices
@@ -517,6 +531,50 @@ def geweke(ary, first=0.1, last=0.5, intervals=20):
     return np.array(zscores)
 
 
+def rank_histogram(ary, bins=None):
+    """Compute the histograms of the ranks of each chain, ranked over all the chains.
+
+    The draws of every parameter are ranked at once over their last two dimensions,
+    (chain, draw), and the ranks of all the chains of all the parameters are counted with a
+    single ``np.bincount``. The histograms are uniform if all the chains target the same
+    posterior, see :func:`arviz.plot_rank`.
+
+    Parameters
+    ----------
+    ary : array-like
+        Array of shape (..., chain, draw), usually (param, chain, draw).
+    bins : int, sequence of scalars or str, optional
+        Number of bins, bin edges or binning strategy passed to ``np.histogram_bin_edges``,
+        the bins span the range of ranks ``(0, chain * draw)``. Defaults to Sturges' formula
+        with the logarithm of the number of draws doubled, ``ceil(2 * log2(draw)) + 1``,
+        like :func:`arviz.plot_rank`.
+
+    Returns
+    -------
+    counts : np.ndarray
+        Number of draws in each bin, array of shape (..., chain, bin).
+    bin_edges : np.ndarray
+        Edges of the bins, array of length bin + 1.
+    """
+    ary = np.atleast_2d(np.asarray(ary))
+    *batch_shape, n_chains, n_draws = ary.shape
+    size = n_chains * n_draws
+    if bins is None:
+        bins = int(np.ceil(2 * np.log2(n_draws)) + 1)
+    ranks = _rank(ary).reshape(-1, n_chains, n_draws)
+    bin_edges = np.histogram_bin_edges(ranks, bins=bins, range=(0, size))
+    n_bins = len(bin_edges) - 1
+    # the average ranks are multiples of 1/2, look up the bin of each possible rank, the last
+    # bin includes its right edge like in np.histogram
+    bin_of_rank = np.searchsorted(bin_edges, np.arange(2 * size + 1) / 2, side="right") - 1
+    np.minimum(bin_of_rank, n_bins - 1, out=bin_of_rank)
+    bin_idx = bin_of_rank[(2 * ranks).astype(np.intp)]
+    # offset the bins of each (param, chain) so that they are all counted at once
+    offsets = n_bins * np.arange(ranks.shape[0] * n_chains).reshape(-1, n_chains, 1)
+    counts = np.bincount((bin_idx + offsets).ravel(), minlength=offsets.size * n_bins)
+    return counts.reshape(tuple(batch_shape) + (n_chains, n_bins)), bin_edges
+
+
 def ks_summary(pareto_tail_indices):
     """Display a summary of Pareto tail indices.
 
@@ -572,60 +630,120 @@ def _bfmi(energy):
     return num / den
 
 
+def _rank(ary):
+    """Rank the values of an array over their last two dimensions, (chain, draw).
+
+    The values are ranked independently for each index of the leading dimensions. All the
+    values of 1D arrays are ranked together. Tied values get their average rank, like
+    ``scipy.stats.rankdata(method="average")``.
+
+    Parameters
+    ----------
+    ary : np.ndarray
+        Array of shape (..., chain, draw).
+
+    Returns
+    -------
+    np.ndarray
+        Ranks starting at 1, same shape as `ary`.
+    """
+    ary = np.asarray(ary)
+    shape = ary.shape
+    samples = ary.reshape(shape[:-2] + (-1,)) if ary.ndim > 1 else ary
+    size = samples.shape[-1]
+    # tied values get the same rank, the sort needs not be stable
+    order = np.argsort(samples, axis=-1)
+    sorted_samples = np.take_along_axis(samples, order, axis=-1)
+    # number the groups of tied values over all the rows, each row starts a new group
+    is_first = np.ones(samples.shape, dtype=bool)
+    is_first[..., 1:] = sorted_samples[..., 1:] != sorted_samples[..., :-1]
+    is_first = is_first.ravel()
+    starts = np.flatnonzero(is_first)
+    ends = np.append(starts[1:], is_first.size)
+    # average of the positions in its row of the values of each group, starting at 1
+    mean_rank = (starts + ends + 1) / 2 - (starts - starts % size)
+    rank = np.empty(samples.shape)
+    np.put_along_axis(
+        rank, order, mean_rank[np.cumsum(is_first) - 1].reshape(samples.shape), axis=-1
+    )
+    return rank.reshape(shape)
+
+
 def _z_scale(ary):
     """Calculate z_scale.
 
+    The values are rank normalized over their last two dimensions, (chain, draw),
+    independently for each index of the leading dimensions, see `_rank`.
+
     Parameters
     ----------
     ary : np.ndarray
+        Array of shape (..., chain, draw).
 
     Returns
     -------
     np.ndarray
     """
     ary = np.asarray(ary)
-    size = ary.size
-    rank = stats.rankdata(ary, method="average")
-    z = stats.norm.ppf((rank - 0.5) / size)
-    z = z.reshape(ary.shape)
-    return z
+    size = ary.shape[-1] * ary.shape[-2] if ary.ndim > 1 else ary.size
+    return ndtri((_rank(ary) - 0.5) / size)
 
 
 def _split_chains(ary):
-    """Split and stack chains."""
-    ary = np.asarray(ary)
-    if len(ary.shape) > 1:
-        _, n_draw = ary.shape
-    else:
-        ary = np.atleast_2d(ary)
-        _, n_draw = ary.shape
-    half = n_draw // 2
-    return np.vstack((ary[:, :half], ary[:, -half:]))
+    """Split and stack chains of an array of shape (..., chain, draw)."""
+    ary = np.atleast_2d(ary)
+    half = ary.shape[-1] // 2
+    return np.concatenate((ary[..., :half], ary[..., -half:]), axis=-2)
 
 
 def _z_fold(ary):
     """Fold and z-scale values."""
-    ary = np.asarray(ary)
-    ary = abs(ary - np.median(ary))
+    ary = np.atleast_2d(ary)
+    ary = abs(ary - np.median(ary, axis=(-2, -1), keepdims=True))
     ary = _z_scale(ary)
     return ary
 
 
+def _batched(min_chains):  # noqa: D202
+    """Mask the invalid parameters of a diagnostic of arrays of shape (..., chain, draw).
+
+    The result is NaN for the parameters with NaN values, or for all of them if there are
+    less than 4 draws or less than `min_chains` chains.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(ary, *args, **kwargs):
+            ary = np.atleast_2d(ary)
+            invalid = _not_valid(
+                np.moveaxis(ary, (-2, -1), (0, 1)),
+                nan_kwargs=dict(axis=(0, 1)),
+                shape_kwargs=dict(min_draws=4, min_chains=min_chains),
+            )
+            if np.all(invalid):
+                return np.full(ary.shape[:-2], np.nan)[()]
+            return np.where(invalid, np.nan, func(ary, *args, **kwargs))[()]
+
+        return wrapped
+
+    return decorator
+
+
 def _rhat(ary):
-    """Compute the rhat for a 2d array."""
-    ary = np.asarray(ary, dtype=float)
-    if _not_valid(ary, check_shape=False):
-        return np.nan
-    _, num_samples = ary.shape
+    """Compute the rhat for each (chain, draw) array of an array of shape (..., chain, draw)."""
+    ary = np.atleast_2d(np.asarray(ary, dtype=float))
+    if _not_valid(ary, check_shape=False, nan_kwargs=dict(axis=(-2, -1))).all():
+        return np.full(ary.shape[:-2], np.nan)[()]
+    num_samples = ary.shape[-1]
 
     # Calculate chain mean
-    chain_mean = np.mean(ary, axis=1)
+    chain_mean = np.mean(ary, axis=-1)
     # Calculate chain variance
-    chain_var = np.var(ary, axis=1, ddof=1)
+    chain_var = np.var(ary, axis=-1, ddof=1)
     # Calculate between-chain variance
-    between_chain_variance = num_samples * np.var(chain_mean, ddof=1)
+    between_chain_variance = num_samples * np.var(chain_mean, axis=-1, ddof=1)
     # Calculate within-chain variance
-    within_chain_variance = np.mean(chain_var)
+    within_chain_variance = np.mean(chain_var, axis=-1)
     # Estimate of marginal posterior variance
     rhat_value = np.sqrt(
         (between_chain_variance / within_chain_variance + num_samples - 1) / (num_samples)
@@ -633,51 +751,40 @@ def _rhat(ary):
     return rhat_value
 
 
+@_batched(min_chains=2)
 def _rhat_rank(ary):
     """Compute the rank normalized rhat for 2d array.
 
     Computation follows https://arxiv.org/abs/1903.08008
     """
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=2)):
-        return np.nan
     split_ary = _split_chains(ary)
     rhat_bulk = _rhat(_z_scale(split_ary))
 
-    split_ary_folded = abs(split_ary - np.median(split_ary))
-    rhat_tail = _rhat(_z_scale(split_ary_folded))
+    rhat_tail = _rhat(_z_fold(split_ary))
 
-    rhat_rank = max(rhat_bulk, rhat_tail)
+    rhat_rank = np.maximum(rhat_bulk, rhat_tail)
     return rhat_rank
 
 
+@_batched(min_chains=2)
 def _rhat_folded(ary):
     """Calculate split-Rhat for folded z-values."""
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=2)):
-        return np.nan
     ary = _z_fold(_split_chains(ary))
     return _rhat(ary)
 
 
+@_batched(min_chains=2)
 def _rhat_z_scale(ary):
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=2)):
-        return np.nan
     return _rhat(_z_scale(_split_chains(ary)))
 
 
+@_batched(min_chains=2)
 def _rhat_split(ary):
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=2)):
-        return np.nan
     return _rhat(_split_chains(ary))
 
 
+@_batched(min_chains=2)
 def _rhat_identity(ary):
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=2)):
-        return np.nan
     return _rhat(ary)
 
 
@@ -698,17 +805,35 @@ def _ess(ary, relative=False):
     if n_chain > 1:
         var_plus += np.var(chain_mean, ddof=1)
 
+    acov_mean = np.mean(acov, axis=0)
+    if _kernels.use_kernels():
+        rho_hat_t, max_t = _kernels.geyer_truncation_row(acov_mean, mean_var, var_plus)
+    else:
+        rho_hat_t, max_t = _geyer_truncation(acov_mean, mean_var, var_plus)
+
+    ess = n_chain * n_draw
+    tau_hat = -1.0 + 2.0 * np.sum(rho_hat_t[: max_t + 1]) + np.sum(rho_hat_t[max_t + 1 : max_t + 2])
+    tau_hat = max(tau_hat, 1 / np.log10(ess))
+    ess = (1 if relative else ess) / tau_hat
+    if np.isnan(rho_hat_t).any():
+        ess = np.nan
+    return ess
+
+
+def _geyer_truncation(acov_mean, mean_var, var_plus):
+    """Truncate the autocorrelations with Geyer's initial positive and monotone sequences."""
+    n_draw = len(acov_mean)
     rho_hat_t = np.zeros(n_draw)
     rho_hat_even = 1.0
     rho_hat_t[0] = rho_hat_even
-    rho_hat_odd = 1.0 - (mean_var - np.mean(acov[:, 1])) / var_plus
+    rho_hat_odd = 1.0 - (mean_var - acov_mean[1]) / var_plus
     rho_hat_t[1] = rho_hat_odd
 
     # Geyer's initial positive sequence
     t = 1
     while t < (n_draw - 3) and (rho_hat_even + rho_hat_odd) > 0.0:
-        rho_hat_even = 1.0 - (mean_var - np.mean(acov[:, t + 1])) / var_plus
-        rho_hat_odd = 1.0 - (mean_var - np.mean(acov[:, t + 2])) / var_plus
+        rho_hat_even = 1.0 - (mean_var - acov_mean[t + 1]) / var_plus
+        rho_hat_odd = 1.0 - (mean_var - acov_mean[t + 2]) / var_plus
         if (rho_hat_even + rho_hat_odd) >= 0:
             rho_hat_t[t + 1] = rho_hat_even
             rho_hat_t[t + 2] = rho_hat_odd
@@ -725,23 +850,25 @@ def _ess(ary, relative=False):
             rho_hat_t[t + 1] = (rho_hat_t[t - 1] + rho_hat_t[t]) / 2.0
             rho_hat_t[t + 2] = rho_hat_t[t + 1]
         t += 2
+    return rho_hat_t, max_t
 
-    ess = n_chain * n_draw
-    tau_hat = -1.0 + 2.0 * np.sum(rho_hat_t[: max_t + 1]) + np.sum(rho_hat_t[max_t + 1 : max_t + 2])
-    tau_hat = max(tau_hat, 1 / np.log10(ess))
-    ess = (1 if relative else ess) / tau_hat
-    if np.isnan(rho_hat_t).any():
-        ess = np.nan
-    return ess
+
+def _ess_rows(ary, relative=False):
+    """Compute the effective sample size of each (chain, draw) array of an array.
+
+    The array has shape (..., chain, draw).
+    """
+    ess = np.empty(ary.shape[:-2])
+    for idx in np.ndindex(ess.shape):
+        ess[idx] = _ess(ary[idx], relative=relative)
+    return ess[()]
 
 
+@_batched(min_chains=1)
 def _ess_bulk(ary, relative=False):
     """Compute the effective sample size for the bulk."""
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=1)):
-        return np.nan
     z_scaled = _z_scale(_split_chains(ary))
-    ess_bulk = _ess(z_scaled, relative=relative)
+    ess_bulk = _ess_rows(z_scaled, relative=relative)
     return ess_bulk
 
 
@@ -794,20 +921,16 @@ def _ess_quantile(ary, prob, relative=False):
     return _ess(_split_chains(iquantile), relative=relative)
 
 
+@_batched(min_chains=1)
 def _ess_z_scale(ary, relative=False):
     """Calculate ess for z-scaLe."""
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=1)):
-        return np.nan
-    return _ess(_z_scale(_split_chains(ary)), relative=relative)
+    return _ess_rows(_z_scale(_split_chains(ary)), relative=relative)
 
 
+@_batched(min_chains=1)
 def _ess_folded(ary, relative=False):
     """Calculate split-ess for folded data."""
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=1)):
-        return np.nan
-    return _ess(_z_fold(_split_chains(ary)), relative=relative)
+    return _ess_rows(_z_fold(_split_chains(ary)), relative=relative)
 
 
 def _ess_median(ary, relative=False):
@@ -818,15 +941,13 @@ def _ess_median(ary, relative=False):
     return _ess_quantile(ary, 0.5, relative=relative)
 
 
+@_batched(min_chains=1)
 def _ess_mad(ary, relative=False):
     """Calculate split-ess for mean absolute deviance."""
-    ary = np.asarray(ary)
-    if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=1)):
-        return np.nan
-    ary = abs(ary - np.median(ary))
-    ary = ary <= np.median(ary)
+    ary = abs(ary - np.median(ary, axis=(-2, -1), keepdims=True))
+    ary = ary <= np.median(ary, axis=(-2, -1), keepdims=True)
     ary = _z_scale(_split_chains(ary))
-    return _ess(ary, relative=relative)
+    return _ess_rows(ary, relative=relative)
 
 
 def _ess_identity(ary, relative=False):
@@ -910,6 +1031,11 @@ def _mc_error(ary, batches=5, circular=False):
     mc_error : float
         Simulation standard error
     """
+    if not circular and _kernels.use_kernels():
+        ary = np.asarray(ary, dtype=float)
+        mc_error = _kernels.mc_error_columns(ary.reshape(len(ary), -1), batches)
+        return mc_error.reshape(ary.shape[1:]) if ary.ndim > 1 else mc_error[0]
+
     if ary.ndim > 1:
 
         dims = np.shape(ary)
@@ -942,45 +1068,68 @@ def _mc_error(ary, batches=5, circular=False):
 def _multichain_statistics(ary):
     """Calculate efficiently multichain statistics for summary.
 
+    The draws of all the parameters are rank normalized at once, the other statistics are
+    computed for each parameter.
+
     Parameters
     ----------
     ary : numpy.ndarray
+        Array of shape (..., chain, draw).
 
     Returns
     -------
     tuple
         Order of return parameters is
             - mcse_mean, mcse_sd, ess_mean, ess_sd, ess_bulk, ess_tail, r_hat
+        Each one has the shape of the leading dimensions of `ary`.
     """
-    ary = np.atleast_2d(ary)
+    ary = np.atleast_2d(np.asarray(ary, dtype=float))
+    with _span("multichain.rank_normalize", elements=ary.size):
+        z_split = _z_scale(_split_chains(ary))
+        ary_folded = np.abs(ary - np.median(ary, axis=(-2, -1), keepdims=True))
+        z_split_folded = _z_scale(_split_chains(ary_folded))
+    statistics = np.empty((7,) + ary.shape[:-2])
+    for idx in np.ndindex(ary.shape[:-2]):
+        statistics[(slice(None),) + idx] = _multichain_statistics_row(
+            ary[idx], z_split[idx], z_split_folded[idx]
+        )
+    return tuple(statistic[()] for statistic in statistics)
+
+
+def _multichain_statistics_row(ary, z_split, z_split_folded):
+    """Calculate the multichain statistics of a (chain, draw) array given its z-scales."""
     if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=1)):
         return (np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan)
+    size = ary.size
     # ess mean
-    ess_mean_value = _ess_mean(ary)
+    with _span("multichain.ess_mean", elements=size):
+        ess_mean_value = _ess_mean(ary)
 
     # ess sd
-    ess_sd_value = _ess_sd(ary)
+    with _span("multichain.ess_sd", elements=size):
+        ess_sd_value = _ess_sd(ary)
 
     # ess bulk
-    z_split = _z_scale(_split_chains(ary))
-    ess_bulk_value = _ess(z_split)
+    with _span("multichain.ess_bulk", elements=size):
+        ess_bulk_value = _ess(z_split)
 
     # ess tail
-    quantile05, quantile95 = _quantile(ary, [0.05, 0.95])
-    iquantile05 = ary <= quantile05
-    quantile05_ess = _ess(_split_chains(iquantile05))
-    iquantile95 = ary <= quantile95
-    quantile95_ess = _ess(_split_chains(iquantile95))
-    ess_tail_value = min(quantile05_ess, quantile95_ess)
+    with _span("multichain.ess_tail", elements=size):
+        quantile05, quantile95 = _quantile(ary, [0.05, 0.95])
+        iquantile05 = ary <= quantile05
+        quantile05_ess = _ess(_split_chains(iquantile05))
+        iquantile95 = ary <= quantile95
+        quantile95_ess = _ess(_split_chains(iquantile95))
+        ess_tail_value = min(quantile05_ess, quantile95_ess)
 
     if _not_valid(ary, shape_kwargs=dict(min_draws=4, min_chains=2)):
         rhat_value = np.nan
     else:
         # r_hat
-        rhat_bulk = _rhat(z_split)
-        ary_folded = np.abs(ary - np.median(ary))
-        rhat_tail = _rhat(_z_scale(_split_chains(ary_folded)))
-        rhat_value = max(rhat_bulk, rhat_tail)
+        with _span("multichain.rhat", elements=size):
+            rhat_bulk = _rhat(z_split)
+            rhat_tail = _rhat(z_split_folded)
+            rhat_value = max(rhat_bulk, rhat_tail)
 
     # mcse_mean
     sd = np.std(ary, ddof=1)
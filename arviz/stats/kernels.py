@@ -0,0 +1,88 @@
+"""Optional numba kernels for the hot loops of diagnostics, PSIS and KDE.
+
+The kernels are defined in :mod:`arviz.stats.numba_kernels` and are used instead of the
+NumPy implementations in ``diagnostics.py``, ``stats.py`` and ``kdeplot.py`` when numba is
+installed and ``rcParams["numba.enabled"]`` is True, see :func:`use_kernels`. The number of
+threads is taken from ``rcParams["stats.n_jobs"]``.
+
+Neither numba nor the kernels are imported until they are used, accessing a kernel as an
+attribute of this module imports them.
+
+The kernels do not sum in the same order as NumPy, whose reductions use pairwise summation,
+so the results of ``psislw`` and ``mcse`` differ from the NumPy ones by rounding errors,
+with a relative difference of the order of ``1e-12``. This is why numba is disabled by
+default.
+"""
+import importlib
+import sys
+
+from ..rcparams import rcParams
+
+_KERNELS = (
+    "geyer_truncation_row",
+    "psislw_columns",
+    "mc_error_columns",
+    "geweke_zscores",
+    "linear_binning_rows",
+    "bilinear_binning",
+)
+
+# numba module once imported, False if it is not installed
+_NUMBA = None
+# number of numba threads set by the last call to use_kernels
+_N_THREADS = None
+
+
+def _import_numba():
+    """Import numba on first use, return None if it is not installed."""
+    global _NUMBA  # pylint: disable=global-statement
+    if _NUMBA is None:
+        try:
+            _NUMBA = importlib.import_module("numba")
+        except ImportError:
+            _NUMBA = False
+    return _NUMBA or None
+
+
+def use_kernels():
+    """Return True if the compiled kernels should be used.
+
+    It also sets the number of numba threads from ``rcParams["stats.n_jobs"]`` when it
+    changed since the last call.
+    """
+    global _N_THREADS  # pylint: disable=global-statement
+    if not rcParams["numba.enabled"]:
+        return False
+    numba = _import_numba()
+    if numba is None:
+        return False
+    n_jobs = rcParams["stats.n_jobs"]
+    max_threads = numba.config.NUMBA_NUM_THREADS
+    n_threads = max_threads if n_jobs == -1 else min(n_jobs, max_threads)
+    if n_threads != _N_THREADS:
+        numba.set_num_threads(n_threads)
+        _N_THREADS = n_threads
+    return True
+
+
+if sys.version_info < (3, 7) and _import_numba() is not None:
+    from .numba_kernels import (  # pylint: disable=unused-import
+        geyer_truncation_row,
+        psislw_columns,
+        mc_error_columns,
+        geweke_zscores,
+        linear_binning_rows,
+        bilinear_binning,
+    )
+
+
+def __getattr__(name):
+    if name not in _KERNELS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(".numba_kernels", __package__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_KERNELS))
@@ -0,0 +1,255 @@
+# pylint: disable=not-an-iterable, invalid-name
+"""Numba kernels for the hot loops of diagnostics and PSIS.
+
+The kernels are written in the subset of Python and NumPy supported by numba and, where
+independent series, columns or intervals are processed, compiled with ``parallel=True``
+to run them with ``prange``. This module imports numba, it is only imported through
+:mod:`arviz.stats.kernels` when the kernels are used, see
+:func:`arviz.stats.kernels.use_kernels`.
+"""
+import numba
+from numba import prange
+import numpy as np
+
+_EPS = np.finfo(float).eps  # pylint: disable=no-member
+
+
+@numba.jit(nopython=True, cache=True)
+def geyer_truncation_row(acov_mean, mean_var, var_plus):
+    """Autocorrelations of one series truncated with Geyer's initial sequences.
+
+    See ``arviz.stats.diagnostics._geyer_truncation``.
+
+    Parameters
+    ----------
+    acov_mean : 1D array
+        Autocovariance averaged over chains.
+    mean_var : float
+        Mean within chain variance.
+    var_plus : float
+        Pooled variance estimate.
+
+    Returns
+    -------
+    rho_hat_t : 1D array
+        Truncated autocorrelations.
+    max_t : int
+        Index of the last lag included in the initial positive sequence is ``max_t + 1``.
+    """
+    n_draw = len(acov_mean)
+    rho_hat_t = np.zeros(n_draw)
+    rho_hat_even = 1.0
+    rho_hat_t[0] = rho_hat_even
+    rho_hat_odd = 1.0 - (mean_var - acov_mean[1]) / var_plus
+    rho_hat_t[1] = rho_hat_odd
+
+    # Geyer's initial positive sequence
+    t = 1
+    while t < (n_draw - 3) and (rho_hat_even + rho_hat_odd) > 0.0:
+        rho_hat_even = 1.0 - (mean_var - acov_mean[t + 1]) / var_plus
+        rho_hat_odd = 1.0 - (mean_var - acov_mean[t + 2]) / var_plus
+        if (rho_hat_even + rho_hat_odd) >= 0:
+            rho_hat_t[t + 1] = rho_hat_even
+            rho_hat_t[t + 2] = rho_hat_odd
+        t += 2
+
+    max_t = t - 2
+    # improve estimation
+    if rho_hat_even > 0:
+        rho_hat_t[max_t + 1] = rho_hat_even
+    # Geyer's initial monotone sequence
+    t = 1
+    while t <= max_t - 2:
+        previous_pair = rho_hat_t[t - 1] + rho_hat_t[t]
+        if (rho_hat_t[t + 1] + rho_hat_t[t + 2]) > previous_pair:
+            rho_hat_t[t + 1] = previous_pair / 2.0
+            rho_hat_t[t + 2] = rho_hat_t[t + 1]
+        t += 2
+    return rho_hat_t, max_t
+
+
+@numba.jit(nopython=True, cache=True)
+def _logsumexp(ary):
+    """Logsumexp of a 1D array."""
+    ary_max = ary.max()
+    return np.log(np.exp(ary - ary_max).sum()) + ary_max
+
+
+@numba.jit(nopython=True, cache=True)
+def _gpdfit(ary):
+    """Estimate the parameters for the Generalized Pareto Distribution (GPD).
+
+    See ``arviz.stats.stats._gpdfit``.
+    """
+    prior_bs = 3
+    prior_k = 10
+    n = len(ary)
+    m_est = 30 + int(n ** 0.5)
+
+    b_ary = 1 - np.sqrt(m_est / (np.arange(1, m_est + 1) - 0.5))
+    b_ary /= prior_bs * ary[int(n / 4 + 0.5) - 1]
+    b_ary += 1 / ary[-1]
+
+    k_ary = np.empty(m_est)
+    for j in range(m_est):
+        k_ary[j] = np.log1p(-b_ary[j] * ary).mean()
+    len_scale = n * (np.log(-(b_ary / k_ary)) - k_ary - 1)
+    weights = np.empty(m_est)
+    for j in range(m_est):
+        weights[j] = 1 / np.exp(len_scale - len_scale[j]).sum()
+
+    # remove negligible weights
+    real_idxs = weights >= 10 * _EPS
+    weights = weights[real_idxs]
+    b_ary = b_ary[real_idxs]
+    # normalise weights
+    weights /= weights.sum()
+
+    # posterior mean for b
+    b_post = np.sum(b_ary * weights)
+    # estimate for k
+    k_post = np.log1p(-b_post * ary).mean()
+    # add prior for k_post
+    k_post = (n * k_post + prior_k * 0.5) / (n + prior_k)
+    sigma = -k_post / b_post
+
+    return k_post, sigma
+
+
+@numba.jit(nopython=True, cache=True)
+def _gpinv(probs, kappa, sigma):
+    """Inverse Generalized Pareto distribution function for probs in (0, 1)."""
+    if sigma <= 0:
+        return np.full_like(probs, np.nan)
+    if np.abs(kappa) < _EPS:
+        return -np.log1p(-probs) * sigma
+    return np.expm1(-kappa * np.log1p(-probs)) / kappa * sigma
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def psislw_columns(log_weights, cutoff_ind, cutoffmin, k_min):
+    """Pareto smooth each column of `log_weights` inplace and return the tail indices.
+
+    See ``arviz.stats.psislw``, of which this is the per-column loop.
+    """
+    cols = log_weights.shape[1]
+    kss = np.empty(cols)
+    for i in prange(cols):
+        x = log_weights[:, i]
+        # improve numerical accuracy
+        x -= np.max(x)
+        # sort the array
+        x_sort_ind = np.argsort(x)
+        # divide log weights into body and right tail
+        xcutoff = max(x[x_sort_ind[cutoff_ind]], cutoffmin)
+
+        expxcutoff = np.exp(xcutoff)
+        tailinds = np.where(x > xcutoff)[0]
+        x_tail = x[tailinds]
+        tail_len = len(x_tail)
+        if tail_len <= 4:
+            # not enough tail samples for gpdfit
+            k = np.inf
+        else:
+            # order of tail samples
+            x_tail_si = np.argsort(x_tail)
+            # fit generalized Pareto distribution to the right tail samples
+            x_tail = np.exp(x_tail) - expxcutoff
+            k, sigma = _gpdfit(x_tail[x_tail_si])
+
+            if k >= k_min:
+                # no smoothing if short tail or GPD fit failed
+                # compute ordered statistic for the fit
+                sti = np.arange(0.5, tail_len) / tail_len
+                smoothed_tail = np.log(_gpinv(sti, k, sigma) + expxcutoff)
+                # place the smoothed tail into the output array
+                x[tailinds[x_tail_si]] = smoothed_tail
+                # truncate smoothed values to the largest raw weight 0
+                x[x > 0] = 0
+        # renormalize weights
+        x -= _logsumexp(x)
+        # store tail index k
+        kss[i] = k
+    return kss
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def mc_error_columns(trace, batches):
+    """Batch means standard error of each column of a 2D (draw, column) array.
+
+    See ``arviz.stats.diagnostics._mc_error``, columns with NaN values return NaN.
+    """
+    n_draw, cols = trace.shape
+    size = n_draw // batches
+    out = np.empty(cols)
+    for i in prange(cols):
+        column = trace[:, i]
+        if np.isnan(column).any() or size == 0:
+            out[i] = np.nan
+        elif batches == 1:
+            out[i] = np.std(column) / np.sqrt(n_draw)
+        else:
+            means = np.empty(batches)
+            for j in range(batches):
+                means[j] = column[j * size : (j + 1) * size].mean()
+            out[i] = np.std(means) / np.sqrt(batches)
+    return out
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def geweke_zscores(ary, start_indices, first, last):
+    """Geweke z-score of each interval, see ``arviz.stats.diagnostics.geweke``."""
+    end = len(ary) - 1
+    zscores = np.empty(len(start_indices))
+    for i in prange(len(start_indices)):
+        start = start_indices[i]
+        first_slice = ary[start : start + int(first * (end - start))]
+        last_slice = ary[int(end - last * (end - start)) :]
+        zscores[i] = (first_slice.mean() - last_slice.mean()) / np.sqrt(
+            first_slice.var() + last_slice.var()
+        )
+    return zscores
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def linear_binning_rows(ary, n_bins, xmin, xmax):
+    """Linear binning of each row of a 2D array, see ``arviz.plots.kdeplot._fast_kde``.
+
+    Each value is split between its two closest points of a grid of `n_bins` points from
+    `xmin` to `xmax` of its row, values outside the grid are ignored.
+    """
+    n_series, n_samples = ary.shape
+    grid = np.zeros((n_series, n_bins))
+    for i in prange(n_series):
+        d_x = (xmax[i] - xmin[i]) / (n_bins - 1)
+        for j in range(n_samples):
+            value = ary[i, j]
+            # also skips NaN
+            if not xmin[i] <= value <= xmax[i]:
+                continue
+            position = (value - xmin[i]) / d_x if d_x > 0 else 0.0
+            lower = min(int(np.floor(position)), n_bins - 2)
+            weight = position - lower
+            grid[i, lower] += 1 - weight
+            grid[i, lower + 1] += weight
+    return grid
+
+
+@numba.jit(nopython=True, nogil=True, cache=True)
+def bilinear_binning(x_pos, y_pos, n_x, n_y):
+    """Bilinear binning of points given in grid units, see ``arviz.plots.kdeplot._fast_kde_2d``.
+
+    Each point is split between its four closest points of a (n_x, n_y) grid.
+    """
+    grid = np.zeros((n_x, n_y))
+    for k, x_k in enumerate(x_pos):
+        y_k = y_pos[k]
+        x_lower = min(max(int(np.floor(x_k)), 0), n_x - 2)
+        y_lower = min(max(int(np.floor(y_k)), 0), n_y - 2)
+        x_weight = x_k - x_lower
+        y_weight = y_k - y_lower
+        grid[x_lower, y_lower] += (1 - x_weight) * (1 - y_weight)
+        grid[x_lower, y_lower + 1] += (1 - x_weight) * y_weight
+        grid[x_lower + 1, y_lower] += x_weight * (1 - y_weight)
+        grid[x_lower + 1, y_lower + 1] += x_weight * y_weight
+    return grid
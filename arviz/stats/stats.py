@@ -12,12 +12,24 @@ import xarray as xr
 
 from ..data import convert_to_inference_data, convert_to_dataset
 from .diagnostics import _multichain_statistics, _mc_error, ess
+from . import kernels as _kernels
+from .cache import cached as _cached
 from .stats_utils import make_ufunc as _make_ufunc, logsumexp as _logsumexp
 from ..utils import _var_names
+from ..profiling import span as _span, traced as _traced
 
 _log = logging.getLogger(__name__)
 
-__all__ = ["compare", "hpd", "loo", "psislw", "r2_score", "summary", "waic"]
+__all__ = [
+    "compare",
+    "hpd",
+    "loo",
+    "posterior_intervals",
+    "psislw",
+    "r2_score",
+    "summary",
+    "waic",
+]
 
 
 def compare(
@@ -263,6 +275,7 @@ def _ic_matrix(ics, ic_i):
     return rows, cols, ic_i_val
 
 
+@_cached()
 def hpd(ary, credible_interval=0.94, circular=False):
     """
     Calculate highest posterior density (HPD) of array for given credible_interval.
@@ -273,9 +286,11 @@ def hpd(ary, credible_interval=0.94, circular=False):
     Parameters
     ----------
     x : Numpy array
-        An array containing posterior samples
-    credible_interval : float, optional
-        Credible interval to compute. Defaults to 0.94.
+        An array containing posterior samples. If it has more than one dimension, the first one
+        is taken as the sample dimension and the hpd of every other element is computed.
+    credible_interval : float or array_like of floats, optional
+        Credible interval to compute. Defaults to 0.94. Several credible intervals can be given
+        at once, the samples are sorted only once for all of them.
     circular : bool, optional
         Whether to compute the hpd taking into account `x` is a circular variable
         (in the range [-np.pi, np.pi]) or not. Defaults to False (i.e non-circular variables).
@@ -283,7 +298,8 @@ def hpd(ary, credible_interval=0.94, circular=False):
     Returns
     -------
     np.ndarray
-        lower and upper value of the interval.
+        lower and upper value of the interval, shape ``x.shape[1:] + (2,)``. If
+        `credible_interval` is array_like, the shape is ``x.shape[1:] + (n_intervals, 2)``.
 
     Examples
     --------
@@ -295,45 +311,197 @@ def hpd(ary, credible_interval=0.94, circular=False):
            ...: import numpy as np
            ...: data = np.random.normal(size=2000)
            ...: az.hpd(data, credible_interval=.68)
+
+    Calculate the 50% and 94% hpd of each column of a 2D array:
+
+    .. ipython::
+
+        In [1]: data = np.random.normal(size=(2000, 3))
+           ...: az.hpd(data, credible_interval=[.5, .94])
     """
-    if ary.ndim > 1:
-        hpd_array = np.array(
-            [hpd(row, credible_interval=credible_interval, circular=circular) for row in ary.T]
-        )
-        return hpd_array
-    # Make a copy of trace
-    ary = ary.copy()
-    n = len(ary)
+    ary, mean = _sort_samples(ary, circular)
+    hpd_intervals = [
+        np.stack(bounds, axis=-1)
+        for bounds in _hpd_sorted(ary, np.atleast_1d(credible_interval), mean)
+    ]
+    if np.ndim(credible_interval) == 0:
+        return hpd_intervals[0]
+    return np.stack(hpd_intervals, axis=-2)
+
+
+def _sort_samples(ary, circular=False):
+    """Sort an array along its first dimension.
 
+    Circular samples are centered on their circular mean before sorting, the mean is returned
+    to undo the shift, it is None otherwise.
+    """
+    ary = np.asarray(ary)
+    mean = None
     if circular:
-        mean = st.circmean(ary, high=np.pi, low=-np.pi)
+        mean = st.circmean(ary, high=np.pi, low=-np.pi, axis=0)
         ary = ary - mean
         ary = np.arctan2(np.sin(ary), np.cos(ary))
+    # sort once along the sample dimension for all the elements
+    return np.sort(ary, axis=0), mean
+
 
-    ary = np.sort(ary)
-    interval_idx_inc = int(np.floor(credible_interval * n))
-    n_intervals = n - interval_idx_inc
-    interval_width = ary[interval_idx_inc:] - ary[:n_intervals]
+def _wrap_circular(values, mean):
+    """Undo the centering of circular samples done by `_sort_samples`."""
+    if mean is None:
+        return values
+    values = values + mean
+    return np.arctan2(np.sin(values), np.cos(values))
 
-    if len(interval_width) == 0:
+
+def _hpd_sorted(ary, credible_intervals, mean=None):
+    """Compute lower and upper hpd values from samples sorted along the first dimension."""
+    n = len(ary)
+    interval_idx_incs = np.floor(np.asarray(credible_intervals) * n).astype(int)
+
+    if np.any(interval_idx_incs < 0) or np.any(interval_idx_incs >= n):
         raise ValueError(
             "Too few elements for interval calculation. "
             "Check that credible_interval meets condition 0 =< credible_interval < 1"
         )
 
-    min_idx = np.argmin(interval_width)
-    hdi_min = ary[min_idx]
-    hdi_max = ary[min_idx + interval_idx_inc]
+    hpd_intervals = []
+    for interval_idx_inc in interval_idx_incs:
+        n_intervals = n - interval_idx_inc
+        interval_width = ary[interval_idx_inc:] - ary[:n_intervals]
+        min_idx = np.argmin(interval_width, axis=0)[np.newaxis]
+        hdi_min = np.take_along_axis(ary, min_idx, axis=0)[0]
+        hdi_max = np.take_along_axis(ary, min_idx + interval_idx_inc, axis=0)[0]
+        hpd_intervals.append((_wrap_circular(hdi_min, mean), _wrap_circular(hdi_max, mean)))
+    return hpd_intervals
 
-    if circular:
-        hdi_min = hdi_min + mean
-        hdi_max = hdi_max + mean
-        hdi_min = np.arctan2(np.sin(hdi_min), np.cos(hdi_min))
-        hdi_max = np.arctan2(np.sin(hdi_max), np.cos(hdi_max))
 
-    return np.array([hdi_min, hdi_max])
+def _quantiles_sorted(ary, quantiles, mean=None):
+    """Compute quantiles from samples sorted along the first dimension.
+
+    Quantiles are linearly interpolated between the closest samples like in ``np.quantile``.
+    """
+    n = len(ary)
+    values = []
+    for quantile in quantiles:
+        index = quantile * (n - 1)
+        lower = int(np.floor(index))
+        upper = min(lower + 1, n - 1)
+        value = ary[lower] + (ary[upper] - ary[lower]) * (index - lower)
+        values.append(_wrap_circular(value, mean))
+    return values
+
+
+def _interval_labels(credible_intervals, quantiles):
+    """Labels of the `interval` dimension returned by `posterior_intervals`."""
+    labels = []
+    for credible_interval in credible_intervals:
+        alpha = 1 - credible_interval
+        labels.append("hpd_{:g}%".format(100 * alpha / 2))
+        labels.append("hpd_{:g}%".format(100 * (1 - alpha / 2)))
+    labels.extend("{:g}%".format(100 * quantile) for quantile in quantiles)
+    return labels
+
+
+@_cached()
+def _intervals(ary, credible_intervals=(0.94,), quantiles=(), circular=False):
+    """Compute hpd bounds and quantiles of an array sorting it only once.
+
+    The first dimension of `ary` is the sample dimension. The result has shape
+    ``ary.shape[1:] + (2 * len(credible_intervals) + len(quantiles),)``, with the lower and
+    upper hpd values of each credible interval followed by the quantiles.
+    """
+    if any(not 0 <= quantile <= 1 for quantile in quantiles):
+        raise ValueError("Quantiles should be in the interval [0, 1], got {}".format(quantiles))
+    ary, mean = _sort_samples(ary, circular)
+    values = [value for bounds in _hpd_sorted(ary, credible_intervals, mean) for value in bounds]
+    values.extend(_quantiles_sorted(ary, quantiles, mean))
+    if not values:
+        return np.empty(ary.shape[1:] + (0,))
+    return np.stack(values, axis=-1)
+
+
+def _intervals_chain_draw(ary, credible_intervals, quantiles, circular):
+    """Compute `_intervals` of every element of an array with (chain, draw) as last dimensions."""
+    ary = np.asarray(ary)
+    samples = np.moveaxis(ary.reshape(ary.shape[:-2] + (-1,)), -1, 0)
+    return _intervals(samples, credible_intervals, quantiles, circular)
+
+
+def _hpd_chain_draw(ary, credible_interval=0.94, circular=False):
+    """Compute the hpd of every element of an array with (chain, draw) as last dimensions.
+
+    Lower and upper values are returned separately to be used with ``xr.apply_ufunc``.
+    """
+    hpd_intervals = _intervals_chain_draw(ary, [credible_interval], [], circular)
+    return hpd_intervals[..., 0], hpd_intervals[..., 1]
+
+
+@_traced()
+def posterior_intervals(
+    data, var_names=None, credible_interval=0.94, quantiles=None, circular=False
+):
+    """Compute several hpd intervals and quantiles of every variable at once.
+
+    The samples of each variable are sorted only once, and all the hpd intervals and
+    quantiles are computed from the sorted samples.
+
+    Parameters
+    ----------
+    data : obj
+        Any object that can be converted to an az.InferenceData object. Refer to documentation
+        of az.convert_to_dataset for details
+    var_names : list
+        Names of variables to include in the result
+    credible_interval : float or list of floats, optional
+        Credible intervals of the hpd intervals to compute. Defaults to 0.94. Use None or an
+        empty list to compute only quantiles.
+    quantiles : float or list of floats, optional
+        Quantiles to compute, between 0 and 1. The quantiles are linearly interpolated.
+    circular : bool, optional
+        Whether the variables are circular (in the range [-np.pi, np.pi]) or not. Defaults to
+        False (i.e non-circular variables).
+
+    Returns
+    -------
+    xarray.Dataset
+        Dataset with the same variables and dimensions as `data` excluding `chain` and `draw`,
+        plus an `interval` dimension. Its labels are ``hpd_<lower>%`` and ``hpd_<upper>%`` for
+        each credible interval followed by ``<quantile>%`` for each quantile, in the same
+        format as the columns of :func:`arviz.summary`.
+
+    Examples
+    --------
+    Compute the 50% and 94% hpd intervals and the median of the centered eight model:
+
+    .. ipython::
 
+        In [1]: import arviz as az
+           ...: data = az.load_arviz_data("centered_eight")
+           ...: az.posterior_intervals(data, var_names=["mu", "tau"],
+           ...:                        credible_interval=[.5, .94], quantiles=[.5])
+    """
+    credible_intervals = [] if credible_interval is None else np.atleast_1d(credible_interval)
+    quantiles = [] if quantiles is None else np.atleast_1d(quantiles)
+    labels = _interval_labels(credible_intervals, quantiles)
+    if len(set(labels)) != len(labels):
+        raise ValueError("Repeated credible intervals or quantiles: {}".format(labels))
 
+    posterior = convert_to_dataset(data, group="posterior")
+    var_names = _var_names(var_names, posterior)
+    if var_names is not None:
+        posterior = posterior[list(var_names)]
+
+    intervals = xr.apply_ufunc(
+        _intervals_chain_draw,
+        posterior,
+        kwargs=dict(credible_intervals=credible_intervals, quantiles=quantiles, circular=circular),
+        input_core_dims=(("chain", "draw"),),
+        output_core_dims=(("interval",),),
+    )
+    return intervals.assign_coords(interval=labels)
+
+
+@_traced()
 def loo(data, pointwise=False, reff=None, scale="deviance"):
     """Pareto-smoothed importance sampling leave-one-out cross-validation.
 
@@ -394,7 +562,7 @@ def loo(data, pointwise=False, reff=None, scale="deviance"):
     log_likelihood = inference_data.sample_stats.log_likelihood
     n_samples = log_likelihood.chain.size * log_likelihood.draw.size
     new_shape = (n_samples, np.product(log_likelihood.shape[2:]))
-    log_likelihood = log_likelihood.values.reshape(*new_shape)
+    log_likelihood = np.asarray(log_likelihood.values.reshape(*new_shape), dtype=float)
 
     if scale.lower() == "deviance":
         scale_value = -2
@@ -410,7 +578,8 @@ def loo(data, pointwise=False, reff=None, scale="deviance"):
         if n_chains == 1:
             reff = 1.0
         else:
-            ess_p = ess(posterior, method="mean")
+            with _span("loo.reff"):
+                ess_p = ess(posterior, method="mean")
             # this mean is over all data variables
             reff = (
                 np.hstack([ess_p[v].values.flatten() for v in ess_p.data_vars]).mean() / n_samples
@@ -430,11 +599,11 @@ def loo(data, pointwise=False, reff=None, scale="deviance"):
         )
         warn_mg = True
 
-    loo_lppd_i = scale_value * _logsumexp(log_weights, axis=0)
-    loo_lppd = loo_lppd_i.sum()
-    loo_lppd_se = (len(loo_lppd_i) * np.var(loo_lppd_i)) ** 0.5
-
-    lppd = np.sum(_logsumexp(log_likelihood, axis=0, b_inv=log_likelihood.shape[0]))
+    with _span("loo.logsumexp", elements=log_likelihood.size):
+        loo_lppd_i = scale_value * _logsumexp(log_weights, axis=0)
+        loo_lppd = loo_lppd_i.sum()
+        loo_lppd_se = (len(loo_lppd_i) * np.var(loo_lppd_i)) ** 0.5
+        lppd = np.sum(_logsumexp(log_likelihood, axis=0, b_inv=log_likelihood.shape[0]))
     p_loo = lppd - loo_lppd / scale_value
 
     if pointwise:
@@ -456,6 +625,7 @@ def loo(data, pointwise=False, reff=None, scale="deviance"):
         )
 
 
+@_traced()
 def psislw(log_weights, reff=1.0):
     """
     Pareto smoothed importance sampling (PSIS).
@@ -476,14 +646,18 @@ def psislw(log_weights, reff=1.0):
     """
     rows, cols = log_weights.shape
 
-    log_weights_out = np.copy(log_weights, order="F")
-    kss = np.empty(cols)
+    log_weights_out = np.array(log_weights, dtype=float, order="F")
 
     # precalculate constants
     cutoff_ind = -int(np.ceil(min(rows / 5.0, 3 * (rows / reff) ** 0.5))) - 1
     cutoffmin = np.log(np.finfo(float).tiny)  # pylint: disable=no-member, assignment-from-no-return
     k_min = 1.0 / 3
 
+    if _kernels.use_kernels():
+        kss = _kernels.psislw_columns(log_weights_out, cutoff_ind, cutoffmin, k_min)
+        return log_weights_out, kss
+
+    kss = np.empty(cols)
     # loop over sets of log weights
     for i, x in enumerate(log_weights_out.T):
         # improve numerical accuracy
@@ -632,6 +806,7 @@ def r2_score(y_true, y_pred):
     return pd.Series([np.mean(r_squared), np.std(r_squared)], index=["r2", "r2_std"])
 
 
+@_traced()
 def summary(
     data,
     var_names=None,
@@ -757,55 +932,61 @@ def summary(
                 extra_metric_names.append(stat_func.__name__)
 
     if extend:
-        mean = posterior.mean(dim=("chain", "draw"))
+        with _span("summary.moments_hpd"):
+            mean = posterior.mean(dim=("chain", "draw"))
 
-        sd = posterior.std(dim=("chain", "draw"))
+            sd = posterior.std(dim=("chain", "draw"))
 
-        hpd_lower, hpd_higher = xr.apply_ufunc(
-            _make_ufunc(hpd, n_output=2),
-            posterior,
-            kwargs=dict(credible_interval=credible_interval),
-            input_core_dims=(("chain", "draw"),),
-            output_core_dims=tuple([] for _ in range(2)),
-        )
+            hpd_lower, hpd_higher = xr.apply_ufunc(
+                _hpd_chain_draw,
+                posterior,
+                kwargs=dict(credible_interval=credible_interval),
+                input_core_dims=(("chain", "draw"),),
+                output_core_dims=tuple([] for _ in range(2)),
+            )
 
     if include_circ:
-        circ_mean = xr.apply_ufunc(
-            _make_ufunc(st.circmean),
-            posterior,
-            kwargs=dict(high=np.pi, low=-np.pi),
-            input_core_dims=(("chain", "draw"),),
-        )
+        with _span("summary.circular"):
+            circ_mean = xr.apply_ufunc(
+                _make_ufunc(st.circmean),
+                posterior,
+                kwargs=dict(high=np.pi, low=-np.pi),
+                input_core_dims=(("chain", "draw"),),
+            )
 
-        circ_sd = xr.apply_ufunc(
-            _make_ufunc(st.circstd),
-            posterior,
-            kwargs=dict(high=np.pi, low=-np.pi),
-            input_core_dims=(("chain", "draw"),),
-        )
+            circ_sd = xr.apply_ufunc(
+                _make_ufunc(st.circstd),
+                posterior,
+                kwargs=dict(high=np.pi, low=-np.pi),
+                input_core_dims=(("chain", "draw"),),
+            )
 
-        circ_mcse = xr.apply_ufunc(
-            _make_ufunc(_mc_error),
-            posterior,
-            kwargs=dict(circular=True),
-            input_core_dims=(("chain", "draw"),),
-        )
+            circ_mcse = xr.apply_ufunc(
+                _make_ufunc(_mc_error),
+                posterior,
+                kwargs=dict(circular=True),
+                input_core_dims=(("chain", "draw"),),
+            )
+
+            circ_hpd_lower, circ_hpd_higher = xr.apply_ufunc(
+                _hpd_chain_draw,
+                posterior,
+                kwargs=dict(credible_interval=credible_interval, circular=True),
+                input_core_dims=(("chain", "draw"),),
+                output_core_dims=tuple([] for _ in range(2)),
+            )
 
-        circ_hpd_lower, circ_hpd_higher = xr.apply_ufunc(
-            _make_ufunc(hpd, n_output=2),
+    with _span(
+        "summary.multichain_statistics",
+        elements=lambda: sum(ary.size for ary in posterior.data_vars.values()),
+    ):
+        mcse_mean, mcse_sd, ess_mean, ess_sd, ess_bulk, ess_tail, r_hat = xr.apply_ufunc(
+            _multichain_statistics,
             posterior,
-            kwargs=dict(credible_interval=credible_interval, circular=True),
             input_core_dims=(("chain", "draw"),),
-            output_core_dims=tuple([] for _ in range(2)),
+            output_core_dims=tuple([] for _ in range(7)),
         )
 
-    mcse_mean, mcse_sd, ess_mean, ess_sd, ess_bulk, ess_tail, r_hat = xr.apply_ufunc(
-        _make_ufunc(_multichain_statistics, n_output=7, ravel=False),
-        posterior,
-        input_core_dims=(("chain", "draw"),),
-        output_core_dims=tuple([] for _ in range(7)),
-    )
-
     # Combine metrics
     metrics = []
     metric_names = []
@@ -855,33 +1036,35 @@ def summary(
     metric_names.extend(extra_metric_names)
     joined = xr.concat(metrics, dim="metric").assign_coords(metric=metric_names)
 
-    if fmt.lower() == "wide":
-        dfs = []
-        for var_name, values in joined.data_vars.items():
-            if len(values.shape[1:]):
-                metric = list(values.metric.values)
-                data_dict = OrderedDict()
-                for idx in np.ndindex(values.shape[1:] if order == "C" else values.shape[1:][::-1]):
-                    if order == "F":
-                        idx = tuple(idx[::-1])
-                    ser = pd.Series(values[(Ellipsis, *idx)].values, index=metric)
-                    key_index = ",".join(map(str, (i + index_origin for i in idx)))
-                    key = "{}[{}]".format(var_name, key_index)
-                    data_dict[key] = ser
-                df = pd.DataFrame.from_dict(data_dict, orient="index")
-                df = df.loc[list(data_dict.keys())]
-            else:
-                df = values.to_dataframe()
-                df.index = list(df.index)
-                df = df.T
-            dfs.append(df)
-        summary_df = pd.concat(dfs, sort=False)
-    elif fmt.lower() == "long":
-        df = joined.to_dataframe().reset_index().set_index("metric")
-        df.index = list(df.index)
-        summary_df = df
-    else:
-        summary_df = joined
+    with _span("summary.format"):
+        if fmt.lower() == "wide":
+            dfs = []
+            for var_name, values in joined.data_vars.items():
+                if len(values.shape[1:]):
+                    metric = list(values.metric.values)
+                    data_dict = OrderedDict()
+                    shape = values.shape[1:] if order == "C" else values.shape[1:][::-1]
+                    for idx in np.ndindex(shape):
+                        if order == "F":
+                            idx = tuple(idx[::-1])
+                        ser = pd.Series(values[(Ellipsis, *idx)].values, index=metric)
+                        key_index = ",".join(map(str, (i + index_origin for i in idx)))
+                        key = "{}[{}]".format(var_name, key_index)
+                        data_dict[key] = ser
+                    df = pd.DataFrame.from_dict(data_dict, orient="index")
+                    df = df.loc[list(data_dict.keys())]
+                else:
+                    df = values.to_dataframe()
+                    df.index = list(df.index)
+                    df = df.T
+                dfs.append(df)
+            summary_df = pd.concat(dfs, sort=False)
+        elif fmt.lower() == "long":
+            df = joined.to_dataframe().reset_index().set_index("metric")
+            df.index = list(df.index)
+            summary_df = df
+        else:
+            summary_df = joined
     if (round_to is not None) and (round_to not in ("None", "none")):
         summary_df = summary_df.round(round_to)
     elif round_to not in ("None", "none") and (fmt.lower() in ("long", "wide")):
@@ -966,7 +1149,7 @@ def waic(data, pointwise=False, scale="deviance"):
 
     n_samples = log_likelihood.chain.size * log_likelihood.draw.size
     new_shape = (n_samples, np.product(log_likelihood.shape[2:]))
-    log_likelihood = log_likelihood.values.reshape(*new_shape)
+    log_likelihood = np.asarray(log_likelihood.values.reshape(*new_shape), dtype=float)
 
     lppd_i = _logsumexp(log_likelihood, axis=0, b_inv=log_likelihood.shape[0])
 
@@ -13,24 +13,45 @@ _log = logging.getLogger(__name__)
 __all__ = ["autocorr", "autocov", "make_ufunc", "wrap_xarray_ufunc"]
 
 
-def autocov(ary, axis=-1):
+def autocov(ary, axis=-1, max_lag=None):
     """Compute autocovariance estimates for every lag for the input array.
 
+    The autocovariances of all the series of a multidimensional array, for example of shape
+    (n_series, n_draws), are computed at once with a single FFT along `axis`. When only the
+    first lags are needed and their number is small compared to the logarithm of the length
+    of the series, they are computed directly in O(n_draws * max_lag) instead.
+
     Parameters
     ----------
     ary : Numpy array
         An array containing MCMC samples
+    axis : int, optional
+        Axis of the samples of each series. Defaults to the last axis.
+    max_lag : int, optional
+        Number of lags computed, from 0 to ``max_lag - 1``. Defaults to all the lags.
 
     Returns
     -------
-    acov: Numpy array same size as the input array
+    acov: Numpy array same size as the input array, with at most `max_lag` elements along axis
     """
-    axis = axis if axis > 0 else len(ary.shape) + axis
+    axis = axis if axis >= 0 else len(ary.shape) + axis
     n = ary.shape[axis]
-    m = next_fast_len(2 * n)
+    n_lags = n if max_lag is None else min(max_lag, n)
 
     ary = ary - ary.mean(axis, keepdims=True)
 
+    # the direct computation streams over the series once per lag
+    if n_lags < 6 * np.log2(n):
+        ary = np.moveaxis(ary, axis, -1)
+        cov = np.empty(ary.shape[:-1] + (n_lags,))
+        for lag in range(n_lags):
+            cov[..., lag] = np.einsum("...i,...i->...", ary[..., : n - lag], ary[..., lag:])
+        cov /= n
+        return np.moveaxis(cov, -1, axis)
+
+    # zero padding to n + n_lags avoids the circular terms of the first n_lags lags
+    m = next_fast_len(n + n_lags)
+
     # added to silence tuple warning for a submodule
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
@@ -39,7 +60,8 @@ def autocov(ary, axis=-1):
         ifft_ary *= np.conjugate(ifft_ary)
 
         shape = tuple(
-            slice(None) if dim_len != axis else slice(0, n) for dim_len, _ in enumerate(ary.shape)
+            slice(None) if dim_len != axis else slice(0, n_lags)
+            for dim_len, _ in enumerate(ary.shape)
         )
         cov = np.fft.irfft(ifft_ary, n=m, axis=axis)[shape]
         cov /= n
@@ -47,7 +69,7 @@ def autocov(ary, axis=-1):
     return cov
 
 
-def autocorr(ary, axis=-1):
+def autocorr(ary, axis=-1, max_lag=None):
     """Compute autocorrelation using FFT for every lag for the input array.
 
     See https://en.wikipedia.org/wiki/autocorrelation#Efficient_computation
@@ -56,13 +78,18 @@ def autocorr(ary, axis=-1):
     ----------
     ary : Numpy array
         An array containing MCMC samples
+    axis : int, optional
+        Axis of the samples of each series. Defaults to the last axis.
+    max_lag : int, optional
+        Number of lags computed, from 0 to ``max_lag - 1``. Defaults to all the lags, see
+        :func:`autocov`.
 
     Returns
     -------
-    acorr: Numpy array same size as the input array
+    acorr: Numpy array same size as the input array, with at most `max_lag` elements along axis
     """
-    corr = autocov(ary, axis=axis)
-    axis = axis = axis if axis > 0 else len(corr.shape) + axis
+    corr = autocov(ary, axis=axis, max_lag=max_lag)
+    axis = axis if axis >= 0 else len(corr.shape) + axis
     norm = tuple(
         slice(None, None) if dim != axis else slice(None, 1) for dim, _ in enumerate(corr.shape)
     )
@@ -233,7 +260,8 @@ def logsumexp(ary, *, b=None, b_inv=None, axis=None, keepdims=False, out=None, c
     """
     # check dimensions for result arrays
     ary = np.asarray(ary)
-    if ary.dtype.kind == "i":
+    if ary.dtype.kind == "i" or (ary.dtype.kind == "f" and ary.dtype.itemsize < 8):
+        # reduced precision storage (e.g. float32 posteriors) is not accurate enough here
         ary = ary.astype(np.float64)
     dtype = ary.dtype.type
     shape = ary.shape
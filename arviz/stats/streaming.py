@@ -0,0 +1,254 @@
+"""Streaming diagnostics for chains that are still being sampled."""
+import numpy as np
+
+from ..rcparams import rcParams
+
+__all__ = ["StreamingDiagnostics"]
+
+
+def _combine_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """Combine the count, mean and sum of squared deviations of two groups of samples.
+
+    Pairwise update from Chan et al., which reduces to Welford's update when one of the
+    groups has a single sample.
+    """
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (count_b / count)
+    m2 = m2_a + m2_b + delta ** 2 * (count_a * count_b / count)
+    return count, mean, m2
+
+
+def _pool_batches(means, m2s, batch_size, axis=0):
+    """Mean and sum of squared deviations of several batches with the same number of samples."""
+    mean = np.mean(means, axis=axis)
+    m2 = np.sum(m2s, axis=axis) + batch_size * np.sum(
+        (means - np.expand_dims(mean, axis)) ** 2, axis=axis
+    )
+    return mean, m2
+
+
+class StreamingDiagnostics:
+    """Accumulate diagnostics of MCMC chains from blocks of new draws.
+
+    The draws are not stored. For every chain and parameter, the accumulator keeps the
+    moments of the draws in at most `max_batches` consecutive batches of equal size plus
+    the moments of the batch being filled. When all the batches are full, adjacent batches
+    are merged and the batch size doubles, so that the memory used does not depend on the
+    number of draws.
+
+    The moments are updated with Welford's algorithm generalized to blocks of draws. From
+    them, the following estimates are available at any time:
+
+    - `mean` and `sd` of the draws of all chains.
+    - `ess`, effective sample size estimated with batch means.
+    - `mcse_mean`, Monte Carlo standard error of the mean, ``sd / sqrt(ess)`` with the sd
+      of the draws in full batches.
+    - `rhat`, classic split rhat, computed from the moments of the first and last halves of
+      the full batches of each chain.
+
+    `ess`, `mcse_mean` and `rhat` only use the draws in full batches. They are NaN until
+    there are at least two full batches per chain, and `rhat` also requires two chains.
+
+    Parameters
+    ----------
+    max_batches : int, optional
+        Maximum number of batches per chain, it must be even. Defaults to 64.
+
+    Examples
+    --------
+    Update the diagnostics of 4 chains of a 3 dimensional parameter every 100 draws:
+
+    .. ipython::
+
+        In [1]: import arviz as az
+           ...: import numpy as np
+           ...: diagnostics = az.StreamingDiagnostics()
+           ...: for _ in range(10):
+           ...:     diagnostics.update(np.random.randn(4, 100, 3))
+           ...: diagnostics.to_dict()
+    """
+
+    def __init__(self, max_batches=64):
+        if max_batches < 2 or max_batches % 2:
+            raise ValueError("max_batches must be an even number, got {}".format(max_batches))
+        self.max_batches = max_batches
+        self.batch_size = 1
+        self.n_batches = 0
+        self.n_draws = 0  # per chain
+        self._batch_means = None
+        self._batch_m2 = None
+        self._partial = None
+
+    def update(self, ary):
+        """Add new draws of every chain.
+
+        Blocks larger than ``rcParams["stats.chunk_size"]`` draws are processed in chunks
+        to bound the temporary memory used.
+
+        Parameters
+        ----------
+        ary : array_like
+            New draws, with shape ``(chain, draw, *shape)``. All the updates must have the
+            same number of chains and parameter shape.
+        """
+        ary = np.asarray(ary, dtype=float)
+        if ary.ndim < 2:
+            raise ValueError(
+                "Draws must have at least (chain, draw) dimensions, got shape {}".format(ary.shape)
+            )
+        if self._batch_means is None:
+            state_shape = (ary.shape[0],) + ary.shape[2:]
+            self._batch_means = np.empty((self.max_batches,) + state_shape)
+            self._batch_m2 = np.empty((self.max_batches,) + state_shape)
+            self._partial = (0, np.zeros(state_shape), np.zeros(state_shape))
+        elif (ary.shape[0],) + ary.shape[2:] != self._batch_means.shape[1:]:
+            raise ValueError(
+                "Shape {} is not compatible with previous draws of shape {}".format(
+                    ary.shape, (self._batch_means.shape[1], "draw") + self._batch_means.shape[2:]
+                )
+            )
+
+        chunk_size = rcParams["stats.chunk_size"]
+        start = 0
+        n_new = ary.shape[1]
+        while start < n_new:
+            count = self._partial[0]
+            stop = start + min(self.batch_size - count, n_new - start, chunk_size)
+            chunk = ary[:, start:stop]
+            chunk_mean = np.mean(chunk, axis=1)
+            chunk_m2 = np.sum((chunk - np.expand_dims(chunk_mean, 1)) ** 2, axis=1)
+            self._partial = _combine_moments(*self._partial, stop - start, chunk_mean, chunk_m2)
+            self.n_draws += stop - start
+            start = stop
+            if self._partial[0] == self.batch_size:
+                self._push_batch()
+
+    def _push_batch(self):
+        """Store the batch being filled and merge batches if there are too many."""
+        _, mean, m2 = self._partial
+        self._batch_means[self.n_batches] = mean
+        self._batch_m2[self.n_batches] = m2
+        self.n_batches += 1
+        self._partial = (0, np.zeros_like(mean), np.zeros_like(m2))
+        if self.n_batches == self.max_batches:
+            half = self.max_batches // 2
+            shape = (half, 2) + self._batch_means.shape[1:]
+            means, m2s = _pool_batches(
+                self._batch_means.reshape(shape), self._batch_m2.reshape(shape), self.batch_size, 1
+            )
+            self._batch_means[:half] = means
+            self._batch_m2[:half] = m2s
+            self.n_batches = half
+            self.batch_size *= 2
+
+    def _chain_moments(self):
+        """Count, mean and sum of squared deviations of all the draws of each chain."""
+        count, mean, m2 = self._partial
+        if self.n_batches:
+            batch_mean, batch_m2 = _pool_batches(
+                self._batch_means[: self.n_batches],
+                self._batch_m2[: self.n_batches],
+                self.batch_size,
+            )
+            count, mean, m2 = _combine_moments(
+                self.n_batches * self.batch_size, batch_mean, batch_m2, count, mean, m2
+            )
+        return count, mean, m2
+
+    def _check_draws(self):
+        if self.n_draws == 0:
+            raise ValueError("No draws have been added yet, use the update method")
+
+    @property
+    def mean(self):
+        """Mean of the draws of all chains."""
+        self._check_draws()
+        _, mean, _ = self._chain_moments()
+        return np.mean(mean, axis=0)
+
+    @property
+    def sd(self):
+        """Standard deviation of the draws of all chains."""
+        self._check_draws()
+        count, mean, m2 = self._chain_moments()
+        _, m2 = _pool_batches(mean, m2, count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(m2 / (count * len(mean) - 1))
+
+    def _full_batches_variances(self):
+        """Number of draws, variance and batch means variance of the draws in full batches.
+
+        Return None if there are less than two full batches per chain.
+        """
+        if self.n_batches < 2:
+            return None
+        n_chains = self._batch_means.shape[1]
+        n_batches = self.n_batches * n_chains
+        batch_means = self._batch_means[: self.n_batches].reshape(
+            (n_batches,) + self._batch_means.shape[2:]
+        )
+        batch_m2 = self._batch_m2[: self.n_batches].reshape(batch_means.shape)
+        _, m2 = _pool_batches(batch_means, batch_m2, self.batch_size)
+        n_draws = n_batches * self.batch_size
+        variance = m2 / (n_draws - 1)
+        batch_means_variance = self.batch_size * np.var(batch_means, axis=0, ddof=1)
+        return n_draws, variance, batch_means_variance
+
+    @property
+    def ess(self):
+        """Effective sample size of the mean, estimated with batch means."""
+        self._check_draws()
+        variances = self._full_batches_variances()
+        if variances is None:
+            return np.full(self._batch_means.shape[2:], np.nan)[()]
+        n_draws, variance, batch_means_variance = variances
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return n_draws * variance / batch_means_variance
+
+    @property
+    def mcse_mean(self):
+        """Monte Carlo standard error of the mean, from the same draws as `ess`."""
+        self._check_draws()
+        variances = self._full_batches_variances()
+        if variances is None:
+            return np.full(self._batch_means.shape[2:], np.nan)[()]
+        n_draws, _, batch_means_variance = variances
+        return np.sqrt(batch_means_variance / n_draws)
+
+    @property
+    def rhat(self):
+        """Split rhat of the draws in full batches."""
+        self._check_draws()
+        half = self.n_batches // 2
+        num_samples = half * self.batch_size
+        if num_samples < 2 or self._batch_means.shape[1] < 2:
+            return np.full(self._batch_means.shape[2:], np.nan)[()]
+        first_mean, first_m2 = _pool_batches(
+            self._batch_means[:half], self._batch_m2[:half], self.batch_size
+        )
+        last_mean, last_m2 = _pool_batches(
+            self._batch_means[self.n_batches - half : self.n_batches],
+            self._batch_m2[self.n_batches - half : self.n_batches],
+            self.batch_size,
+        )
+        # split chains stacked along the first axis, same as _split_chains
+        chain_mean = np.concatenate((first_mean, last_mean))
+        chain_m2 = np.concatenate((first_m2, last_m2))
+        chain_var = chain_m2 / (num_samples - 1)
+        between_chain_variance = num_samples * np.var(chain_mean, axis=0, ddof=1)
+        within_chain_variance = np.mean(chain_var, axis=0)
+        return np.sqrt(
+            (between_chain_variance / within_chain_variance + num_samples - 1) / num_samples
+        )
+
+    def to_dict(self):
+        """Return the current estimates as a dictionary of arrays."""
+        return {
+            "mean": self.mean,
+            "sd": self.sd,
+            "mcse_mean": self.mcse_mean,
+            "ess": self.ess,
+            "r_hat": self.rhat,
+            "n_draws": self.n_draws,
+        }
@@ -5,6 +5,7 @@ import os
 from urllib.parse import urlunsplit
 import numpy as np
 import pytest
+import xarray as xr
 
 from arviz import (
     concat,
@@ -18,7 +19,14 @@ from arviz import (
     clear_data_home,
     InferenceData,
 )
-from ..data.base import generate_dims_coords, make_attrs
+from ..data import base
+from ..data.base import (
+    _distribution_version,
+    dict_to_dataset,
+    generate_dims_coords,
+    make_attrs,
+    numpy_to_data_array,
+)
 from ..data.datasets import REMOTE_DATASETS, LOCAL_DATASETS, RemoteFileMetadata
 from .helpers import (  # pylint: disable=unused-import
     chains,
@@ -143,6 +151,16 @@ def test_make_attrs():
     assert attrs["key"] == "Value"
 
 
+def test_make_attrs_library_version():
+    _distribution_version.cache_clear()
+    attrs = make_attrs(library=np)
+    assert attrs["inference_library"] == "numpy"
+    assert attrs["inference_library_version"] == np.__version__
+    make_attrs(library=np)
+    assert _distribution_version.cache_info().hits == 1
+    assert _distribution_version("not-an-installed-distribution") is None
+
+
 def test_addition():
     idata1 = from_dict(
         posterior={"A": np.random.randn(2, 10, 2), "B": np.random.randn(2, 10, 5, 2)}
@@ -257,6 +275,42 @@ def test_sel_method(inplace):
             assert np.all(dataset.draw.values == np.arange(200, ndraws))
 
 
+@pytest.mark.parametrize("copy", [True, False])
+def test_sel_method_copy(copy):
+    data = np.random.normal(size=(4, 500, 8))
+    idata = from_dict(posterior={"b": data}, observed_data={"b": data[0, 0, :]})
+    idata2 = idata.sel(inplace=False, copy=copy, draw=slice(200, None))
+    assert idata2._groups == idata._groups  # pylint: disable=protected-access
+    assert idata2.posterior is not idata.posterior
+    assert idata2.observed_data is not idata.observed_data
+    assert idata2.posterior.draw.size == 300
+    for group in ("posterior", "observed_data"):
+        shared = np.shares_memory(getattr(idata, group).b.values, getattr(idata2, group).b.values)
+        assert shared is not copy
+
+
+def test_thin_burn_select_chains():
+    data = np.random.normal(size=(4, 500, 3))
+    idata = from_dict(
+        posterior={"b": data}, sample_stats={"a": data[..., 0]}, observed_data={"b": data[0, 0]}
+    )
+    idata2 = idata.burn(100).thin(10).select_chains([1, 3])
+    assert idata2.posterior.b.shape == (2, 40, 3)
+    assert idata2.sample_stats.a.shape == (2, 40)
+    assert idata2.observed_data.b.shape == (3,)
+    assert np.all(idata2.posterior.draw.values == np.arange(100, 500, 10))
+    assert np.all(idata2.posterior.b.values == data[[1, 3], 100::10])
+    assert idata.posterior.b.shape == (4, 500, 3)
+    assert np.shares_memory(idata.posterior.b.values, idata.thin(5).posterior.b.values)
+    assert np.shares_memory(idata.posterior.b.values, idata.select_chains(2).posterior.b.values)
+    assert idata.burn(10, inplace=True) is None
+    assert idata.posterior.draw.size == 490
+    with pytest.raises(ValueError):
+        idata.thin(0)
+    with pytest.raises(ValueError):
+        idata.burn(-1)
+
+
 class TestNumpyToDataArray:
     def test_1d_dataset(self):
         size = 100
@@ -376,6 +430,47 @@ def test_dict_to_dataset():
     assert set(dataset.b.coords) == {"chain", "draw", "c"}
 
 
+def test_dict_to_dataset_shared_index(monkeypatch):
+    index_variables = []
+    get_index_variables = base._index_variables  # pylint: disable=protected-access
+
+    def spy(*args, **kwargs):
+        index_variables.append(get_index_variables(*args, **kwargs))
+        return index_variables[-1]
+
+    monkeypatch.setattr(base, "_index_variables", spy)
+    datadict = {"a": np.random.randn(2, 100, 3), "b": np.random.randn(2, 100, 3, 4)}
+    coords = {"c": ["x", "y", "z"]}
+    dims = {"a": ["c"], "b": ["c", "d"]}
+    dataset = dict_to_dataset(datadict, coords=coords, dims=dims)
+    index_a, index_b = index_variables
+    assert all(index_a[dim] is index_b[dim] for dim in ("chain", "draw", "c"))
+    assert all(isinstance(index_var, xr.IndexVariable) for index_var in index_b.values())
+    assert coords == {"c": ["x", "y", "z"]}
+    assert dims == {"a": ["c"], "b": ["c", "d"]}
+    expected = xr.Dataset(
+        {
+            key: numpy_to_data_array(value, var_name=key, coords=coords, dims=dims[key])
+            for key, value in datadict.items()
+        }
+    )
+    assert dataset.equals(expected)
+
+
+def test_dict_to_dataset_mismatched_dims():
+    datadict = {"a": np.random.randn(2, 100, 3), "b": np.random.randn(2, 50, 3)}
+    dataset = dict_to_dataset(datadict, dims={"a": ["c"], "b": ["c"]})
+    expected = xr.Dataset(
+        {
+            key: numpy_to_data_array(value, var_name=key, dims=["c"])
+            for key, value in datadict.items()
+        }
+    )
+    assert dataset.draw.size == 100
+    assert np.isnan(dataset.b.sel(draw=slice(50, None))).all()
+    assert dataset.equals(expected)
+
+
 def test_convert_to_dataset_idempotent():
     first = convert_to_dataset(np.random.randn(100))
     second = convert_to_dataset(first)
@@ -611,3 +706,51 @@ class TestDataNetCDF:
         assert os.path.exists(filepath)
         os.remove(filepath)
         assert not os.path.exists(filepath)
+
+    @pytest.mark.parametrize("dtype", ["float32", "int16"])
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_io_storage(self, data, eight_schools_params, dtype, compress, tmpdir):
+        inference_data = self.get_inference_data(data, eight_schools_params)
+        reduced = inference_data.set_storage(dtype, inplace=False)
+        assert inference_data.posterior.mu.dtype == np.float64
+        assert reduced.posterior.mu.dtype == (np.float32 if dtype == "float32" else np.float64)
+        max_error = np.abs(reduced.posterior.theta.values - data.obj["theta"]).max()
+        if dtype == "int16":
+            bound = reduced.posterior.theta.attrs["quantization_max_abs_error"]
+            value_range = data.obj["theta"].max() - data.obj["theta"].min()
+            assert np.isclose(bound, value_range / (2 * (2 ** 16 - 2)))
+            assert max_error <= bound
+        filepath = os.path.join(str(tmpdir), "storage_testfile.nc")
+        reduced.to_netcdf(filepath, compress=compress)
+        inference_data2 = from_netcdf(filepath)
+        assert inference_data2.posterior.theta.encoding["dtype"] == np.dtype(dtype)
+        assert np.allclose(
+            inference_data2.posterior.theta.values, reduced.posterior.theta.values, atol=1e-5
+        )
+        assert np.all(inference_data2.observed_data.J.values == eight_schools_params["J"])
+        reduced.set_storage("float64", groups="posterior")
+        assert reduced.posterior.mu.dtype == np.float64
+        assert reduced.posterior.mu.encoding["dtype"] == np.dtype("float64")
+        assert reduced.prior.mu.encoding["dtype"] == np.dtype(dtype)
+
+    @pytest.mark.parametrize("loc", [0, 100, 1e6])
+    def test_int16_storage_error_bound(self, loc, tmpdir):
+        ary = loc + np.random.randn(4, 500, 3)
+        ary[0, 0, 0] = np.nan
+        inference_data = from_dict(posterior={"a": ary})
+        reduced = inference_data.set_storage("int16", inplace=False)
+        bound = reduced.posterior.a.attrs["quantization_max_abs_error"]
+        assert np.nanmax(np.abs(reduced.posterior.a.values - ary)) <= bound
+        filepath = os.path.join(str(tmpdir), "int16_testfile.nc")
+        reduced.to_netcdf(filepath, compress=False)
+        inference_data2 = from_netcdf(filepath)
+        assert np.isnan(inference_data2.posterior.a.values[0, 0, 0])
+        assert np.nanmax(np.abs(inference_data2.posterior.a.values - ary)) <= bound
+        assert np.array_equal(
+            inference_data2.posterior.a.values, reduced.posterior.a.values, equal_nan=True
+        )
+
+    def test_bad_storage(self, data, eight_schools_params):
+        inference_data = self.get_inference_data(data, eight_schools_params)
+        with pytest.raises(ValueError):
+            inference_data.set_storage("float16")
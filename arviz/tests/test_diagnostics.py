@@ -5,10 +5,11 @@ import numpy as np
 from numpy.testing import assert_almost_equal, assert_array_almost_equal
 import pandas as pd
 import pytest
+from scipy import stats
 
-from ..data import load_arviz_data, from_cmdstan
+from ..data import load_arviz_data, from_cmdstan, from_dict
 from ..plots.plot_utils import xarray_var_iter
-from ..stats import bfmi, rhat, ess, mcse, geweke, effective_sample_size
+from ..stats import bfmi, rhat, ess, mcse, geweke, effective_sample_size, rank_histogram
 from ..stats.diagnostics import (
     ks_summary,
     _ess,
@@ -520,3 +521,48 @@ class TestDiagnostics:
         if chains is None:
             chains = 1
         assert split_data.shape == (chains * 2, draws // 2)
+
+    @pytest.mark.parametrize("ties", (False, True))
+    def test_z_scale_batched(self, ties):
+        ary = np.random.randn(5, 4, 100)
+        if ties:
+            ary = np.round(ary, 1)
+        z_batched = _z_scale(ary)
+        assert z_batched.shape == ary.shape
+        for param, z_param in zip(ary, z_batched):
+            rank = stats.rankdata(param, method="average").reshape(param.shape)
+            assert_array_almost_equal(z_param, stats.norm.ppf((rank - 0.5) / param.size))
+
+    @pytest.mark.parametrize("bins", (None, 7, "auto", [0, 100, 250, 400]))
+    def test_rank_histogram(self, bins):
+        ary = np.round(np.random.randn(5, 4, 100), 1)
+        counts, bin_edges = rank_histogram(ary, bins=bins)
+        assert counts.shape == (5, 4, len(bin_edges) - 1)
+        assert np.all(counts.sum(axis=-1) == 100)
+        for param, param_counts in zip(ary, counts):
+            rank = stats.rankdata(param, method="average").reshape(param.shape)
+            for chain_rank, chain_counts in zip(rank, param_counts):
+                expected, _ = np.histogram(chain_rank, bins=bin_edges)
+                assert np.all(chain_counts == expected)
+
+    @pytest.mark.parametrize("method", ("rank", "split", "folded", "z_scale", "identity"))
+    def test_rhat_batched(self, method):
+        ary = np.random.randn(3, 4, 100)
+        ary[1, 0, 10] = np.nan
+        rhat_batched = rhat(
+            from_dict(posterior={"x": np.moveaxis(ary, 0, -1)}).posterior, method=method
+        ).x.values
+        assert np.isnan(rhat_batched[1])
+        for i in (0, 2):
+            assert_almost_equal(rhat_batched[i], rhat(ary[i], method=method))
+
+    @pytest.mark.parametrize("method", ("bulk", "folded", "mad", "z_scale"))
+    def test_effective_sample_size_batched(self, method):
+        ary = np.random.randn(3, 4, 100)
+        ary[1, 0, 10] = np.nan
+        ess_batched = ess(
+            from_dict(posterior={"x": np.moveaxis(ary, 0, -1)}).posterior, method=method
+        ).x.values
+        assert np.isnan(ess_batched[1])
+        for i in (0, 2):
+            assert_almost_equal(ess_batched[i], ess(ary[i], method=method))
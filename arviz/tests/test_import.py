@@ -0,0 +1,105 @@
+"""
+Tests for the cost of `import arviz`.
+"""
+# pylint: disable=redefined-outer-name
+import json
+import subprocess
+import sys
+
+import pytest
+
+import arviz
+from ..plots import __all__ as plots_all
+from ..data import __all__ as data_all
+
+
+def run_python(code):
+    """Run code in a fresh interpreter and return its json output."""
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def import_info():
+    code = "import json, sys\nimport arviz\nprint(json.dumps({'modules': sorted(sys.modules)}))"
+    return run_python(code)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires module __getattr__")
+@pytest.mark.parametrize(
+    "module",
+    [
+        "matplotlib",
+        "scipy.signal",
+        "netCDF4",
+        "numba",
+        "arviz.stats.numba_kernels",
+        "arviz.plots",
+        "arviz.data.io_cmdstan",
+        "arviz.data.io_pystan",
+        "arviz.data.io_pymc3",
+    ],
+)
+def test_import_does_not_load(import_info, module):
+    assert module not in import_info["modules"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires module __getattr__")
+def test_import_time():
+    # compare with the dependencies arviz imports anyway, the best of a few runs is used to
+    # be robust to the load of the machine
+    timer = "import time\nstart = time.perf_counter()\n{}\nprint(time.perf_counter() - start)"
+    arviz_time = min(run_python(timer.format("import arviz")) for _ in range(3))
+    dependencies_time = min(
+        run_python(timer.format("import numpy, scipy.stats, xarray, pandas")) for _ in range(3)
+    )
+    assert arviz_time - dependencies_time < 0.5
+
+
+def test_star_import():
+    namespace = {}
+    exec("from arviz import *", namespace)  # pylint: disable=exec-used
+    for name in plots_all + data_all + ["style", "summary", "rcParams", "profiling"]:
+        assert name in namespace
+
+
+def test_lazy_attributes():
+    for name in plots_all + data_all + ["style"]:
+        assert getattr(arviz, name) is not None
+        assert name in dir(arviz)
+    with pytest.raises(AttributeError):
+        getattr(arviz, "plot_not_a_function")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires module __getattr__")
+def test_lazy_plots_register_styles():
+    code = (
+        "import json, sys\n"
+        "import arviz\n"
+        "before = 'matplotlib' in sys.modules\n"
+        "arviz.style.use('arviz-darkgrid')\n"
+        "print(json.dumps([before, 'matplotlib' in sys.modules]))"
+    )
+    assert run_python(code) == [False, True]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires module __getattr__")
+def test_stats_without_matplotlib():
+    code = (
+        "import json, sys\n"
+        "sys.modules['matplotlib'] = None  # makes any matplotlib import fail\n"
+        "import arviz.stats, arviz.data\n"
+        "import arviz as az\n"
+        "data = az.load_arviz_data('centered_eight')\n"
+        "az.summary(data)\n"
+        "az.rhat(data)\n"
+        "az.ess(data)\n"
+        "az.loo(data)\n"
+        "try:\n"
+        "    az.plot_kde\n"
+        "    error = None\n"
+        "except ImportError as err:\n"
+        "    error = str(err)\n"
+        "print(json.dumps(error))"
+    )
+    assert "require matplotlib" in run_python(code)
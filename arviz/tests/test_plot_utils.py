@@ -1,10 +1,23 @@
 # pylint: disable=redefined-outer-name
+import matplotlib.pyplot as plt
 import numpy as np
 import xarray as xr
 import pytest
 
 from ..data import from_dict
-from ..plots.plot_utils import make_2d, xarray_to_ndarray, xarray_var_iter, get_bins, get_coords
+from ..plots.plot_utils import (
+    make_2d,
+    xarray_to_ndarray,
+    xarray_var_iter,
+    get_bins,
+    get_coords,
+    downsample_indices,
+    plot_lines,
+    histogram_2d,
+    plot_histogram_2d,
+    histogram_hex,
+    plot_histogram_hex,
+)
 
 
 @pytest.fixture(scope="function")
@@ -33,6 +46,86 @@ def test_get_bins():
     assert get_bins(np.array([1, 2, 3, 100])) is not None
 
 
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_indices(method):
+    values = np.random.randn(10000).cumsum()
+    keep = np.array([17, 5003])
+    idxs = downsample_indices(values, 100, method=method, keep=keep)
+    assert np.all(np.diff(idxs) > 0)
+    assert len(idxs) <= 2 * 100 + 4
+    assert {0, 9999, 17, 5003} <= set(idxs)
+    if method == "minmax":
+        assert values[idxs].max() == values.max()
+        assert values[idxs].min() == values.min()
+
+
+def test_downsample_indices_short():
+    assert np.all(downsample_indices(np.random.randn(150), 100) == np.arange(150))
+    with pytest.raises(ValueError):
+        downsample_indices(np.random.randn(1000), 100, method="mean")
+
+
+def test_plot_lines():
+    _, ax = plt.subplots()
+    lines = np.random.randn(10, 5, 2)
+    collection = plot_lines(ax, lines, color="C1")
+    assert len(collection.get_segments()) == 10
+    assert ax.get_xlim()[0] <= lines[..., 0].min()
+    ragged = [np.column_stack(([0, 1, 2], [3, 4, 5])), np.column_stack(([0, 1], [1, 0]))]
+    steps = plot_lines(ax, ragged, drawstyle="steps-pre").get_segments()
+    assert np.all(steps[0] == [[0, 3], [0, 4], [1, 4], [1, 5], [2, 5]])
+    with pytest.raises(ValueError):
+        plot_lines(ax, ragged, drawstyle="steps-mid")
+
+
+def test_histogram_2d():
+    x, y = np.random.randn(2, 1000)
+    x[0] = np.nan
+    counts, extent = histogram_2d(x, y, (30, 20))
+    expected, _, _ = np.histogram2d(x[1:], y[1:], bins=(30, 20), range=[extent[:2], extent[2:]])
+    assert counts.shape == (20, 30)
+    assert np.all(counts == expected.T)
+    _, ax = plt.subplots()
+    image = plot_histogram_2d(ax, counts, extent)
+    assert tuple(image.get_extent()) == extent
+
+
+def test_histogram_2d_constant():
+    counts, extent = histogram_2d(np.ones(10), np.arange(10), (4, 5))
+    assert counts.sum() == 10
+    assert extent[:2] == (0.5, 1.5)
+
+
+@pytest.mark.parametrize("gridsize", [10, (15, 7)])
+def test_histogram_hex(gridsize):
+    x, y = np.random.randn(2, 1000)
+    centers, counts, extent = histogram_hex(x, y, gridsize)
+    assert counts.sum() == 1000
+    _, (ax_points, ax_counts) = plt.subplots(1, 2)
+    expected = ax_points.hexbin(x, y, gridsize=gridsize, mincnt=1)
+    hexbin = plot_histogram_hex(ax_counts, centers, counts, extent, gridsize)
+    expected_order = np.lexsort(expected.get_offsets().T)
+    order = np.lexsort(hexbin.get_offsets().T)
+    assert np.allclose(hexbin.get_offsets()[order], expected.get_offsets()[expected_order])
+    assert np.all(hexbin.get_array()[order] == expected.get_array()[expected_order])
+
+
+def test_histogram_hex_non_finite():
+    x, y = np.random.randn(2, 1000)
+    x[0] = np.nan
+    y[1] = np.inf
+    _, counts, extent = histogram_hex(x, y, 10)
+    assert counts.sum() == 998
+    assert np.all(np.isfinite(extent))
+
+
+def test_plot_histogram_hex_binning_kwargs():
+    centers, counts, extent = histogram_hex(*np.random.randn(2, 100), 10)
+    _, ax = plt.subplots()
+    with pytest.raises(ValueError, match="xscale"):
+        plot_histogram_hex(ax, centers, counts, extent, 10, xscale="log")
+
+
 def test_dataset_to_numpy_not_combined(sample_dataset):  # pylint: disable=invalid-name
     mu, tau, data = sample_dataset
     var_names, data = xarray_to_ndarray(data, combined=False)
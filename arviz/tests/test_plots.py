@@ -7,6 +7,7 @@ import numpy as np
 import pytest
 
 from ..data import from_dict, load_arviz_data
+from ..rcparams import rc_context
 from ..stats import compare, psislw
 from .helpers import eight_schools_params  # pylint: disable=unused-import
 from ..plots import (
@@ -24,10 +25,13 @@ from ..plots import (
     plot_compare,
     plot_kde,
     _fast_kde,
+    _fast_kde_batch,
+    _fast_kde_2d,
     plot_khat,
     plot_hpd,
     plot_dist,
     plot_rank,
+    PlotData,
 )
 
 np.random.seed(0)
@@ -265,6 +269,16 @@ def test_plot_parallel(models, norm_method):
     assert plot_parallel(models.model_1, var_names=["mu", "tau"], norm_method=norm_method)
 
 
+def test_plot_parallel_max_lines(models):
+    diverging = models.model_1.sample_stats.diverging.values.ravel()
+    plot_data = plot_parallel(
+        models.model_1, var_names=["mu", "tau"], max_lines=100, compute_only=True
+    )
+    assert plot_data["posterior"].shape == (2, 100 + diverging.sum())
+    assert plot_data["diverging_mask"].sum() == diverging.sum()
+    assert plot_data.render()
+
+
 @pytest.mark.parametrize("var_names", [None, "mu", ["mu", "tau"]])
 def test_plot_parallel_exception(models, var_names):
     """Ensure that correct exception is raised when one variable is passed."""
@@ -413,6 +427,49 @@ def test_plot_pair_2var(discrete_model, fig_ax, kwargs):
     assert ax
 
 
+@pytest.mark.parametrize("var_names", [["mu", "tau"], ["theta"]])
+def test_plot_pair_aggregate(models, var_names):
+    plot_data = plot_pair(
+        models.model_1, var_names=var_names, aggregate=True, divergences=True, compute_only=True
+    )
+    n_draws = models.model_1.posterior.sizes["chain"] * models.model_1.posterior.sizes["draw"]
+    assert plot_data["posterior"] is None
+    assert all(panel["counts"].sum() == n_draws for panel in plot_data["panels"])
+    assert np.all(plot_data.render())
+
+
+@pytest.mark.parametrize("kwargs", [{"kind": "kde"}, {"kind": "hexbin"}, {"aggregate": True}])
+def test_plot_pair_n_jobs(models, kwargs):
+    serial = plot_pair(models.model_1, var_names=["theta"], compute_only=True, **kwargs)
+    with rc_context(rc={"stats.n_jobs": 2}):
+        parallel = plot_pair(models.model_1, var_names=["theta"], compute_only=True, **kwargs)
+    assert parallel.to_json() == serial.to_json()
+    assert len(parallel["panels"]) == 28
+    assert np.all(parallel.render())
+
+
+@pytest.mark.parametrize("plot_kwargs", [{"marginals": True}, {"yscale": "log", "mincnt": 2}])
+def test_plot_pair_hexbin_binning_kwargs(models, plot_kwargs):
+    plot_data = plot_pair(
+        models.model_1,
+        var_names=["mu", "tau"],
+        kind="hexbin",
+        plot_kwargs=plot_kwargs,
+        compute_only=True,
+    )
+    assert plot_data["panels"] is None
+    assert plot_data["posterior"] is not None
+    assert plot_data.render()
+
+
+def test_plot_joint_aggregate(models):
+    plot_data = plot_joint(
+        models.model_1, var_names=["mu", "tau"], aggregate=True, compute_only=True
+    )
+    assert plot_data["joint"]["counts"].sum() == 2000
+    assert "x" not in plot_data["joint"]
+
+
 def test_plot_pair_bad(models):
     with pytest.raises(ValueError):
         plot_pair(models.model_1, kind="bad_kind")
@@ -632,6 +689,13 @@ def test_plot_autocorr_combined(models):
     assert axes.shape[1] == 18
 
 
+@pytest.mark.parametrize("combined", (False, True))
+def test_plot_autocorr_max_lag(models, combined):
+    plot_data = plot_autocorr(models.model_1, max_lag=7, combined=combined, compute_only=True)
+    assert all(panel["autocorr"].shape == (7,) for panel in plot_data["panels"])
+    assert all(panel["autocorr"][0] == pytest.approx(1) for panel in plot_data["panels"])
+
+
 @pytest.mark.parametrize("var_names", (None, "mu", ["mu", "tau"]))
 def test_plot_autocorr_var_names(models, var_names):
     axes = plot_autocorr(models.model_1, var_names=var_names, combined=True)
@@ -763,3 +827,116 @@ def test_fast_kde_cumulative(limits):
     data = np.random.normal(0, 1, 1000)
     density_fast = _fast_kde(data, xmin=limits[0], xmax=limits[1], cumulative=True)[0]
     np.testing.assert_almost_equal(round(density_fast[-1], 3), 1)
+
+
+@pytest.mark.parametrize("limits", [(-10.0, 10.0), (None, None)])
+@pytest.mark.parametrize("cumulative", [False, True])
+def test_fast_kde_batch(limits, cumulative):
+    data = np.random.normal(0, 1, (20, 1000))
+    density, xmin, xmax = _fast_kde_batch(
+        data, cumulative=cumulative, xmin=limits[0], xmax=limits[1]
+    )
+    assert density.shape[0] == 20
+    for row, row_density, row_xmin, row_xmax in zip(data, density, xmin, xmax):
+        expected = _fast_kde(row, cumulative=cumulative, xmin=limits[0], xmax=limits[1])
+        np.testing.assert_allclose(row_density, expected[0], atol=1e-12)
+        assert row_xmin == expected[1]
+        assert row_xmax == expected[2]
+
+
+@pytest.mark.parametrize("reflect", [False, True])
+def test_fast_kde_reflect(reflect):
+    data = np.random.exponential(size=10000)
+    density, xmin, xmax = _fast_kde(data, reflect=reflect)
+    integral = density.sum() * (xmax - xmin) / (len(density) - 1)
+    if reflect:
+        # the density is highest next to the boundary and integrates to one
+        assert density.argmax() == 0
+        np.testing.assert_almost_equal(integral, 1, 2)
+    else:
+        assert integral < 0.95
+
+
+def test_fast_kde_2d_scipy():
+    x = np.random.normal(0, 1, 5000)
+    y = np.random.normal(0, 10, 5000) + 5 * x
+    density, xmin, xmax, ymin, ymax = _fast_kde_2d(x, y)
+    x_x, y_y = np.mgrid[xmin:xmax:128j, ymin:ymax:128j]
+    expected = gaussian_kde(np.vstack((x, y)), bw_method=len(x) ** (-1 / 6))
+    expected = expected(np.vstack((x_x.ravel(), y_y.ravel()))).reshape(x_x.shape)
+    np.testing.assert_allclose(density, expected, atol=0.05 * expected.max())
+
+
+def test_fast_kde_batch_shared_grid():
+    data = np.random.normal(0, 1, (5, 1000))
+    data[0, 0] = np.nan
+    data[1, :] = np.nan
+    density, xmin, xmax = _fast_kde_batch(data, shared_grid=True)
+    assert np.all(xmin == np.nanmin(data))
+    assert np.all(xmax == np.nanmax(data))
+    assert np.isnan(density[1]).all()
+    assert not np.isnan(density[[0, 2, 3, 4]]).any()
+
+
+@pytest.mark.parametrize("downsample", ["auto", "minmax", "lttb", None])
+def test_plot_trace_downsample(models, downsample):
+    with rc_context(rc={"plot.trace_downsample_threshold": 100}):
+        plot_data = plot_trace(
+            models.model_1, var_names="mu", downsample=downsample, figsize=(2, 2), compute_only=True
+        )
+    trace = plot_data["panels"][0]["traces"][0]
+    diverging = models.model_1.sample_stats.diverging.values
+    if downsample is None:
+        assert trace["x"] is None
+    else:
+        for chain_idx, (x_values, y_values) in enumerate(zip(trace["x"], trace["y"])):
+            assert len(x_values) == len(y_values) < diverging.shape[1]
+            assert set(np.flatnonzero(diverging[chain_idx])) <= set(x_values)
+    assert plot_data.render() is not None
+
+
+def test_plot_trace_downsample_bad(models):
+    with pytest.raises(ValueError):
+        plot_trace(models.model_1, downsample="mean")
+
+
+@pytest.mark.parametrize(
+    "plot, kwargs",
+    [
+        (plot_autocorr, {"var_names": "mu"}),
+        (plot_density, {"var_names": ["mu", "tau"]}),
+        (plot_energy, {}),
+        (plot_forest, {"r_hat": True, "ess": True, "rope": (-1, 1)}),
+        (plot_forest, {"kind": "ridgeplot"}),
+        (plot_pair, {"var_names": ["mu", "tau"], "kind": "kde", "divergences": True}),
+        (plot_parallel, {"var_names": ["mu", "tau"]}),
+        (plot_posterior, {"var_names": ["mu", "tau"], "ref_val": 0}),
+        (plot_ppc, {"kind": "scatter", "random_seed": 0}),
+        (plot_rank, {"var_names": "mu"}),
+        (plot_trace, {"var_names": ["mu", "tau"], "legend": True}),
+        (plot_violin, {"var_names": "tau"}),
+    ],
+)
+def test_plot_compute_only(models, plot, kwargs):
+    plt.close("all")
+    plot_data = plot(models.model_1, compute_only=True, **kwargs)
+    assert isinstance(plot_data, PlotData)
+    assert not plt.get_fignums()
+    assert PlotData.from_json(plot_data.to_json()).render() is not None
+    assert plt.get_fignums()
+
+
+def test_plot_kde_compute_only():
+    values = np.random.randn(100)
+    plot_data = plot_kde(values, rug=True, compute_only=True)
+    density, lower, upper = _fast_kde(values)
+    decoded = PlotData.from_json(plot_data.to_json())
+    assert decoded["kde"]["density"].dtype == density.dtype
+    assert np.all(decoded["kde"]["density"] == density)
+    assert (decoded["kde"]["lower"], decoded["kde"]["upper"]) == (lower, upper)
+    assert decoded.render()
+
+
+def test_plot_data_no_renderer():
+    with pytest.raises(ValueError):
+        PlotData("plot_unknown", {}).render()
@@ -0,0 +1,118 @@
+"""
+Tests for arviz.profiling.
+"""
+# pylint: disable=redefined-outer-name
+import json
+import os
+
+import numpy as np
+import pytest
+
+from .. import profiling
+from ..data import load_arviz_data, from_cmdstan
+from ..stats import loo, summary
+
+
+@pytest.fixture(scope="module")
+def centered_eight():
+    return load_arviz_data("centered_eight")
+
+
+def test_profile_summary(centered_eight):
+    with profiling.profile() as prof:
+        summary(centered_eight)
+    totals = prof.to_dict()["totals"]
+    for name in (
+        "summary",
+        "summary.moments_hpd",
+        "summary.multichain_statistics",
+        "summary.format",
+        "multichain.ess_bulk",
+        "multichain.rank_normalize",
+        "multichain.rhat",
+    ):
+        assert name in totals
+    n_values = sum(ary.size for ary in centered_eight.posterior.data_vars.values())
+    assert totals["summary.multichain_statistics"]["elements"] == n_values
+    # the draws of each variable are rank normalized at once, the ess are computed per scalar
+    assert totals["multichain.rank_normalize"]["count"] == 3
+    assert totals["multichain.ess_mean"]["count"] == 10
+    assert totals["multichain.ess_mean"]["elements"] == n_values
+    assert totals["summary"]["duration"] >= totals["summary.format"]["duration"]
+
+
+def test_profile_loo(centered_eight):
+    with profiling.profile(trace_memory=True) as prof:
+        loo(centered_eight)
+    spans = {item["name"]: item for item in prof.to_dict()["spans"]}
+    assert {"loo", "loo.reff", "psislw", "loo.logsumexp"} <= set(spans)
+    assert spans["loo"]["depth"] == 0
+    assert spans["psislw"]["depth"] == 1
+    assert all(item["allocated_bytes"] is not None for item in spans.values())
+
+
+def test_profile_cmdstan():
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(here, "saved_models", "cmdstan", "output_no_warmup[0-9].csv")
+    with profiling.profile() as prof:
+        from_cmdstan(posterior=path)
+    totals = prof.to_dict()["totals"]
+    assert totals["from_cmdstan"]["count"] == 1
+    assert totals["cmdstan.read_output"]["count"] == 4
+    assert "cmdstan.unpack_dataframes" in totals
+    assert "dict_to_dataset" in totals
+
+
+def test_chrome_trace(tmp_path):
+    filename = str(tmp_path / "trace.json")
+    with profiling.profile() as prof:
+        with profiling.span("outer", elements=10):
+            with profiling.span("inner"):
+                pass
+    trace = prof.to_chrome_trace(filename)
+    with open(filename) as f_obj:
+        assert json.load(f_obj) == json.loads(json.dumps(trace))
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert set(events) == {"outer", "inner"}
+    assert all(event["ph"] == "X" for event in events.values())
+    assert events["outer"]["args"] == {"elements": 10}
+    assert events["outer"]["ts"] <= events["inner"]["ts"]
+    assert events["outer"]["dur"] >= events["inner"]["dur"]
+
+
+def test_enable_disable():
+    assert profiling.disable() is None
+    prof = profiling.enable()
+    try:
+        ary = np.random.randn(100, 3)
+        with profiling.profile() as nested:
+            profiling.traced("nested")(np.sum)(ary)
+    finally:
+        assert profiling.disable() is prof
+    assert [item["name"] for item in nested.spans] == ["nested"]
+    assert not prof.spans
+    with profiling.span("ignored"):
+        pass
+    assert not prof.spans and len(nested.spans) == 1
+
+
+def test_disabled_returns_null_span():
+    # no spans are created when profiling is disabled
+    assert profiling.span("a") is profiling.span("b")
+
+
+def test_lazy_elements():
+    calls = []
+
+    def count():
+        calls.append(None)
+        return 5
+
+    with profiling.span("disabled", elements=count):
+        pass
+    assert not calls
+    with profiling.profile() as prof:
+        with profiling.span("enabled", elements=count):
+            pass
+    assert len(calls) == 1
+    assert prof.to_dict()["totals"]["enabled"]["elements"] == 5
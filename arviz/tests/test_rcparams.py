@@ -0,0 +1,132 @@
+"""
+Tests for arviz.rcparams.
+"""
+# pylint: disable=redefined-outer-name
+import numpy as np
+import pytest
+
+from ..data import from_dict, from_netcdf
+from ..plots.kdeplot import _fast_kde
+from ..rcparams import (
+    RcParams,
+    rcParams,
+    rc_context,
+    rc_params,
+    read_rcfile,
+    _read_environ,
+    _validate_boolean,
+    _validate_n_jobs,
+    _validate_positive_int,
+)
+
+
+def test_rc_params_defaults():
+    defaults = rc_params(ignore_files=True)
+    assert isinstance(defaults, RcParams)
+    assert defaults["stats.n_jobs"] == 1
+    assert defaults["data.storage_dtype"] == "float64"
+    assert defaults["numba.enabled"] is False
+    assert list(defaults) == sorted(defaults)
+
+
+@pytest.mark.parametrize(
+    "key, value, expected",
+    [
+        ("stats.n_jobs", "4", 4),
+        ("stats.n_jobs", -1, -1),
+        ("stats.chunk_size", 500.0, 500),
+        ("numba.enabled", "off", False),
+        ("data.compress", 0, False),
+        ("data.storage_dtype", "Float32", "float32"),
+    ],
+)
+def test_rc_params_validation(key, value, expected):
+    with rc_context(rc={key: value}):
+        assert rcParams[key] == expected
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("stats.n_jobs", 0),
+        ("stats.chunk_size", 1.5),
+        ("kde.grid_size", "many"),
+        ("numba.enabled", "maybe"),
+        ("data.storage_dtype", "float16"),
+    ],
+)
+def test_rc_params_bad_value(key, value):
+    with pytest.raises(ValueError, match=key):
+        rcParams[key] = value
+
+
+def test_rc_params_bad_key():
+    with pytest.raises(KeyError):
+        rcParams["stats.not_a_key"] = 1
+    with pytest.raises(TypeError):
+        del rcParams["stats.n_jobs"]
+
+
+@pytest.mark.parametrize("func", [_validate_boolean, _validate_n_jobs, _validate_positive_int])
+def test_validators_bad_type(func):
+    with pytest.raises(ValueError):
+        func(None)
+
+
+def test_rc_context_restores():
+    original = rcParams.copy()
+    with pytest.raises(RuntimeError):
+        with rc_context(rc={"kde.grid_size": 50, "stats.n_jobs": 2}):
+            assert rcParams["kde.grid_size"] == 50
+            raise RuntimeError
+    assert rcParams.copy() == original
+
+
+def test_read_rcfile(tmp_path):
+    fname = str(tmp_path / "arvizrc")
+    with open(fname, "w") as rcfile:
+        rcfile.write("# comment\n\nstats.n_jobs : 3  # inline comment\nnumba.enabled: false\n")
+    config = read_rcfile(fname)
+    assert dict(config) == {"numba.enabled": False, "stats.n_jobs": 3}
+    with rc_context(fname=fname):
+        assert rcParams["stats.n_jobs"] == 3
+    with open(fname, "w") as rcfile:
+        rcfile.write("stats.n_jobs 3\n")
+    with pytest.raises(ValueError, match="Missing colon"):
+        read_rcfile(fname)
+
+
+def test_rc_params_files_and_environ(tmp_path, monkeypatch):
+    fname = str(tmp_path / "arvizrc")
+    with open(fname, "w") as rcfile:
+        rcfile.write("stats.n_jobs : 3\nkde.grid_size : 100\n")
+    monkeypatch.setenv("ARVIZ_RCFILE", fname)
+    monkeypatch.setenv("ARVIZ_KDE_GRID_SIZE", "300")
+    assert dict(_read_environ()) == {"kde.grid_size": 300}
+    config = rc_params()
+    assert config["stats.n_jobs"] == 3
+    # environment variables take precedence over the file
+    assert config["kde.grid_size"] == 300
+    assert config["data.compress"] is True
+
+
+def test_kde_grid_size():
+    x = np.random.randn(10000)
+    assert len(_fast_kde(x)[0]) == 200
+    with rc_context(rc={"kde.grid_size": 100}):
+        assert len(_fast_kde(x)[0]) == 100
+
+
+@pytest.mark.parametrize("storage_dtype", ["float32", "int16"])
+def test_storage_dtype(tmp_path, storage_dtype):
+    data = from_dict(posterior={"a": np.random.randn(2, 100), "b": np.arange(200).reshape(2, 100)})
+    fname = str(tmp_path / "data.nc")
+    with rc_context(rc={"data.storage_dtype": storage_dtype, "data.compress": False}):
+        data.to_netcdf(fname)
+    new_data = from_netcdf(fname)
+    assert new_data.posterior.a.encoding["dtype"] == np.dtype(storage_dtype)
+    assert new_data.posterior.b.dtype == data.posterior.b.dtype
+    assert not new_data.posterior.a.encoding.get("zlib", False)
+    # the in memory object is not modified
+    assert data.posterior.a.dtype == np.float64
+    assert "dtype" not in data.posterior.a.encoding
@@ -8,7 +8,7 @@ from xarray import Dataset, DataArray
 
 
 from ..data import load_arviz_data, from_dict, convert_to_inference_data, concat
-from ..stats import compare, hpd, loo, r2_score, waic, psislw, summary
+from ..stats import compare, hpd, loo, posterior_intervals, r2_score, waic, psislw, summary
 from ..stats.stats import _gpinv
 
 
@@ -36,6 +36,73 @@ def test_hpd_bad_ci():
         hpd(normal_sample, credible_interval=2)
 
 
+@pytest.mark.parametrize("circular", [False, True])
+def test_hpd_multidimensional(circular):
+    sample = np.random.uniform(-3, 3, size=(1000, 4, 3))
+    intervals = hpd(sample, credible_interval=0.8, circular=circular)
+    assert intervals.shape == (4, 3, 2)
+    for i in range(4):
+        for j in range(3):
+            assert_array_almost_equal(
+                intervals[i, j], hpd(sample[:, i, j], credible_interval=0.8, circular=circular)
+            )
+
+
+@pytest.mark.parametrize("circular", [False, True])
+def test_hpd_multiple_credible_intervals(circular):
+    sample = np.random.uniform(-3, 3, size=(1000, 5))
+    credible_intervals = [0.5, 0.8, 0.94]
+    intervals = hpd(sample, credible_interval=credible_intervals, circular=circular)
+    assert intervals.shape == (5, 3, 2)
+    for i, credible_interval in enumerate(credible_intervals):
+        assert_array_almost_equal(
+            intervals[:, i], hpd(sample, credible_interval=credible_interval, circular=circular)
+        )
+
+
+def test_hpd_bad_ci_multiple():
+    normal_sample = np.random.randn(10)
+    with pytest.raises(ValueError):
+        hpd(normal_sample, credible_interval=[0.5, 1])
+
+
+@pytest.mark.parametrize("circular", [False, True])
+def test_posterior_intervals(centered_eight, circular):
+    intervals = posterior_intervals(
+        centered_eight,
+        var_names=["mu", "theta"],
+        credible_interval=[0.5, 0.94],
+        quantiles=[0.25, 0.5],
+        circular=circular,
+    )
+    assert list(intervals.data_vars) == ["mu", "theta"]
+    labels = ["hpd_25%", "hpd_75%", "hpd_3%", "hpd_97%", "25%", "50%"]
+    assert list(intervals.interval.values) == labels
+    assert intervals.theta.dims == ("school", "interval")
+    theta = centered_eight.posterior.theta.values.reshape(-1, 8)
+    assert_array_almost_equal(
+        intervals.theta.sel(interval=["hpd_3%", "hpd_97%"]).values,
+        hpd(theta, credible_interval=0.94, circular=circular),
+    )
+    if not circular:
+        assert_array_almost_equal(
+            intervals.theta.sel(interval=["25%", "50%"]).values,
+            np.percentile(theta, [25, 50], axis=0).T,
+        )
+
+
+def test_posterior_intervals_only_quantiles(centered_eight):
+    intervals = posterior_intervals(centered_eight, credible_interval=None, quantiles=0.5)
+    assert list(intervals.interval.values) == ["50%"]
+    assert_array_almost_equal(intervals.mu.values, [np.median(centered_eight.posterior.mu.values)])
+
+
+@pytest.mark.parametrize("kwargs", [{"credible_interval": [0.5, 0.5]}, {"quantiles": [0.1, 1.2]}])
+def test_posterior_intervals_bad(centered_eight, kwargs):
+    with pytest.raises(ValueError):
+        posterior_intervals(centered_eight, **kwargs)
+
+
 def test_r2_score():
     x = np.linspace(0, 1, 100)
     y = np.random.normal(x, 1)
@@ -0,0 +1,108 @@
+"""
+Tests for the cache of densities and intervals.
+"""
+# pylint: disable=redefined-outer-name
+import gc
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from ..rcparams import rc_context
+from ..stats import hpd, clear_cache, cache_info
+from ..plots.kdeplot import _fast_kde
+
+
+@pytest.fixture
+def cache():
+    """Enable an empty cache."""
+    clear_cache()
+    with rc_context(rc={"cache.enabled": True}):
+        yield
+    clear_cache()
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return np.random.RandomState(0).randn(1000)
+
+
+def test_cache_disabled(samples):
+    clear_cache()
+    hpd(samples)
+    assert cache_info()["entries"] == 0
+
+
+def test_cache_hit(cache, samples):  # pylint: disable=unused-argument
+    density, lower, upper = _fast_kde(samples, bw=3)
+    assert cache_info()["misses"] == 1
+    # same arguments given in a different way, for a view of the same memory
+    cached_density, cached_lower, cached_upper = _fast_kde(samples[:], False, 3)
+    assert cache_info()["hits"] == 1
+    assert_array_equal(cached_density, density)
+    assert (cached_lower, cached_upper) == (lower, upper)
+    # copies are different arrays
+    _fast_kde(samples.copy(), bw=3)
+    assert cache_info()["misses"] == 2
+
+
+def test_cache_owner_collected(cache, samples):  # pylint: disable=unused-argument
+    ary = samples.copy()
+    hpd(ary[10:])
+    assert cache_info()["entries"] == 1
+    del ary
+    gc.collect()
+    assert cache_info()["entries"] == 0
+    assert cache_info()["n_bytes"] == 0
+
+
+def test_cache_modified_in_place(cache):  # pylint: disable=unused-argument
+    ary = np.random.RandomState(1).randn(10 ** 5)
+    interval = hpd(ary)
+    # the first and last elements are always part of the checksum
+    ary[-1] = 100
+    assert cache_info()["misses"] == 1
+    assert hpd(ary)[1] != interval[1]
+    assert cache_info()["misses"] == 2
+
+
+def test_cache_key(cache, samples):  # pylint: disable=unused-argument
+    hpd(samples)
+    hpd(samples, credible_interval=0.5)
+    hpd(samples, circular=True)
+    hpd(samples[::-1])
+    _fast_kde(samples)
+    _fast_kde(samples, cumulative=True)
+    _fast_kde(samples, xmin=-10)
+    with rc_context(rc={"kde.grid_size": 100}):
+        _fast_kde(samples)
+    info = cache_info()
+    assert info["hits"] == 0
+    assert info["entries"] == 8
+
+
+def test_cache_returns_copies(cache, samples):  # pylint: disable=unused-argument
+    interval = hpd(samples)
+    expected = interval.copy()
+    interval[:] = 0
+    assert_array_equal(hpd(samples), expected)
+
+
+def test_cache_eviction(cache, samples):  # pylint: disable=unused-argument
+    first, second, third = samples, samples + 1, samples + 2
+    _fast_kde(first)
+    entry_bytes = cache_info()["n_bytes"]
+    clear_cache()
+    with rc_context(rc={"cache.max_bytes": 2 * entry_bytes}):
+        _fast_kde(first)
+        _fast_kde(second)
+        # mark first as recently used so that second is evicted
+        _fast_kde(first)
+        _fast_kde(third)
+        info = cache_info()
+        assert info["entries"] == 2
+        assert info["n_bytes"] == 2 * entry_bytes
+        _fast_kde(first)
+        assert cache_info()["hits"] == 2
+        _fast_kde(second)
+        assert cache_info()["misses"] == 4
@@ -0,0 +1,103 @@
+"""
+Tests for the numba kernels of arviz.stats against the NumPy implementations.
+"""
+# pylint: disable=redefined-outer-name
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from ..rcparams import rc_context
+from ..stats import geweke, psislw
+from ..stats import kernels
+from ..stats.diagnostics import _ess, _geyer_truncation, _mc_error
+from ..plots.kdeplot import _fast_kde_batch, _fast_kde_2d
+
+pytest.importorskip("numba")
+
+
+def numpy_and_kernel(func, *args, **kwargs):
+    """Return the results of func with and without the numba kernels."""
+    with rc_context(rc={"numba.enabled": False}):
+        assert not kernels.use_kernels()
+        numpy_result = func(*args, **kwargs)
+    with rc_context(rc={"numba.enabled": True}):
+        assert kernels.use_kernels()
+        kernel_result = func(*args, **kwargs)
+    return numpy_result, kernel_result
+
+
+@pytest.fixture(scope="module")
+def autocorrelated():
+    """AR(1) chains, shape (chain, draw)."""
+    rng = np.random.RandomState(0)
+    noise = rng.randn(4, 1000)
+    ary = np.empty_like(noise)
+    ary[:, 0] = noise[:, 0]
+    for i in range(1, ary.shape[1]):
+        ary[:, i] = 0.9 * ary[:, i - 1] + noise[:, i]
+    return ary
+
+
+@pytest.mark.parametrize("relative", [False, True])
+def test_ess_geyer_truncation(autocorrelated, relative):
+    # the truncation only involves scalar operations, results are bit for bit equal
+    numpy_ess, kernel_ess = numpy_and_kernel(_ess, autocorrelated, relative=relative)
+    assert numpy_ess == kernel_ess
+
+
+def test_geyer_truncation_row(autocorrelated):
+    rng = np.random.RandomState(1)
+    acov_mean = np.vstack((autocorrelated[:, :200], rng.randn(3, 200)))
+    mean_var = np.abs(rng.randn(7)) + 1
+    var_plus = mean_var + np.abs(rng.randn(7))
+    for i, row in enumerate(acov_mean):
+        rho_hat_t, max_t = kernels.geyer_truncation_row(row, mean_var[i], var_plus[i])
+        numpy_rho_hat_t, numpy_max_t = _geyer_truncation(row, mean_var[i], var_plus[i])
+        assert_array_equal(rho_hat_t, numpy_rho_hat_t)
+        assert max_t == numpy_max_t
+
+
+@pytest.mark.parametrize("reff", [0.3, 1.0])
+def test_psislw(reff):
+    rng = np.random.RandomState(2)
+    log_weights = rng.standard_t(3, size=(2000, 20)) * np.linspace(0.1, 3, 20)
+    (numpy_lw, numpy_k), (kernel_lw, kernel_k) = numpy_and_kernel(psislw, log_weights, reff)
+    assert_allclose(kernel_k, numpy_k, rtol=1e-10)
+    assert_allclose(kernel_lw, numpy_lw, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("shape", [(1000,), (1000, 3), (1003, 2, 4)])
+@pytest.mark.parametrize("batches", [1, 5])
+def test_mc_error(shape, batches):
+    ary = np.random.RandomState(3).randn(*shape)
+    numpy_mcse, kernel_mcse = numpy_and_kernel(_mc_error, ary, batches=batches)
+    assert np.shape(kernel_mcse) == np.shape(numpy_mcse)
+    assert_allclose(kernel_mcse, numpy_mcse, rtol=1e-12)
+
+
+def test_mc_error_nan():
+    ary = np.random.RandomState(4).randn(100, 2)
+    ary[10, 1] = np.nan
+    numpy_mcse, kernel_mcse = numpy_and_kernel(_mc_error, ary)
+    assert_array_equal(np.isnan(kernel_mcse), [False, True])
+    assert_allclose(kernel_mcse, numpy_mcse, rtol=1e-12)
+
+
+def test_geweke(autocorrelated):
+    numpy_scores, kernel_scores = numpy_and_kernel(geweke, autocorrelated[0], intervals=15)
+    assert kernel_scores.shape == (15, 2)
+    assert_array_equal(kernel_scores[:, 0], numpy_scores[:, 0])
+    assert_allclose(kernel_scores[:, 1], numpy_scores[:, 1], rtol=1e-10)
+
+
+def test_linear_binning():
+    ary = np.random.RandomState(5).randn(10, 1000)
+    ary[0, 0] = np.nan
+    numpy_kde, kernel_kde = numpy_and_kernel(_fast_kde_batch, ary, xmin=-2, xmax=2)
+    assert_allclose(kernel_kde[0], numpy_kde[0], rtol=1e-10)
+
+
+def test_bilinear_binning():
+    x, y = np.random.RandomState(6).randn(2, 1000)
+    numpy_kde, kernel_kde = numpy_and_kernel(_fast_kde_2d, x, y)
+    assert_allclose(kernel_kde[0], numpy_kde[0], rtol=1e-10, atol=1e-14)
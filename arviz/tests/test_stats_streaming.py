@@ -0,0 +1,106 @@
+"""
+Tests for arviz.stats.StreamingDiagnostics.
+"""
+# pylint: disable=redefined-outer-name
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from ..rcparams import rc_context
+from ..stats import StreamingDiagnostics, mcse
+from ..stats.diagnostics import _rhat_split
+
+
+@pytest.fixture(scope="module")
+def draws():
+    """AR(1) chains with different means, shape (chain, draw, param)."""
+    rng = np.random.RandomState(0)
+    noise = rng.randn(4, 1280, 3)
+    ary = np.empty_like(noise)
+    ary[:, 0] = noise[:, 0]
+    for i in range(1, ary.shape[1]):
+        ary[:, i] = 0.7 * ary[:, i - 1] + noise[:, i]
+    return ary + np.arange(4)[:, None, None] * 0.1
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 100, 1280])
+def test_streaming_moments(draws, block_size):
+    diagnostics = StreamingDiagnostics()
+    for start in range(0, draws.shape[1], block_size):
+        diagnostics.update(draws[:, start : start + block_size])
+    assert diagnostics.n_draws == draws.shape[1]
+    assert diagnostics.n_batches <= diagnostics.max_batches
+    assert_allclose(diagnostics.mean, draws.mean(axis=(0, 1)))
+    assert_allclose(diagnostics.sd, draws.reshape(-1, 3).std(axis=0, ddof=1))
+
+
+def test_streaming_rhat(draws):
+    # 1280 draws are 40 batches of 32 draws, the split halves are exact
+    diagnostics = StreamingDiagnostics()
+    diagnostics.update(draws)
+    assert diagnostics.batch_size == 32
+    expected = [_rhat_split(draws[..., i]) for i in range(3)]
+    assert_allclose(diagnostics.rhat, expected)
+
+
+def test_streaming_ess(draws):
+    diagnostics = StreamingDiagnostics(max_batches=8)
+    diagnostics.update(draws)
+    # 1280 draws are 5 batches of 256 draws
+    assert diagnostics.batch_size == 256
+    batch_means = draws.reshape(4, 5, 256, 3).mean(axis=2).reshape(20, 3)
+    mcse = np.sqrt(256 * batch_means.var(axis=0, ddof=1) / draws[:, :, 0].size)
+    assert_allclose(diagnostics.mcse_mean, mcse)
+    sd = draws.reshape(-1, 3).std(axis=0, ddof=1)
+    assert_allclose(diagnostics.ess, (sd / mcse) ** 2)
+
+
+def test_streaming_mcse_partial_batch(draws):
+    diagnostics = StreamingDiagnostics()
+    diagnostics.update(draws[:, :1000])
+    # 1000 draws are 62 batches of 16 draws and 8 draws in the batch being filled
+    assert diagnostics.batch_size == 16
+    assert diagnostics.n_batches == 62
+    prefix = draws[:, :992]
+    sd = prefix.reshape(-1, 3).std(axis=0, ddof=1)
+    assert_allclose(diagnostics.mcse_mean, sd / np.sqrt(diagnostics.ess))
+    batch_means = prefix.reshape(4, 62, 16, 3).mean(axis=2).reshape(-1, 3)
+    expected = np.sqrt(16 * batch_means.var(axis=0, ddof=1) / prefix[:, :, 0].size)
+    assert_allclose(diagnostics.mcse_mean, expected)
+    # batch means and autocorrelation estimates of the same draws agree roughly
+    assert_allclose(diagnostics.mcse_mean, [mcse(prefix[..., i]) for i in range(3)], rtol=0.25)
+
+
+def test_streaming_chunk_size(draws):
+    diagnostics = StreamingDiagnostics()
+    diagnostics.update(draws)
+    with rc_context(rc={"stats.chunk_size": 3}):
+        chunked = StreamingDiagnostics()
+        chunked.update(draws)
+    assert_allclose(chunked.to_dict()["mean"], diagnostics.to_dict()["mean"])
+    assert_allclose(chunked.rhat, diagnostics.rhat)
+
+
+def test_streaming_not_enough_draws():
+    diagnostics = StreamingDiagnostics()
+    with pytest.raises(ValueError):
+        _ = diagnostics.mean
+    diagnostics.update(np.random.randn(1, 1))
+    result = diagnostics.to_dict()
+    assert np.isnan(result["ess"])
+    assert np.isnan(result["r_hat"])
+    diagnostics.update(np.random.randn(1, 100))
+    # a single chain has no rhat
+    assert not np.isnan(diagnostics.ess)
+    assert np.isnan(diagnostics.rhat)
+
+
+def test_streaming_bad_shape():
+    with pytest.raises(ValueError):
+        StreamingDiagnostics(max_batches=5)
+    diagnostics = StreamingDiagnostics()
+    diagnostics.update(np.random.randn(2, 10, 3))
+    with pytest.raises(ValueError):
+        diagnostics.update(np.random.randn(2, 10, 4))
+    with pytest.raises(ValueError):
+        diagnostics.update(np.random.randn(10))
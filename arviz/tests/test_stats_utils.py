@@ -4,7 +4,14 @@ from numpy.testing import assert_array_almost_equal
 import pytest
 from scipy.special import logsumexp
 
-from ..stats.stats_utils import logsumexp as _logsumexp, make_ufunc, wrap_xarray_ufunc, not_valid
+from ..stats.stats_utils import (
+    logsumexp as _logsumexp,
+    make_ufunc,
+    wrap_xarray_ufunc,
+    not_valid,
+    autocov,
+    autocorr,
+)
 
 
 @pytest.mark.parametrize("ary_dtype", [np.float64, np.float32, np.int32, np.int64])
@@ -198,3 +205,21 @@ def test_valid_shape():
     assert not_valid(
         np.ones((10, 10)), check_nan=False, shape_kwargs=dict(min_chains=100, min_draws=2)
     )
+
+
+@pytest.mark.parametrize("max_lag", [None, 5, 40, 2000])
+@pytest.mark.parametrize("axis", [0, -1])
+def test_autocov_max_lag(max_lag, axis):
+    """Check the direct and truncated FFT computations of the first lags against a full FFT."""
+    ary = np.random.randn(1000, 3) if axis == 0 else np.random.randn(2, 3, 1000)
+    centered = ary - ary.mean(axis, keepdims=True)
+    n_fft = 2 * ary.shape[axis]
+    spectrum = np.abs(np.fft.rfft(centered, n=n_fft, axis=axis)) ** 2
+    expected = np.fft.irfft(spectrum, n=n_fft, axis=axis) / ary.shape[axis]
+    n_lags = ary.shape[axis] if max_lag is None else min(max_lag, ary.shape[axis])
+    expected = np.take(expected, np.arange(n_lags), axis=axis)
+    assert_array_almost_equal(autocov(ary, axis=axis, max_lag=max_lag), expected)
+    assert_array_almost_equal(
+        autocorr(ary, axis=axis, max_lag=max_lag),
+        expected / np.take(expected, [0], axis=axis),
+    )
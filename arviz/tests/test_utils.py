@@ -5,7 +5,8 @@ Tests for arviz.utils.
 from unittest.mock import Mock
 import numpy as np
 import pytest
-from ..utils import _var_names
+from ..utils import _var_names, _parallel_map
+from ..rcparams import rc_context
 from ..data import load_arviz_data, from_dict
 
 
@@ -119,3 +120,11 @@ def test_conditional_jit_numba_decorator_keyword(monkeypatch):
     function_results, wrapper_result = placeholder_func
     assert wrapper_result == {"keyword_argument": "A keyword argument"}
     assert function_results == "output"
+
+
+@pytest.mark.parametrize("n_jobs", [1, 3, -1])
+def test_parallel_map(n_jobs):
+    items = [(i, i + 1) for i in range(10)]
+    with rc_context(rc={"stats.n_jobs": n_jobs}):
+        assert _parallel_map(lambda a, b: a * b, items) == [a * b for a, b in items]
+        assert _parallel_map(lambda a, b: a * b, []) == []
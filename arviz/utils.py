@@ -1,7 +1,11 @@
 """General utilities."""
+from concurrent.futures import ThreadPoolExecutor
 import importlib
+import os
 import warnings
 
+from .rcparams import rcParams
+
 
 def _var_names(var_names, data):
     """Handle var_names input across arviz.
@@ -80,3 +84,22 @@ def conditional_jit(function=None, **kwargs):  # noqa: D202
         return wrapper(function)
     else:
         return wrapper
+
+
+def _parallel_map(function, items):
+    """Return the list of ``function(*item)`` for each item, computed on a pool of threads.
+
+    The number of threads is taken from ``rcParams["stats.n_jobs"]``, -1 meaning one per
+    core. The items are processed in the calling thread when it is 1 or there is a single
+    item. The function should spend most of its time in code releasing the GIL, like NumPy
+    and SciPy array operations or numba kernels compiled with ``nogil=True``.
+    """
+    items = list(items)
+    n_jobs = rcParams["stats.n_jobs"]
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(items))
+    if n_jobs <= 1:
+        return [function(*item) for item in items]
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(lambda item: function(*item), items))
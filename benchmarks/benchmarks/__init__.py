@@ -0,0 +1 @@
+"""Benchmarks for ArviZ, run them with asv from the repository root."""
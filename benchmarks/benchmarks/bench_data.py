@@ -0,0 +1,55 @@
+"""Benchmarks for converters and netCDF input and output."""
+import os
+import shutil
+import tempfile
+
+from arviz import from_cmdstan, from_netcdf, to_netcdf
+
+from .common import inference_data, write_cmdstan_csv
+
+
+class CmdStan:
+    """Read CmdStan csv output."""
+
+    params = ([1, 4], [1000, 5000], [10, 100])
+    param_names = ["n_chains", "n_draws", "n_params"]
+
+    def setup(self, n_chains, n_draws, n_params):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = [
+            write_cmdstan_csv(
+                os.path.join(self.tmpdir, "output_{}.csv".format(chain)), n_draws, n_params, chain
+            )
+            for chain in range(n_chains)
+        ]
+
+    def teardown(self, *_):
+        shutil.rmtree(self.tmpdir)
+
+    def time_from_cmdstan(self, *_):
+        from_cmdstan(posterior=self.paths)
+
+    def peakmem_from_cmdstan(self, *_):
+        from_cmdstan(posterior=self.paths)
+
+
+class NetCDF:
+    """Write and read InferenceData."""
+
+    params = ([1000, 10000], [10, 100])
+    param_names = ["n_draws", "n_params"]
+
+    def setup(self, n_draws, n_params):
+        self.tmpdir = tempfile.mkdtemp()
+        self.data = inference_data(4, n_draws // 4, n_params, n_obs=100)
+        self.path = os.path.join(self.tmpdir, "data.nc")
+        to_netcdf(self.data, self.path)
+
+    def teardown(self, *_):
+        shutil.rmtree(self.tmpdir)
+
+    def time_to_netcdf(self, *_):
+        to_netcdf(self.data, os.path.join(self.tmpdir, "out.nc"))
+
+    def time_from_netcdf(self, *_):
+        from_netcdf(self.path)
@@ -0,0 +1,54 @@
+"""Benchmarks for kernel density estimation."""
+import numpy as np
+
+from arviz.plots.kdeplot import _fast_kde, _fast_kde_batch, _fast_kde_2d
+
+
+class FastKDE:
+    """One dimensional KDE."""
+
+    params = ([1000, 100000, 1000000], [False, True])
+    param_names = ["n_samples", "cumulative"]
+
+    def setup(self, n_samples, _):
+        self.samples = np.random.RandomState(0).randn(n_samples)
+
+    def time_fast_kde(self, _, cumulative):
+        _fast_kde(self.samples, cumulative=cumulative)
+
+    def peakmem_fast_kde(self, _, cumulative):
+        _fast_kde(self.samples, cumulative=cumulative)
+
+
+class FastKDEBatch:
+    """One dimensional KDEs of many series, like the posterior predictive curves of plot_ppc."""
+
+    params = ([100, 1000], [100, 1000])
+    param_names = ["n_series", "n_samples"]
+
+    def setup(self, n_series, n_samples):
+        self.samples = np.random.RandomState(0).randn(n_series, n_samples)
+
+    def time_fast_kde_loop(self, *_):
+        for row in self.samples:
+            _fast_kde(row)
+
+    def time_fast_kde_batch(self, *_):
+        _fast_kde_batch(self.samples)
+
+
+class FastKDE2D:
+    """Two dimensional KDE."""
+
+    params = ([1000, 100000, 1000000], [128, 256])
+    param_names = ["n_samples", "gridsize"]
+
+    def setup(self, n_samples, _):
+        samples = np.random.RandomState(0).randn(2, n_samples)
+        self.x, self.y = samples[0], samples[1] * 10
+
+    def time_fast_kde_2d(self, _, gridsize):
+        _fast_kde_2d(self.x, self.y, gridsize=(gridsize, gridsize))
+
+    def peakmem_fast_kde_2d(self, _, gridsize):
+        _fast_kde_2d(self.x, self.y, gridsize=(gridsize, gridsize))
@@ -0,0 +1,181 @@
+"""Benchmarks for the main plotting functions, drawn with the Agg backend."""
+import io
+import warnings
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+# pylint: disable=wrong-import-position
+import matplotlib.pyplot as plt
+import numpy as np
+
+import arviz
+from arviz import (
+    plot_autocorr,
+    plot_density,
+    plot_forest,
+    plot_pair,
+    plot_parallel,
+    plot_posterior,
+    plot_ppc,
+    plot_rank,
+    plot_trace,
+    from_dict,
+)
+
+from .common import inference_data, posterior_dict
+
+
+class Plots:
+    """Plots of the posterior, over draws and number of parameters."""
+
+    params = ([1000, 10000], [4, 16])
+    param_names = ["n_draws", "n_params"]
+
+    def setup(self, n_draws, n_params):
+        warnings.simplefilter("ignore")
+        self.data = inference_data(4, n_draws // 4, n_params)
+
+    def teardown(self, *_):
+        plt.close("all")
+
+    def time_plot_posterior(self, *_):
+        plot_posterior(self.data)
+
+    def time_plot_trace(self, *_):
+        plot_trace(self.data)
+
+    def time_plot_forest(self, *_):
+        plot_forest(self.data)
+
+    def time_plot_forest_ridgeplot(self, *_):
+        plot_forest(self.data, kind="ridgeplot")
+
+    def time_plot_density(self, *_):
+        plot_density(self.data)
+
+    def time_plot_autocorr(self, *_):
+        plot_autocorr(self.data, var_names="mu")
+
+    def time_plot_rank(self, *_):
+        plot_rank(self.data, var_names="mu")
+
+    def time_plot_pair_scatter(self, *_):
+        plot_pair(self.data, var_names="theta")
+
+    def time_plot_pair_kde(self, *_):
+        plot_pair(self.data, var_names="theta", kind="kde")
+
+
+class PlotTraceLong:
+    """Trace plot of long chains, drawing every draw or a downsampled trace."""
+
+    params = ([100000, 1000000], [None, "minmax", "lttb"])
+    param_names = ["n_draws", "downsample"]
+
+    def setup(self, n_draws, _):
+        warnings.simplefilter("ignore")
+        self.data = inference_data(4, n_draws // 4, 2)
+
+    def teardown(self, *_):
+        plt.close("all")
+
+    def time_plot_trace(self, _, downsample):
+        plot_trace(self.data, var_names="mu", downsample=downsample)[0, 0].figure.savefig(
+            io.BytesIO(), format="png"
+        )
+
+
+class PlotParallel:
+    """Parallel coordinates of many draws, drawn as a single collection of lines."""
+
+    params = ([4000, 40000], [None, 1000])
+    param_names = ["n_draws", "max_lines"]
+
+    def setup(self, n_draws, _):
+        warnings.simplefilter("ignore")
+        diverging = np.random.RandomState(0).rand(4, n_draws // 4) > 0.99
+        self.data = from_dict(
+            posterior=posterior_dict(4, n_draws // 4, 4), sample_stats={"diverging": diverging}
+        )
+
+    def teardown(self, *_):
+        plt.close("all")
+
+    def time_plot_parallel(self, _, max_lines):
+        plot_parallel(self.data, var_names="theta", max_lines=max_lines).figure.savefig(
+            io.BytesIO(), format="png"
+        )
+
+
+class PlotsComputeRender:
+    """Cost of computing the plot data and of drawing it, measured separately."""
+
+    plot_kwargs = {
+        "plot_posterior": {},
+        "plot_trace": {},
+        "plot_forest": {"ess": True, "r_hat": True},
+        "plot_density": {},
+        "plot_pair": {"var_names": "theta", "kind": "kde"},
+        "plot_rank": {"var_names": "mu"},
+    }
+    params = (list(plot_kwargs), [1000, 10000])
+    param_names = ["plot", "n_draws"]
+
+    def setup(self, plot, n_draws):
+        warnings.simplefilter("ignore")
+        self.data = inference_data(4, n_draws // 4, 8)
+        self.plot = getattr(arviz, plot)
+        self.kwargs = self.plot_kwargs[plot]
+        self.plot_data = self.plot(self.data, compute_only=True, **self.kwargs)
+
+    def teardown(self, *_):
+        plt.close("all")
+
+    def time_compute(self, *_):
+        self.plot(self.data, compute_only=True, **self.kwargs)
+
+    def time_render(self, *_):
+        self.plot_data.render()
+
+
+class PlotPPC:
+    """Posterior predictive checks over the number of predictive samples."""
+
+    params = ([100, 1000], [100, 1000])
+    param_names = ["n_pp_samples", "n_obs"]
+
+    def setup(self, n_pp_samples, n_obs):
+        warnings.simplefilter("ignore")
+        observed = posterior_dict(1, n_obs, 1)["mu"][0]
+        self.data = from_dict(
+            posterior_predictive={"y": posterior_dict(4, n_pp_samples // 4, n_obs)["theta"]},
+            observed_data={"y": observed},
+        )
+
+    def teardown(self, *_):
+        plt.close("all")
+
+    def time_plot_ppc(self, n_pp_samples, _):
+        plot_ppc(self.data, num_pp_samples=n_pp_samples)
+
+
+class PlotPairPanels:
+    """Computation of the panels of large pair plots on one or several threads."""
+
+    params = (["kde", "hexbin"], [1, 4])
+    param_names = ["kind", "n_jobs"]
+
+    def setup(self, kind, n_jobs):
+        self.data = from_dict(posterior={"theta": posterior_dict(4, 25000, 8)["theta"]})
+        self.kind = kind
+        self.rc_context = arviz.rc_context(rc={"stats.n_jobs": n_jobs})
+        self.rc_context.__enter__()
+
+    def teardown(self, *_):
+        self.rc_context.__exit__(None, None, None)
+        plt.close("all")
+
+    def time_compute(self, *_):
+        plot_pair(self.data, kind=self.kind, compute_only=True)
@@ -0,0 +1,78 @@
+"""Benchmarks for diagnostics and information criteria."""
+import warnings
+
+import numpy as np
+
+from arviz import autocorr, compare, ess, loo, rank_histogram, rhat, summary, waic
+
+from .common import inference_data, posterior_dict
+
+
+class Diagnostics:
+    """Diagnostics over chains, draws and number of parameters."""
+
+    params = ([1, 4], [500, 5000], [10, 100])
+    param_names = ["n_chains", "n_draws", "n_params"]
+
+    def setup(self, n_chains, n_draws, n_params):
+        warnings.simplefilter("ignore")
+        self.data = inference_data(n_chains, n_draws, n_params)
+        self.theta = np.moveaxis(self.data.posterior["theta"].values, -1, 0)
+
+    def time_summary(self, *_):
+        summary(self.data)
+
+    def peakmem_summary(self, *_):
+        summary(self.data)
+
+    def time_ess_bulk(self, *_):
+        ess(self.data, method="bulk")
+
+    def time_ess_mean(self, *_):
+        ess(self.data, method="mean")
+
+    def time_rhat(self, *_):
+        rhat(self.data)
+
+    def peakmem_rhat(self, *_):
+        rhat(self.data)
+
+    def time_rank_histogram(self, *_):
+        rank_histogram(self.theta)
+
+
+class Autocorrelation:
+    """Autocorrelation of a stack of series over the number of lags computed."""
+
+    params = ([1000, 20000], [None, 100, 20])
+    param_names = ["n_draws", "max_lag"]
+
+    def setup(self, n_draws, _):
+        self.series = posterior_dict(1, n_draws, 100)["theta"][0].T
+
+    def time_autocorr(self, _, max_lag):
+        autocorr(self.series, max_lag=max_lag)
+
+
+class InformationCriteria:
+    """Information criteria over draws and number of observations."""
+
+    params = ([1000, 4000], [100, 1000])
+    param_names = ["n_draws", "n_obs"]
+
+    def setup(self, n_draws, n_obs):
+        warnings.simplefilter("ignore")
+        self.data = inference_data(4, n_draws // 4, 2, n_obs=n_obs, seed=0)
+        self.data2 = inference_data(4, n_draws // 4, 2, n_obs=n_obs, seed=1)
+
+    def time_loo(self, *_):
+        loo(self.data, reff=1.0)
+
+    def peakmem_loo(self, *_):
+        loo(self.data, reff=1.0)
+
+    def time_waic(self, *_):
+        waic(self.data)
+
+    def time_compare(self, *_):
+        compare({"a": self.data, "b": self.data2}, ic="loo", seed=0)
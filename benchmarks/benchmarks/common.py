@@ -0,0 +1,93 @@
+"""Synthetic posteriors shared by the benchmarks."""
+import logging
+
+import numpy as np
+
+from arviz import from_dict
+
+# shape validation messages for single chain posteriors would flood the output
+logging.getLogger("arviz").setLevel(logging.ERROR)
+
+
+def posterior_dict(n_chains, n_draws, n_params, seed=0):
+    """Generate autocorrelated draws for a scalar and a vector parameter."""
+    rng = np.random.RandomState(seed)
+    innovations = rng.randn(n_chains, n_draws, n_params)
+    theta = np.empty_like(innovations)
+    theta[:, 0] = innovations[:, 0]
+    # AR(1) chains, so that ess and rhat do not work on white noise
+    for draw in range(1, n_draws):
+        theta[:, draw] = 0.7 * theta[:, draw - 1] + innovations[:, draw]
+    return {"mu": theta[..., 0] + rng.randn(n_chains, 1), "theta": theta}
+
+
+def inference_data(n_chains, n_draws, n_params, n_obs=None, seed=0):
+    """Generate InferenceData with posterior and, if `n_obs` is given, log likelihood."""
+    rng = np.random.RandomState(seed)
+    sample_stats = None
+    observed_data = None
+    if n_obs is not None:
+        log_likelihood = -0.5 * rng.randn(n_chains, n_draws, n_obs) ** 2 - 0.9
+        sample_stats = {"log_likelihood": log_likelihood}
+        observed_data = {"y": rng.randn(n_obs)}
+    return from_dict(
+        posterior=posterior_dict(n_chains, n_draws, n_params, seed=seed),
+        sample_stats=sample_stats,
+        observed_data=observed_data,
+    )
+
+
+def write_cmdstan_csv(path, n_draws, n_params, seed=0):
+    """Write a CmdStan output csv for a model with a `theta` vector of `n_params`."""
+    rng = np.random.RandomState(seed)
+    config = [
+        "# model = benchmark_model",
+        "# method = sample (Default)",
+        "#   sample",
+        "#     num_samples = {}".format(n_draws),
+        "#     num_warmup = 1000 (Default)",
+        "#     save_warmup = 0 (Default)",
+        "#     thin = 1 (Default)",
+    ]
+    adaptation = [
+        "# Adaptation terminated",
+        "# Step size = 0.5",
+        "# Diagonal elements of inverse mass matrix:",
+        "# " + ", ".join(["1"] * n_params),
+    ]
+    timing = [
+        "# ",
+        "#  Elapsed Time: 1.0 seconds (Warm-up)",
+        "#                1.0 seconds (Sampling)",
+        "#                2.0 seconds (Total)",
+        "# ",
+    ]
+    stats_columns = [
+        "lp__",
+        "accept_stat__",
+        "stepsize__",
+        "treedepth__",
+        "n_leapfrog__",
+        "divergent__",
+        "energy__",
+    ]
+    columns = stats_columns + ["theta.{}".format(i + 1) for i in range(n_params)]
+    sample_stats = np.column_stack(
+        (
+            -rng.rand(n_draws) * 10,
+            rng.rand(n_draws),
+            np.full(n_draws, 0.5),
+            rng.randint(1, 6, n_draws),
+            rng.randint(1, 64, n_draws),
+            rng.rand(n_draws) < 0.01,
+            rng.rand(n_draws) * 10,
+        )
+    )
+    samples = np.column_stack((sample_stats, rng.randn(n_draws, n_params)))
+    with open(path, "w") as f_obj:
+        f_obj.write("\n".join(config) + "\n")
+        f_obj.write(",".join(columns) + "\n")
+        f_obj.write("\n".join(adaptation) + "\n")
+        np.savetxt(f_obj, samples, delimiter=",", fmt="%.6g")
+        f_obj.write("\n".join(timing) + "\n")
+    return path